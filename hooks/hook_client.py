@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Thin client for the persistent hook daemon (see hook_daemon.py).
+
+Hook scripts call `delegate(__file__)` before their heavy imports. If a daemon
+is listening, the hook runs inside it and this process just relays the result;
+otherwise `delegate` returns and the script runs inline as usual.
+
+Nothing beyond `os`/`sys` is imported unless the daemon socket exists, so
+the shim adds next to nothing when the daemon is not running.
+"""
+import os
+import stat
+import sys
+
+# Well under the shortest hook timeout (5s for skill-suggestion), so a busy or
+# stuck daemon still leaves time to fall back to running the hook inline
+DEFAULT_TIMEOUT = 2.0
+
+
+def socket_dir():
+    """Per-user directory (mode 0700) that holds the daemon socket."""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp'
+    return os.path.join(runtime_dir, f"jaggers-hooks-{os.getuid()}")
+
+
+def socket_path():
+    """Per-user Unix socket path shared by client and daemon."""
+    override = os.environ.get('JAGGERS_HOOK_SOCKET')
+    if override:
+        return override
+    return os.path.join(socket_dir(), "hooks.sock")
+
+
+def is_trusted(path):
+    """True if path is a socket owned by this user in a directory nobody else can write.
+
+    The client sends its whole environment to the socket and obeys the answer,
+    so a socket planted by another local user must never be used.
+    """
+    uid = os.getuid()
+    try:
+        st = os.lstat(path)
+        parent = os.stat(os.path.dirname(os.path.abspath(path)))
+    except OSError:
+        return False
+    return (
+        stat.S_ISSOCK(st.st_mode) and st.st_uid == uid
+        and parent.st_uid == uid and not parent.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    )
+
+
+def delegate(script_file):
+    """Run `script_file` inside the daemon and exit with its result.
+
+    Returns normally (so the caller falls back to inline execution) when the
+    daemon is disabled, not running, untrusted, or fails in any way.
+    """
+    if os.environ.get('JAGGERS_HOOK_DAEMON') == '0':
+        return
+    path = socket_path()
+    if not is_trusted(path):
+        return
+
+    try:
+        import json
+        import socket
+
+        payload = {
+            "script": os.path.basename(script_file),
+            "stdin": sys.stdin.read(),
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+        }
+    except Exception:
+        return
+
+    try:
+        timeout = float(os.environ.get('JAGGERS_HOOK_TIMEOUT', DEFAULT_TIMEOUT))
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(json.dumps(payload).encode('utf-8'))
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        response = json.loads(b''.join(chunks).decode('utf-8'))
+        exit_code = int(response.get('exit_code', 0))
+    except Exception:
+        # Daemon unusable: replay stdin so the inline path sees the same input
+        import io
+        sys.stdin = io.StringIO(payload["stdin"])
+        return
+
+    if response.get('stdout'):
+        sys.stdout.write(response['stdout'])
+        sys.stdout.flush()
+    if response.get('stderr'):
+        sys.stderr.write(response['stderr'])
+        sys.stderr.flush()
+    sys.exit(exit_code)
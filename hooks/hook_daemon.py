@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Persistent hook server that keeps hook modules warm between tool calls.
+
+Usage:
+  hook_daemon.py serve    run in the foreground
+  hook_daemon.py start    spawn a detached server
+  hook_daemon.py stop     ask a running server to exit
+  hook_daemon.py status   report whether a server answers
+
+Hook scripts delegate to this server through hook_client.delegate(). Each hook
+module is imported once (and re-imported when its file changes), so compiled
+pattern tables and in-process caches survive across calls. Requests are
+handled one at a time because a hook run swaps process-wide state (stdio, cwd,
+environment) to reproduce exactly what a standalone invocation would see; for
+that reason only fast hooks are served here. type-safety-enforcement.py, whose
+commit check can take tens of seconds, always runs inline.
+
+The socket lives in a per-user 0700 directory, and clients only connect to a
+socket owned by their own user (see hook_client.is_trusted).
+"""
+import importlib.util
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import subprocess
+import sys
+import threading
+
+# Add script directory to path to allow importing shared modules
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(HOOKS_DIR)
+from hook_client import is_trusted, socket_path
+
+# Only these scripts may be executed through the daemon. Requests are served
+# one at a time, so every hook listed here must finish in well under a second.
+HOOK_SCRIPTS = {
+    'serena-workflow-reminder.py',
+    'skill-suggestion.py',
+    'skill-discovery.py',
+}
+
+# The daemon's own modules are never reloaded
+DAEMON_MODULES = {'hook_client', 'hook_daemon', '__main__'}
+
+_modules = {}
+
+
+def _shared_modules():
+    """Modules imported from HOOKS_DIR by hooks (agent_context, pattern_classifier, ...)."""
+    shared = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if name not in DAEMON_MODULES and path and os.path.dirname(os.path.abspath(path)) == HOOKS_DIR:
+            shared[name] = path
+    return shared
+
+
+def _mtimes(paths):
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def load_hook(script):
+    """Import a hook script as a module, re-importing it if the file or a shared module it uses changed."""
+    path = os.path.join(HOOKS_DIR, script)
+    cached = _modules.get(script)
+    if cached and cached[0] == _mtimes(cached[0]):
+        return cached[1]
+
+    if cached:
+        # Drop shared modules so the re-import picks up their current source too
+        for name in _shared_modules():
+            del sys.modules[name]
+    name = script[:-3].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _modules[script] = (_mtimes([path, *_shared_modules().values()]), module)
+    return module
+
+
+def run_hook(request):
+    """Run one hook invocation and capture its stdout, stderr and exit code."""
+    script = request.get('script')
+    if script not in HOOK_SCRIPTS:
+        return {"stdout": "", "stderr": f"Hook daemon: unknown script {script!r}\n", "exit_code": 0}
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_stdio = (sys.stdin, sys.stdout, sys.stderr)
+    saved_env = dict(os.environ)
+    saved_cwd = os.getcwd()
+    exit_code = 0
+
+    try:
+        sys.stdin = io.StringIO(request.get('stdin', ''))
+        sys.stdout, sys.stderr = stdout, stderr
+        os.environ.clear()
+        os.environ.update(request.get('env') or saved_env)
+        os.chdir(request.get('cwd') or saved_cwd)
+        load_hook(script).main()
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            exit_code = e.code
+        elif e.code is not None:
+            print(e.code, file=stderr)
+            exit_code = 1
+    except Exception as e:
+        # Fail open, same as a standalone hook
+        print(f"Hook Error: {e}", file=stderr)
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved_stdio
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+
+    return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+
+
+class HookRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.read().decode('utf-8'))
+        except Exception:
+            return
+
+        command = request.get('command')
+        if command == 'ping':
+            response = {"ok": True, "pid": os.getpid(), "loaded": sorted(_modules)}
+        elif command == 'shutdown':
+            response = {"ok": True}
+            # shutdown() blocks until serve_forever exits, so call it off-thread
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            response = run_hook(request)
+
+        self.wfile.write(json.dumps(response).encode('utf-8'))
+
+
+def send_command(command, timeout=2.0):
+    """Send a control command to a running daemon; None if unreachable."""
+    if not is_trusted(socket_path()):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path())
+            sock.sendall(json.dumps({"command": command}).encode('utf-8'))
+            sock.shutdown(socket.SHUT_WR)
+            return json.loads(sock.makefile('rb').read().decode('utf-8'))
+    except Exception:
+        return None
+
+
+def prepare_socket_dir(path):
+    """Create the socket's directory as 0700, refusing one that others could write to."""
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"{directory} must be a directory owned by you and writable only by you")
+
+
+def serve():
+    path = socket_path()
+    if send_command('ping') is not None:
+        print(f"Hook daemon already running on {path}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        prepare_socket_dir(path)
+    except PermissionError as e:
+        print(f"Hook daemon: {e}", file=sys.stderr)
+        sys.exit(1)
+    if os.path.lexists(path):
+        os.unlink(path)  # Stale socket left by a crashed server
+
+    # Warm every hook up front so the first tool call is already fast
+    for script in sorted(HOOK_SCRIPTS):
+        try:
+            load_hook(script)
+        except Exception as e:
+            print(f"Hook daemon: failed to preload {script}: {e}", file=sys.stderr)
+
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(path, HookRequestHandler)
+    finally:
+        os.umask(old_umask)
+
+    print(f"Hook daemon listening on {path} (pid {os.getpid()})", file=sys.stderr)
+    try:
+        server.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else ''
+
+    if command == 'serve':
+        serve()
+    elif command == 'start':
+        if send_command('ping') is not None:
+            print(f"Hook daemon already running on {socket_path()}")
+            sys.exit(0)
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), 'serve'],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        print(f"Hook daemon starting on {socket_path()}")
+    elif command == 'stop':
+        if send_command('shutdown') is None:
+            print("Hook daemon not running")
+            sys.exit(1)
+        print("Hook daemon stopped")
+    elif command == 'status':
+        info = send_command('ping')
+        if info is None:
+            print("Hook daemon not running")
+            sys.exit(1)
+        print(f"Hook daemon running (pid {info['pid']}) on {socket_path()}")
+        print(f"Loaded hooks: {', '.join(info['loaded']) or 'none'}")
+    else:
+        print("Usage: hook_daemon.py <serve|start|stop|status>")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Single-pass classification of text against named groups of regex patterns.
+
+Each pattern is indexed by the literal strings its matches must start with
+(e.g. `(fix|correggi).*typo` starts with "fix" or "correggi"). A trie regex
+over those literals walks the text once, left to right; a full pattern is
+only tried where one of its literals occurs, and a group's literals drop out
+of the scan as soon as the group has matched. Results are identical to
+calling `re.search(pattern, text, re.IGNORECASE)` for every pattern.
+"""
+import re
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+
+def _leading_literals(items):
+    """Return literal prefixes one of which starts every match, or None."""
+    prefixes = [""]
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            prefixes = [p + chr(av) for p in prefixes]
+            continue
+        if op is sre_parse.SUBPATTERN:
+            branches = [av[-1]]
+        elif op is sre_parse.BRANCH:
+            branches = av[1]
+        else:
+            break
+        heads = []
+        for branch in branches:
+            sub = _leading_literals(branch)
+            if sub is None:
+                heads = None
+                break
+            heads.extend(sub)
+        if heads:
+            prefixes = [p + h for p in prefixes for h in heads]
+        break
+    if not all(prefixes):
+        return None
+    return prefixes
+
+
+def _trie_regex(literals, flags=0):
+    """Compile literals into a prefix-factored alternation."""
+    trie = {}
+    for literal in literals:
+        node = trie
+        for ch in literal:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node):
+        if "" in node:
+            return ""  # Only match starts matter, so the shortest literal is enough
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items())]
+        return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+    return re.compile(emit(trie), flags)
+
+
+_ASCII = [chr(i) for i in range(128)]
+
+
+def _ascii_form(literal):
+    """Lowercase ASCII string that literal matches in ASCII text under re.IGNORECASE, or None.
+
+    IGNORECASE equates a few non-ASCII characters with ASCII ones (e.g. "ſ"
+    with "s", the Kelvin sign with "k"); a literal holding any other
+    non-ASCII character can never match ASCII text.
+    """
+    out = []
+    for ch in literal:
+        if ch.isascii():
+            out.append(ch.lower())
+            continue
+        same = {a.lower() for a in _ASCII if re.fullmatch(re.escape(ch), a, re.IGNORECASE)}
+        if len(same) != 1:
+            return None
+        out.append(same.pop())
+    return "".join(out)
+
+
+class _Index:
+    """Literal trigger index: first char -> entries, plus one trie scanner per set of pending groups."""
+
+    def __init__(self, names, flags):
+        self.flags = flags
+        self.by_first_char = {}  # first char -> [(literal, group, regex)]
+        self.literals = {name: set() for name in names}
+        self.scanners = {}
+
+    def add(self, literal, name, regex):
+        self.literals[name].add(literal)
+        self.by_first_char.setdefault(literal[0], []).append((literal, name, regex))
+
+    def scanner(self, pending):
+        """Trigger regex over the literals of the still-unmatched groups."""
+        key = frozenset(pending)
+        if key not in self.scanners:
+            literals = set().union(*(self.literals[name] for name in key)) if key else set()
+            self.scanners[key] = _trie_regex(literals, self.flags) if literals else None
+        return self.scanners[key]
+
+
+class PatternClassifier:
+    """Classify text against {group_name: [pattern, ...]} in one scan.
+
+    ASCII prompts (nearly all of them) are lowercased, which is exact for
+    ASCII, and scanned with a case-sensitive trie; an IGNORECASE trie is
+    several times slower on large prompts. Other prompts are scanned with
+    the IGNORECASE trie, since str.lower() and re.IGNORECASE disagree on
+    characters such as "İ" (two chars when lowered) and "ſ".
+    """
+
+    def __init__(self, groups):
+        self.names = tuple(groups)
+        self._ascii = _Index(self.names, 0)
+        self._unicode = _Index(self.names, re.IGNORECASE)
+        self._by_text_char = {}  # non-ASCII scan: char seen in text -> entries whose first char it matches
+        self._unindexed = []  # (group, regex) for patterns with no literal prefix (e.g. ^-anchored)
+
+        for name, patterns in groups.items():
+            for pattern in patterns:
+                regex = re.compile(pattern, re.IGNORECASE)
+                literals = _leading_literals(sre_parse.parse(pattern))
+                if literals is None:
+                    self._unindexed.append((name, regex))
+                    continue
+                for literal in {l.lower() for l in literals}:
+                    self._unicode.add(literal, name, regex)
+                    ascii_literal = _ascii_form(literal)
+                    if ascii_literal:
+                        self._ascii.add(ascii_literal, name, regex)
+
+    def _entries(self, ch):
+        """Entries whose literal starts with a char equal to `ch` under re.IGNORECASE."""
+        entries = self._by_text_char.get(ch)
+        if entries is None:
+            entries = [
+                entry
+                for first, bucket in self._unicode.by_first_char.items()
+                if re.fullmatch(re.escape(first), ch, re.IGNORECASE)
+                for entry in bucket
+            ]
+            self._by_text_char[ch] = entries
+        return entries
+
+    def classify(self, text):
+        """Return the set of group names with at least one matching pattern."""
+        found = set()
+        for name, regex in self._unindexed:
+            if name not in found and regex.search(text):
+                found.add(name)
+
+        if text.isascii():
+            index, haystack = self._ascii, text.lower()
+            by_first_char = index.by_first_char
+            entries = lambda ch: by_first_char.get(ch, ())
+        else:
+            index, haystack, entries = self._unicode, text, self._entries
+
+        pending = set(self.names) - found
+        pos = 0
+        while pending:
+            scanner = index.scanner(pending)
+            if scanner is None:
+                break
+            m = scanner.search(haystack, pos)
+            if not m:
+                break
+            start = m.start()
+            for literal, name, regex in entries(haystack[start]):
+                if name in pending and regex.match(text, start):
+                    found.add(name)
+                    pending.discard(name)
+            pos = start + 1
+        return found
@@ -4,6 +4,10 @@ import os
 
 # Add script directory to path to allow importing shared modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+if __name__ == "__main__":
+    from hook_client import delegate
+    delegate(__file__)  # Returns only when no hook daemon is available
+
 from agent_context import AgentContext
 
 def get_skill_reminder(agent_type):
@@ -27,48 +31,96 @@ Ref: ~/{folder}/skills/using-serena-lsp/SKILL.md
 
 CODE_EXTENSIONS = {'.py', '.ts', '.js', '.jsx', '.tsx', '.go', '.rs', '.java', '.cpp', '.c', '.h'}
 
-def count_lines(filepath):
+MAX_READ_LINES = 300
+COUNT_CHUNK_SIZE = 1 << 20
+LINE_CACHE_MAX = 512
+
+# (device, inode, mtime_ns, size) -> line count; stays warm under hook_daemon.py
+_line_cache = {}
+
+def count_lines(filepath, st=None):
     try:
-        with open(filepath, 'r') as f:
-            return sum(1 for _ in f)
-    except:
+        st = st or os.stat(filepath)
+    except OSError:
         return 0
 
-try:
-    ctx = AgentContext()
-    event = ctx.event
+    key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _line_cache.get(key)
+    if cached is not None:
+        return cached
 
-    if event == 'SessionStart':
-        ctx.allow(additional_context=get_skill_reminder(ctx.agent_type))
+    try:
+        newlines = 0
+        last = b'\n'
+        with open(filepath, 'rb') as f:
+            while True:
+                chunk = f.read(COUNT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                newlines += chunk.count(b'\n')
+                last = chunk[-1:]
+    except OSError:
+        return 0
 
-    elif event in ['PreToolUse', 'BeforeTool']:
-        tool_name = ctx.tool_name
+    # Match line iteration: an unterminated final line still counts
+    lines = newlines + (last != b'\n')
+    if len(_line_cache) >= LINE_CACHE_MAX:
+        _line_cache.clear()
+    _line_cache[key] = lines
+    return lines
+
+def lines_over_limit(filepath):
+    """Return the line count if it exceeds MAX_READ_LINES, else 0."""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return 0
+    # A file of N bytes holds at most N lines, so small files need no counting
+    if st.st_size <= MAX_READ_LINES:
+        return 0
+    loc = count_lines(filepath, st)
+    return loc if loc > MAX_READ_LINES else 0
+
+def main():
+    try:
+        ctx = AgentContext()
+        event = ctx.event
+
+        if event == 'SessionStart':
+            ctx.allow(additional_context=get_skill_reminder(ctx.agent_type))
+
+        elif event in ['PreToolUse', 'BeforeTool']:
+            tool_name = ctx.tool_name
         
-        # Rule 1: Block Reading Large Code Files
-        if tool_name in ['Read', 'read_file']:
-            file_path = ctx.get_file_path()
-            _, ext = os.path.splitext(file_path)
-            if ext in CODE_EXTENSIONS:
-                loc = count_lines(file_path)
-                if loc > 300:
-                    ctx.block(
-                        reason=f"VIOLATION: Reading full file of {loc} lines is forbidden. Use 'get_symbols_overview' and 'find_symbol' to save tokens.",
-                        system_message="⚠️ Blocked inefficient file read. Use Serena semantic tools."
+            # Rule 1: Block Reading Large Code Files
+            if tool_name in ['Read', 'read_file']:
+                file_path = ctx.get_file_path()
+                _, ext = os.path.splitext(file_path)
+                if ext in CODE_EXTENSIONS:
+                    loc = lines_over_limit(file_path)
+                    if loc:
+                        ctx.block(
+                            reason=f"VIOLATION: Reading full file of {loc} lines is forbidden. Use 'get_symbols_overview' and 'find_symbol' to save tokens.",
+                            system_message="⚠️ Blocked inefficient file read. Use Serena semantic tools."
+                        )
+
+            # Rule 2: Block Generic Edits on Code
+            if tool_name in ['Edit', 'replace']:
+                file_path = ctx.get_file_path()
+                _, ext = os.path.splitext(file_path)
+                if ext in CODE_EXTENSIONS:
+                     ctx.block(
+                        reason=f"VIOLATION: Generic '{tool_name}' is unsafe for code. Use 'replace_symbol_body' or 'insert_after_symbol' for surgical edits.",
+                        system_message="⚠️ Blocked unsafe edit. Use Serena semantic tools."
                     )
 
-        # Rule 2: Block Generic Edits on Code
-        if tool_name in ['Edit', 'replace']:
-            file_path = ctx.get_file_path()
-            _, ext = os.path.splitext(file_path)
-            if ext in CODE_EXTENSIONS:
-                 ctx.block(
-                    reason=f"VIOLATION: Generic '{tool_name}' is unsafe for code. Use 'replace_symbol_body' or 'insert_after_symbol' for surgical edits.",
-                    system_message="⚠️ Blocked unsafe edit. Use Serena semantic tools."
-                )
-
-    ctx.fail_open()
-
-except Exception as e:
-    # Fail safe: log error but allow operation
-    print(f"Hook Error: {e}", file=sys.stderr)
-    sys.exit(0)
\ No newline at end of file
+        ctx.fail_open()
+
+    except Exception as e:
+        # Fail safe: log error but allow operation
+        print(f"Hook Error: {e}", file=sys.stderr)
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,10 @@ import re
 
 # Add script directory to path to allow importing shared modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+if __name__ == "__main__":
+    from hook_client import delegate
+    delegate(__file__)  # Returns only when no hook daemon is available
+
 from agent_context import AgentContext
 
 def get_first_sentence(text):
@@ -49,6 +53,63 @@ def parse_skill_md(file_path):
         print(f"Error parsing {file_path}: {e}", file=sys.stderr)
     return None
 
+INDEX_VERSION = 1
+
+def get_index_path(project_dir):
+    return os.path.join(project_dir, '.jaggers', 'cache', 'skill-index.json')
+
+def load_index(index_path):
+    """Load the persisted catalog, or an empty one if missing/stale/corrupt."""
+    try:
+        with open(index_path, 'r') as f:
+            data = json.load(f)
+        skills = data.get('skills')
+        if data.get('version') == INDEX_VERSION and isinstance(skills, dict):
+            return skills
+    except Exception:
+        pass
+    return {}
+
+def save_index(index_path, skills):
+    """Write the catalog atomically so parallel sessions never read a partial file."""
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": INDEX_VERSION, "skills": skills}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, index_path)
+    except Exception as e:
+        print(f"Could not write skill index {index_path}: {e}", file=sys.stderr)
+
+def collect_skills(skills_root, index):
+    """Return ({rel_path: entry}, changed) re-parsing only SKILL.md files whose mtime/size moved."""
+    skills = {}
+    changed = False
+    with os.scandir(skills_root) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            skill_md = os.path.join(entry.path, 'SKILL.md')
+            try:
+                st = os.stat(skill_md)
+            except OSError:
+                continue
+
+            key = f"{entry.name}/SKILL.md"
+            cached = index.get(key)
+            if cached and cached.get('mtime_ns') == st.st_mtime_ns and cached.get('size') == st.st_size:
+                skills[key] = cached
+                continue
+
+            result = parse_skill_md(skill_md)
+            name, desc = result if result else (None, None)
+            skills[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "name": name, "description": desc}
+            changed = True
+
+    if skills.keys() != index.keys():
+        changed = True
+    return skills, changed
+
 def main():
     try:
         ctx = AgentContext()
@@ -58,16 +119,15 @@ def main():
         if not os.path.exists(skills_root):
             ctx.fail_open()
 
-        available_skills = []
-        for skill_dir in os.listdir(skills_root):
-            skill_path = os.path.join(skills_root, skill_dir)
-            if os.path.isdir(skill_path):
-                skill_md = os.path.join(skill_path, 'SKILL.md')
-                if os.path.exists(skill_md):
-                    result = parse_skill_md(skill_md)
-                    if result:
-                        name, desc = result
-                        available_skills.append(f"- {name}: {desc}")
+        index_path = get_index_path(project_dir)
+        skills, changed = collect_skills(skills_root, load_index(index_path))
+        if changed:
+            save_index(index_path, skills)
+
+        available_skills = [
+            f"- {entry['name']}: {entry['description']}"
+            for entry in skills.values() if entry.get('name')
+        ]
 
         if not available_skills:
             ctx.fail_open()
@@ -5,7 +5,12 @@ import re
 
 # Add script directory to path to allow importing shared modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+if __name__ == "__main__" and len(sys.argv) == 1:
+    from hook_client import delegate
+    delegate(__file__)  # Returns only when no hook daemon is available
+
 from agent_context import AgentContext
+from pattern_classifier import PatternClassifier
 
 # Configuration
 ORCHESTRATION_PATTERNS = [
@@ -60,53 +65,102 @@ CONVERSATIONAL_PATTERNS = [
     r"^tutto bene\?$|^all good\?$|^everything ok\?$"
 ]
 
-def matches(text, patterns):
-    for pattern in patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
-    return False
+DELEGATE_PATTERNS = [r"delegate"]
 
-try:
-    ctx = AgentContext()
-    prompt = ctx.prompt
+ACTION_VERB_PATTERNS = [
+    r"(creare|create|fare|do|aggiungere|add|modificare|modify|controllare|check|verificare|verify|testare|test)"
+]
 
-    if not prompt:
-        ctx.fail_open()
+CLASSIFIER = PatternClassifier({
+    "exclude": EXCLUDE_PATTERNS,
+    "conversational": CONVERSATIONAL_PATTERNS,
+    "delegate": DELEGATE_PATTERNS,
+    "ccs": CCS_PATTERNS,
+    "orchestration": ORCHESTRATION_PATTERNS,
+    "vague": P_PATTERNS,
+    "action_verb": ACTION_VERB_PATTERNS,
+})
 
-    ccs_available = not bool(os.environ.get('CLAUDECODE'))
-    ccs_hint = "CCS backend" if ccs_available else "Gemini or Qwen directly (CCS unavailable inside Claude Code)"
+def main():
+    try:
+        ctx = AgentContext()
+        prompt = ctx.prompt
 
-    # 1. Check Exclusions
-    if matches(prompt, EXCLUDE_PATTERNS) or matches(prompt, CONVERSATIONAL_PATTERNS):
-        ctx.fail_open()
+        if not prompt:
+            ctx.fail_open()
+
+        ccs_available = not bool(os.environ.get('CLAUDECODE'))
+        ccs_hint = "CCS backend" if ccs_available else "Gemini or Qwen directly (CCS unavailable inside Claude Code)"
 
-    agent_name = ctx.agent_type.capitalize()
+        groups = CLASSIFIER.classify(prompt)
 
-    # 2. Check Explicit Delegation
-    if re.search(r'delegate', prompt, re.IGNORECASE):
-        ctx.allow(system_message=f"💡 {agent_name} Internal Reminder: User mentioned 'delegate'. Consider using the /delegating skill to offload this task.")
+        # 1. Check Exclusions
+        if "exclude" in groups or "conversational" in groups:
+            ctx.fail_open()
 
-    # 3. Check CCS Delegation (Simple Tasks)
-    if matches(prompt, CCS_PATTERNS):
-        ctx.allow(system_message=f"💡 {agent_name} Internal Reminder: This appears to be a simple, deterministic task (typo/test/format/doc). Consider using the /delegating skill ({ccs_hint}) for cost-optimized execution.")
+        agent_name = ctx.agent_type.capitalize()
 
-    # 4. Check Orchestration (Complex Tasks)
-    elif matches(prompt, ORCHESTRATION_PATTERNS) and not matches(prompt, EXCLUDE_PATTERNS):
-        ctx.allow(system_message=f"💡 {agent_name} Internal Reminder: This looks like a multi-agent task (review/implement/debug). Consider using the /delegating skill (Gemini+Qwen orchestration) instead of handling in main session.")
+        # 2. Check Explicit Delegation
+        if "delegate" in groups:
+            ctx.allow(system_message=f"💡 {agent_name} Internal Reminder: User mentioned 'delegate'. Consider using the /delegating skill to offload this task.")
 
-    # 5. Check Prompt Improving (/p)
-    word_count = len(prompt.split())
-    is_vague = matches(prompt, P_PATTERNS)
-    
-    # Heuristic for very short command-like prompts
-    if word_count < 6 and not is_vague:
-        if matches(prompt, [r"(creare|create|fare|do|aggiungere|add|modificare|modify|controllare|check|verificare|verify|testare|test)"]):
+        # 3. Check CCS Delegation (Simple Tasks)
+        if "ccs" in groups:
+            ctx.allow(system_message=f"💡 {agent_name} Internal Reminder: This appears to be a simple, deterministic task (typo/test/format/doc). Consider using the /delegating skill ({ccs_hint}) for cost-optimized execution.")
+
+        # 4. Check Orchestration (Complex Tasks)
+        elif "orchestration" in groups:
+            ctx.allow(system_message=f"💡 {agent_name} Internal Reminder: This looks like a multi-agent task (review/implement/debug). Consider using the /delegating skill (Gemini+Qwen orchestration) instead of handling in main session.")
+
+        # 5. Check Prompt Improving (/p)
+        word_count = len(prompt.split())
+        is_vague = "vague" in groups
+
+        # Heuristic for very short command-like prompts
+        if word_count < 6 and not is_vague and "action_verb" in groups:
             is_vague = True
 
-    if is_vague:
-        ctx.allow(system_message=f"💡 {agent_name} Internal Reminder: This prompt appears vague or could benefit from structure. Consider using the /prompt-improving skill to add XML structure, examples, and thinking space before proceeding.")
+        if is_vague:
+            ctx.allow(system_message=f"💡 {agent_name} Internal Reminder: This prompt appears vague or could benefit from structure. Consider using the /prompt-improving skill to add XML structure, examples, and thinking space before proceeding.")
 
-    ctx.fail_open()
+        ctx.fail_open()
 
-except Exception:
-    sys.exit(0)
+    except Exception:
+        sys.exit(0)
+
+
+def run_benchmark(iterations=200):
+    """Micro-benchmark: compiled classifier vs. per-pattern re.search."""
+    import timeit
+
+    def naive(text):
+        return {
+            name for name, patterns in zip(CLASSIFIER.names, (
+                EXCLUDE_PATTERNS, CONVERSATIONAL_PATTERNS, DELEGATE_PATTERNS, CCS_PATTERNS,
+                ORCHESTRATION_PATTERNS, P_PATTERNS, ACTION_VERB_PATTERNS,
+            ))
+            if any(re.search(p, text, re.IGNORECASE) for p in patterns)
+        }
+
+    log_line = "2026-02-01 12:00:00 INFO worker[42] request handled in 12ms status=200 path=/api/v1/items\n"
+    prompts = {
+        "short": "fix typo in README",
+        "medium (~4KB)": "please look at these logs\n" + log_line * 40,
+        "large (~16KB log paste)": "why does this happen?\n" + log_line * 180,
+        "huge (~50KB log paste)": "why does this happen?\n" + log_line * 560,
+    }
+
+    print(f"{'prompt':<26}{'bytes':>8}{'per-pattern':>14}{'compiled':>12}{'speedup':>9}")
+    for label, text in prompts.items():
+        assert CLASSIFIER.classify(text) == naive(text)
+        CLASSIFIER.classify(text)  # Warm the compiled-regex cache
+        t_naive = timeit.timeit(lambda: naive(text), number=iterations) / iterations
+        t_fast = timeit.timeit(lambda: CLASSIFIER.classify(text), number=iterations) / iterations
+        print(f"{label:<26}{len(text):>8}{t_naive * 1e6:>12.1f}us{t_fast * 1e6:>10.1f}us{t_naive / t_fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--bench"]:
+        run_benchmark()
+    else:
+        main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Tests for the hook daemon and its client shim."""
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import hook_client
+import hook_daemon
+
+
+@pytest.fixture
+def short_tmp():
+    # AF_UNIX paths are limited to ~100 bytes, too short for pytest's tmp_path
+    import tempfile
+    import shutil
+    directory = tempfile.mkdtemp(prefix='jh-', dir='/tmp')
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def bind(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    return sock
+
+
+def test_default_socket_is_inside_per_user_dir(monkeypatch, short_tmp):
+    monkeypatch.delenv('JAGGERS_HOOK_SOCKET', raising=False)
+    monkeypatch.setenv('XDG_RUNTIME_DIR', short_tmp)
+    path = hook_client.socket_path()
+    assert os.path.dirname(path) == os.path.join(short_tmp, f"jaggers-hooks-{os.getuid()}")
+
+
+def test_trusts_own_socket_in_private_dir(short_tmp):
+    directory = os.path.join(short_tmp, 'd')
+    hook_daemon.prepare_socket_dir(os.path.join(directory, 'hooks.sock'))
+    assert os.stat(directory).st_mode & 0o777 == 0o700
+    path = os.path.join(directory, 'hooks.sock')
+    with bind(path):
+        assert hook_client.is_trusted(path)
+
+
+def test_rejects_socket_in_shared_dir(short_tmp):
+    os.chmod(short_tmp, 0o1777)
+    path = os.path.join(short_tmp, 'hooks.sock')
+    with bind(path):
+        assert not hook_client.is_trusted(path)
+
+
+def test_rejects_non_socket_and_missing_path(short_tmp):
+    os.chmod(short_tmp, 0o700)
+    regular = os.path.join(short_tmp, 'hooks.sock')
+    open(regular, 'w').close()
+    assert not hook_client.is_trusted(regular)
+    assert not hook_client.is_trusted(os.path.join(short_tmp, 'missing.sock'))
+
+
+def test_prepare_socket_dir_refuses_writable_dir(short_tmp):
+    directory = os.path.join(short_tmp, 'shared')
+    os.mkdir(directory)
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        hook_daemon.prepare_socket_dir(os.path.join(directory, 'hooks.sock'))
+
+
+def test_delegate_skips_untrusted_socket(monkeypatch, short_tmp):
+    os.chmod(short_tmp, 0o777)
+    path = os.path.join(short_tmp, 'hooks.sock')
+    monkeypatch.setenv('JAGGERS_HOOK_SOCKET', path)
+    monkeypatch.delenv('JAGGERS_HOOK_DAEMON', raising=False)
+    with bind(path) as server:
+        server.listen(1)
+        # Returns (inline fallback) instead of connecting and exiting
+        hook_client.delegate('skill-suggestion.py')
+
+
+def test_type_safety_runs_inline():
+    assert 'type-safety-enforcement.py' not in hook_daemon.HOOK_SCRIPTS
+    assert hook_client.DEFAULT_TIMEOUT < 5.0
+
+
+def test_load_hook_reloads_changed_shared_module(monkeypatch, tmp_path):
+    monkeypatch.setattr(hook_daemon, 'HOOKS_DIR', str(tmp_path))
+    monkeypatch.setattr(hook_daemon, '_modules', {})
+    monkeypatch.syspath_prepend(str(tmp_path))
+    shared = tmp_path / 'jh_shared_helper.py'
+    shared.write_text("VALUE = 1\n")
+    (tmp_path / 'demo-hook.py').write_text(
+        "import jh_shared_helper\n"
+        "def main():\n"
+        "    print(jh_shared_helper.VALUE)\n"
+    )
+    try:
+        first = hook_daemon.load_hook('demo-hook.py')
+        assert hook_daemon.load_hook('demo-hook.py') is first
+
+        shared.write_text("VALUE = 2\n")
+        os.utime(shared, ns=(time.time_ns(), time.time_ns() + 10**9))
+        second = hook_daemon.load_hook('demo-hook.py')
+        assert second is not first
+        assert second.jh_shared_helper.VALUE == 2
+    finally:
+        sys.modules.pop('jh_shared_helper', None)
+
+
+def test_daemon_runs_hook_and_relays_exit_code(monkeypatch, tmp_path, short_tmp):
+    monkeypatch.setattr(hook_daemon, 'HOOKS_DIR', str(tmp_path))
+    monkeypatch.setattr(hook_daemon, 'HOOK_SCRIPTS', {'echo-hook.py'})
+    monkeypatch.setattr(hook_daemon, '_modules', {})
+    (tmp_path / 'echo-hook.py').write_text(
+        "import sys\n"
+        "def main():\n"
+        "    print(sys.stdin.read().upper())\n"
+        "    sys.exit(2)\n"
+    )
+    path = os.path.join(short_tmp, 'hooks.sock')
+    server = socketserver.UnixStreamServer(path, hook_daemon.HookRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5)
+            sock.connect(path)
+            sock.sendall(json.dumps({"script": "echo-hook.py", "stdin": "hi", "cwd": str(tmp_path)}).encode())
+            sock.shutdown(socket.SHUT_WR)
+            response = json.loads(sock.makefile('rb').read())
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert response == {"stdout": "HI\n", "stderr": "", "exit_code": 2}
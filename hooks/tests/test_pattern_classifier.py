@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Parity tests: PatternClassifier.classify() vs. per-pattern re.search."""
+
+import importlib.util
+import os
+import random
+import re
+import sys
+
+import pytest
+
+HOOKS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, HOOKS_DIR)
+from pattern_classifier import PatternClassifier
+
+spec = importlib.util.spec_from_file_location(
+    "skill_suggestion", os.path.join(HOOKS_DIR, "skill-suggestion.py")
+)
+skill_suggestion = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(skill_suggestion)
+
+GROUPS = {
+    "exclude": skill_suggestion.EXCLUDE_PATTERNS,
+    "conversational": skill_suggestion.CONVERSATIONAL_PATTERNS,
+    "delegate": skill_suggestion.DELEGATE_PATTERNS,
+    "ccs": skill_suggestion.CCS_PATTERNS,
+    "orchestration": skill_suggestion.ORCHESTRATION_PATTERNS,
+    "vague": skill_suggestion.P_PATTERNS,
+    "action_verb": skill_suggestion.ACTION_VERB_PATTERNS,
+}
+
+
+def naive(text):
+    return {
+        name for name, patterns in GROUPS.items()
+        if any(re.search(p, text, re.IGNORECASE) for p in patterns)
+    }
+
+
+PROMPTS = [
+    "",
+    "fix typo in README",
+    "Fix Typo in README",
+    "FIX TYPO",
+    "hi",
+    "Hi!",
+    "HELLO.",
+    "  hi",
+    "hi there",
+    "Thanks a lot!",
+    "How are you?",
+    "how are you? fine",
+    "How do I add a test?",
+    "why is this slow",
+    "Explain why",
+    "Come stai?",
+    "Sì",
+    "OK",
+    "agree",
+    "Please DELEGATE this",
+    "review the code for security issues",
+    "Security Audit of auth module",
+    "Rename Variable foo",
+    "rinomina la variabile",
+    "estrai funzione",
+    "migration plan",
+    "refactor sprint planning",
+    "FİX typo",
+    "İmplement the feature",
+    "ſecurity audit",
+    "Keep it simple",
+    "fix\ntypo",
+    "please look at these logs\n" + "INFO worker handled request status=200\n" * 50,
+]
+
+
+@pytest.mark.parametrize("text", PROMPTS)
+def test_matches_per_pattern_search(text):
+    assert skill_suggestion.CLASSIFIER.classify(text) == naive(text)
+
+
+def test_fuzz_against_per_pattern_search():
+    rng = random.Random(1234)
+    words = sorted({w for patterns in GROUPS.values() for p in patterns for w in re.findall(r"[^\W\d_]+", p)})
+    words += ["?", "!", ".", "the", "a", "\n", "İ", "ſ", "K"]
+    for _ in range(2000):
+        parts = [rng.choice(words) for _ in range(rng.randint(1, 6))]
+        text = rng.choice(["", " "]).join(parts)
+        text = "".join(c.upper() if rng.random() < 0.3 else c for c in text)
+        assert skill_suggestion.CLASSIFIER.classify(text) == naive(text), text
+
+
+def test_anchored_patterns_are_not_indexed():
+    classifier = PatternClassifier({"start": [r"^(how|why)"], "word": [r"deploy"]})
+    assert classifier.classify("How now") == {"start"}
+    assert classifier.classify("so how now") == set()
+    assert classifier.classify("WHY deploy") == {"start", "word"}
+
+
+@pytest.mark.parametrize("text", ["SECRET", "a secret", "key", "KEY", "perché", "PERCHÉ", "perche", "Ki"])
+def test_ascii_fast_path_handles_non_ascii_literals(text):
+    # "ſ" and the Kelvin sign match ASCII letters under IGNORECASE; "é" never does
+    groups = {"long_s": ["ſecret"], "kelvin": ["Key"], "accent": ["perché"]}
+    expected = {name for name, patterns in groups.items() if any(re.search(p, text, re.IGNORECASE) for p in patterns)}
+    assert PatternClassifier(groups).classify(text) == expected
+
+
+def test_large_prompt_stays_fast():
+    """Guards the single-scan design: a 50KB log paste must not cost per-pattern search time."""
+    import timeit
+    log_line = "2026-02-01 12:00:00 INFO worker[42] request handled in 12ms status=200 path=/api/v1/items\n"
+    text = "why does this happen?\n" + log_line * 560
+    classifier = skill_suggestion.CLASSIFIER
+    classifier.classify(text)  # Compile the scanners
+    fast = min(timeit.repeat(lambda: classifier.classify(text), number=5, repeat=3)) / 5
+    slow = min(timeit.repeat(lambda: naive(text), number=1, repeat=3))
+    # ~45x on a typical machine; the IGNORECASE-only scan managed ~6x
+    assert slow / fast > 15, f"classify {fast * 1e3:.2f}ms vs per-pattern {slow * 1e3:.2f}ms"
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Tests for the large-file read check in serena-workflow-reminder.py."""
+
+import importlib.util
+import os
+
+import pytest
+
+HOOKS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location(
+    "serena_workflow_reminder", os.path.join(HOOKS_DIR, "serena-workflow-reminder.py")
+)
+reminder = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(reminder)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    reminder._line_cache.clear()
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_counts_unterminated_last_line(tmp_path):
+    assert reminder.count_lines(write(tmp_path / "a.py", b"one\ntwo\nthree")) == 3
+    assert reminder.count_lines(write(tmp_path / "b.py", b"one\ntwo\nthree\n")) == 3
+    assert reminder.count_lines(write(tmp_path / "c.py", b"")) == 0
+    assert reminder.count_lines(write(tmp_path / "d.py", b"\n")) == 1
+
+
+def test_counts_across_chunk_boundaries(tmp_path, monkeypatch):
+    monkeypatch.setattr(reminder, "COUNT_CHUNK_SIZE", 4)
+    path = write(tmp_path / "a.py", b"ab\ncd\nef\ngh")
+    assert reminder.count_lines(path) == 4
+    with open(path) as f:
+        assert reminder.count_lines(path) == sum(1 for _ in f)
+
+
+def test_missing_file_counts_zero(tmp_path):
+    assert reminder.count_lines(str(tmp_path / "missing.py")) == 0
+    assert reminder.lines_over_limit(str(tmp_path / "missing.py")) == 0
+
+
+def test_small_files_are_not_read(tmp_path, monkeypatch):
+    # At most one line per byte, so a file this small can never be over the limit
+    path = write(tmp_path / "a.py", b"\n" * reminder.MAX_READ_LINES)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("count_lines should not be called")
+
+    monkeypatch.setattr(reminder, "count_lines", fail)
+    assert reminder.lines_over_limit(path) == 0
+
+
+def test_lines_over_limit_threshold(tmp_path):
+    at_limit = write(tmp_path / "a.py", b"x = 1\n" * reminder.MAX_READ_LINES)
+    over_limit = write(tmp_path / "b.py", b"x = 1\n" * reminder.MAX_READ_LINES + b"x = 1")
+    assert reminder.lines_over_limit(at_limit) == 0
+    assert reminder.lines_over_limit(over_limit) == reminder.MAX_READ_LINES + 1
+
+
+def test_recount_after_file_changes(tmp_path):
+    path = tmp_path / "a.py"
+    write(path, b"a\n")
+    assert reminder.count_lines(str(path)) == 1
+    write(path, b"a\nb\nc\n")
+    os.utime(path, ns=(0, 10**9))
+    assert reminder.count_lines(str(path)) == 3
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Tests for the persisted skill catalog in skill-discovery.py."""
+
+import importlib.util
+import io
+import json
+import os
+
+import pytest
+
+HOOKS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location("skill_discovery", os.path.join(HOOKS_DIR, "skill-discovery.py"))
+discovery = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(discovery)
+
+
+def write_skill(skills_root, name, description="Does things. More detail."):
+    skill_dir = skills_root / name
+    skill_dir.mkdir(parents=True, exist_ok=True)
+    path = skill_dir / "SKILL.md"
+    path.write_text(f"---\nname: {name}\ndescription: {description}\n---\n\n# {name}\n")
+    return path
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setenv("GEMINI_PROJECT_DIR", str(tmp_path))
+    write_skill(tmp_path / "skills", "alpha")
+    write_skill(tmp_path / "skills", "beta", "Beta helps.")
+    (tmp_path / "skills" / "not-a-skill").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Records the SKILL.md paths parse_skill_md is called with."""
+    calls = []
+    real = discovery.parse_skill_md
+
+    def spy(path):
+        calls.append(os.path.basename(os.path.dirname(path)))
+        return real(path)
+
+    monkeypatch.setattr(discovery, "parse_skill_md", spy)
+    return calls
+
+
+def run_hook(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps({"hook_event_name": "SessionStart"})))
+    with pytest.raises(SystemExit):
+        discovery.main()
+    return json.loads(capsys.readouterr().out)["hookSpecificOutput"]["additionalContext"]
+
+
+def index_path(project):
+    return discovery.get_index_path(str(project))
+
+
+def test_first_run_parses_and_writes_index(project, parsed, monkeypatch, capsys):
+    context = run_hook(monkeypatch, capsys)
+    assert "- alpha: Does things." in context
+    assert "- beta: Beta helps." in context
+    assert sorted(parsed) == ["alpha", "beta"]
+    with open(index_path(project)) as f:
+        data = json.load(f)
+    assert data["version"] == discovery.INDEX_VERSION
+    assert sorted(data["skills"]) == ["alpha/SKILL.md", "beta/SKILL.md"]
+
+
+def test_unchanged_skills_are_not_reparsed(project, parsed, monkeypatch, capsys):
+    first = run_hook(monkeypatch, capsys)
+    mtime = os.stat(index_path(project)).st_mtime_ns
+    parsed.clear()
+    assert run_hook(monkeypatch, capsys) == first
+    assert parsed == []
+    assert os.stat(index_path(project)).st_mtime_ns == mtime  # Not rewritten
+
+
+def test_changed_mtime_or_size_reparses(project, parsed, monkeypatch, capsys):
+    run_hook(monkeypatch, capsys)
+    parsed.clear()
+    alpha = write_skill(project / "skills", "alpha", "Alpha is new.")
+    assert "- alpha: Alpha is new." in run_hook(monkeypatch, capsys)
+    assert parsed == ["alpha"]
+
+    # Same size, only the mtime moves
+    parsed.clear()
+    os.utime(alpha, ns=(0, os.stat(alpha).st_mtime_ns + 10**9))
+    run_hook(monkeypatch, capsys)
+    assert parsed == ["alpha"]
+
+
+def test_removed_skill_is_dropped_from_index(project, parsed, monkeypatch, capsys):
+    run_hook(monkeypatch, capsys)
+    (project / "skills" / "beta" / "SKILL.md").unlink()
+    (project / "skills" / "beta").rmdir()
+    parsed.clear()
+    context = run_hook(monkeypatch, capsys)
+    assert "beta" not in context
+    assert parsed == []
+    with open(index_path(project)) as f:
+        assert list(json.load(f)["skills"]) == ["alpha/SKILL.md"]
+
+
+@pytest.mark.parametrize("content", [
+    "{not json",
+    "[]",
+    json.dumps({"version": 0, "skills": {"alpha/SKILL.md": {"name": "stale"}}}),
+    json.dumps({"version": discovery.INDEX_VERSION, "skills": ["alpha/SKILL.md"]}),
+])
+def test_corrupt_or_old_index_is_ignored(project, parsed, monkeypatch, capsys, content):
+    os.makedirs(os.path.dirname(index_path(project)))
+    with open(index_path(project), "w") as f:
+        f.write(content)
+    context = run_hook(monkeypatch, capsys)
+    assert "- alpha: Does things." in context
+    assert sorted(parsed) == ["alpha", "beta"]
+    with open(index_path(project)) as f:
+        assert json.load(f)["version"] == discovery.INDEX_VERSION
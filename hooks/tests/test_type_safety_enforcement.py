@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Tests for type-safety-enforcement.py."""
+
+import importlib.util
+import io
+import json
+import os
+
+import pytest
+
+HOOKS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location(
+    "type_safety_enforcement", os.path.join(HOOKS_DIR, "type-safety-enforcement.py")
+)
+hook = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(hook)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, hook.DEFAULT_MYPY_TIME_BUDGET),
+    ("10", 10.0),
+    ("2.5", 2.5),
+    ("", hook.DEFAULT_MYPY_TIME_BUDGET),
+    ("fast", hook.DEFAULT_MYPY_TIME_BUDGET),
+    ("0", hook.DEFAULT_MYPY_TIME_BUDGET),
+    ("-5", hook.DEFAULT_MYPY_TIME_BUDGET),
+    ("nan", hook.DEFAULT_MYPY_TIME_BUDGET),
+    ("inf", hook.DEFAULT_MYPY_TIME_BUDGET),
+])
+def test_time_budget_parsing(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("JAGGERS_MYPY_BUDGET", raising=False)
+    else:
+        monkeypatch.setenv("JAGGERS_MYPY_BUDGET", value)
+    assert hook.get_mypy_time_budget() == expected
+
+
+def test_mode_is_read_per_call(monkeypatch, tmp_path):
+    monkeypatch.setenv("JAGGERS_MYPY_MODE", "batch")
+    assert len(hook.mypy_commands("python", ["a.py"], str(tmp_path))) == 1
+    monkeypatch.setenv("JAGGERS_MYPY_MODE", "daemon")
+    commands = hook.mypy_commands("python", ["a.py"], str(tmp_path))
+    assert [cmd[2] for cmd in commands] == ["mypy.dmypy", "mypy"]
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Git repo with a staged strict-zone file and a fake venv whose mypy output is scripted."""
+    import subprocess
+
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    (tmp_path / "mcp_server").mkdir()
+    (tmp_path / "mcp_server" / "app.py").write_text("from mcp_server import dep\n")
+    (tmp_path / "mcp_server" / "dep.py").write_text("x: int = 'no'\n")
+    subprocess.run(["git", "add", "mcp_server/app.py"], cwd=tmp_path, check=True)
+
+    bin_dir = tmp_path / ".venv" / "bin"
+    bin_dir.mkdir(parents=True)
+    (bin_dir / "activate").write_text("")
+    python = bin_dir / "python"
+    # Logs the module run ("mypy" or "mypy.dmypy"); status.<module> overrides status
+    python.write_text(
+        "#!/bin/sh\n"
+        "dir=\"$(dirname \"$0\")\"\n"
+        "echo \"$2\" >> \"$dir/calls\"\n"
+        "[ -f \"$dir/sleep\" ] && exec sleep \"$(cat \"$dir/sleep\")\"\n"
+        "cat \"$dir/output\"\n"
+        "[ -f \"$dir/status.$2\" ] && exit \"$(cat \"$dir/status.$2\")\"\n"
+        "exit \"$(cat \"$dir/status\")\"\n"
+    )
+    python.chmod(0o755)
+
+    monkeypatch.setenv("CLAUDE_PROJECT_DIR", str(tmp_path))
+    monkeypatch.delenv("GEMINI_PROJECT_DIR", raising=False)
+    monkeypatch.setenv("JAGGERS_MYPY_MODE", "batch")
+    return tmp_path
+
+
+def mypy_result(project, status, output="", **module_status):
+    """Script the fake mypy: exit status and stdout, e.g. dmypy=2 for mypy.dmypy only."""
+    bin_dir = project / ".venv" / "bin"
+    (bin_dir / "status").write_text(str(status))
+    (bin_dir / "output").write_text(output)
+    for module, code in module_status.items():
+        (bin_dir / f"status.mypy.{module}").write_text(str(code))
+
+
+def mypy_calls(project):
+    calls = project / ".venv" / "bin" / "calls"
+    return calls.read_text().split() if calls.exists() else []
+
+
+def run_commit_hook(monkeypatch, capsys):
+    """Run the hook for `git commit`; return (permission decision, stderr)."""
+    monkeypatch.setattr("sys.stdin", io.StringIO(json.dumps({
+        "hook_event_name": "PreToolUse",
+        "tool_name": "Bash",
+        "tool_input": {"command": "git commit -m wip"},
+    })))
+    with pytest.raises(SystemExit):
+        hook.main()
+    out, err = capsys.readouterr()
+    return json.loads(out)["hookSpecificOutput"]["permissionDecision"], err
+
+
+def commit_check(project, monkeypatch, capsys):
+    """Run the hook for `git commit`; return (blocked, number of mypy runs so far)."""
+    decision, _ = run_commit_hook(monkeypatch, capsys)
+    calls = project / ".venv" / "bin" / "calls"
+    return decision == "deny", len(calls.read_text().splitlines()) if calls.exists() else 0
+
+
+def test_error_in_imported_module_is_not_cached(project, monkeypatch, capsys):
+    # mypy reports the error against dep.py, not the staged app.py
+    mypy_result(project, 1, "mcp_server/dep.py:1: error: Incompatible types in assignment\n")
+    assert commit_check(project, monkeypatch, capsys) == (True, 1)
+    # The retry must type-check app.py again rather than skip it as passed
+    assert commit_check(project, monkeypatch, capsys) == (True, 2)
+
+
+def test_clean_run_is_cached(project, monkeypatch, capsys):
+    mypy_result(project, 0, "Success: no issues found in 1 source file\n")
+    assert commit_check(project, monkeypatch, capsys) == (False, 1)
+    assert commit_check(project, monkeypatch, capsys) == (False, 1)
+
+
+def test_daemon_failure_falls_back_to_batch(project, monkeypatch, capsys):
+    monkeypatch.setenv("JAGGERS_MYPY_MODE", "daemon")
+    # dmypy exits 2 when the daemon itself broke; the batch run then decides
+    mypy_result(project, 0, "Success: no issues found in 1 source file\n", dmypy=2)
+    assert commit_check(project, monkeypatch, capsys)[0] is False
+    assert mypy_calls(project) == ["mypy.dmypy", "mypy"]
+
+
+def test_daemon_type_errors_do_not_fall_back(project, monkeypatch, capsys):
+    monkeypatch.setenv("JAGGERS_MYPY_MODE", "daemon")
+    mypy_result(project, 1, "mcp_server/app.py:1: error: Bad\n")
+    assert commit_check(project, monkeypatch, capsys)[0] is True
+    assert mypy_calls(project) == ["mypy.dmypy"]
+
+
+def test_budget_exceeded_fails_open(project, monkeypatch, capsys):
+    import time
+    monkeypatch.setenv("JAGGERS_MYPY_BUDGET", "0.5")
+    mypy_result(project, 1, "mcp_server/app.py:1: error: Bad\n")
+    (project / ".venv" / "bin" / "sleep").write_text("5")
+    started = time.monotonic()
+    decision, err = run_commit_hook(monkeypatch, capsys)
+    assert time.monotonic() - started < 3
+    assert decision == "allow"
+    assert "budget, skipping (commit allowed)" in err
+    # Nothing was checked, so nothing is cached
+    (project / ".venv" / "bin" / "sleep").unlink()
+    mypy_result(project, 0)
+    commit_check(project, monkeypatch, capsys)
+    assert mypy_calls(project) == ["mypy", "mypy"]
+
+
+def test_partially_staged_file_is_not_cached(project, monkeypatch, capsys):
+    import subprocess
+    app = project / "mcp_server" / "app.py"
+    app.write_text("x: int = 'BROKEN'\n")
+    subprocess.run(["git", "add", "mcp_server/app.py"], cwd=project, check=True)
+    app.write_text("x: int = 1\n")  # Fixed only in the working tree, which is what mypy reads
+    mypy_result(project, 0, "Success: no issues found in 1 source file\n")
+    assert commit_check(project, monkeypatch, capsys) == (False, 1)
+
+    # Working tree back to the staged (broken) content: the blob must be checked again
+    subprocess.run(["git", "checkout", "--", "mcp_server/app.py"], cwd=project, check=True)
+    mypy_result(project, 1, "mcp_server/app.py:1: error: Incompatible types in assignment\n")
+    assert commit_check(project, monkeypatch, capsys) == (True, 2)
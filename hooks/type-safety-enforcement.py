@@ -2,16 +2,43 @@
 import sys
 import os
 import subprocess
+import time
+import json
+import hashlib
 
 # Add script directory to path to allow importing shared modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Not delegated to the hook daemon: a commit check can take up to the mypy
+# budget, and the daemon serves requests one at a time
 from agent_context import AgentContext
 
 # Configuration
 STRICT_DIRS = ["mcp_server"]
 WARN_DIRS = ["scripts"]
-PROJECT_ROOT = os.environ.get('GEMINI_PROJECT_DIR', os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd()))
-VENV_PATH = os.path.join(PROJECT_ROOT, ".venv")
+MYPY_FLAGS = ["--explicit-package-bases"]
+# Wall-clock seconds for the whole commit check; kept under the hook's 30s timeout
+DEFAULT_MYPY_TIME_BUDGET = 25.0
+DMYPY_IDLE_TIMEOUT = 3600
+# Files whose staged blob already passed under the same mypy config are skipped
+MYPY_CONFIG_FILES = ["mypy.ini", ".mypy.ini", "setup.cfg", "pyproject.toml"]
+RESULT_CACHE_MAX_ENTRIES = 500
+RESULT_CACHE_MAX_AGE = 30 * 24 * 3600
+
+def get_project_root():
+    # Resolved per call: a warm hook daemon serves many projects
+    return os.environ.get('GEMINI_PROJECT_DIR', os.environ.get('CLAUDE_PROJECT_DIR', os.getcwd()))
+
+def get_mypy_mode():
+    """"daemon": incremental dmypy server (falls back to batch), "batch": one cold mypy run."""
+    return os.environ.get('JAGGERS_MYPY_MODE', 'daemon')
+
+def get_mypy_time_budget():
+    """JAGGERS_MYPY_BUDGET in seconds; the default when unset or not a positive number."""
+    try:
+        budget = float(os.environ.get('JAGGERS_MYPY_BUDGET', DEFAULT_MYPY_TIME_BUDGET))
+    except ValueError:
+        return DEFAULT_MYPY_TIME_BUDGET
+    return budget if 0 < budget < float('inf') else DEFAULT_MYPY_TIME_BUDGET
 
 # Colors
 RED = '\033[0;31m'
@@ -20,88 +47,219 @@ GREEN = '\033[0;32m'
 CYAN = '\033[0;36m'
 NC = '\033[0m'
 
-def is_strict_path(file_path):
-    rel_path = os.path.relpath(file_path, PROJECT_ROOT)
+def is_strict_path(file_path, project_root):
+    rel_path = os.path.relpath(file_path, project_root)
     for d in STRICT_DIRS:
         if rel_path.startswith(d):
             return True
     return False
 
-def run_mypy(target, is_strict):
-    if not os.path.exists(os.path.join(VENV_PATH, "bin", "activate")):
-        print(f"{YELLOW}⚠️  Venv not found at {VENV_PATH}, skipping check{NC}")
-        return True
+def mypy_commands(python, targets, project_root):
+    """Commands to try in order: dmypy first in daemon mode, one batch mypy run as fallback."""
+    batch = [python, "-m", "mypy", *MYPY_FLAGS, *targets]
+    if get_mypy_mode() != 'daemon':
+        return [batch]
+    # Keep the status file in the mypy cache dir, which projects already ignore
+    status_file = os.path.join(project_root, ".mypy_cache", "dmypy.json")
+    os.makedirs(os.path.dirname(status_file), exist_ok=True)
+    daemon = [
+        python, "-m", "mypy.dmypy", "--status-file", status_file,
+        "run", "--timeout", str(DMYPY_IDLE_TIMEOUT), "--", *MYPY_FLAGS, *targets,
+    ]
+    return [daemon, batch]
+
+def get_staged_blobs(project_root):
+    """Return [(path, blob_sha)] for staged (added/copied/modified) Python files."""
+    try:
+        out = subprocess.check_output(
+            ["git", "diff", "--cached", "--raw", "--no-abbrev", "--diff-filter=ACM"],
+            cwd=project_root, stderr=subprocess.DEVNULL
+        ).decode()
+    except (subprocess.CalledProcessError, OSError):
+        return []
+    staged = []
+    for line in out.splitlines():
+        # :<old mode> <new mode> <old sha> <new sha> <status>\t<path>
+        meta, _, path = line.partition("\t")
+        fields = meta.split()
+        if path.endswith(".py") and len(fields) >= 4:
+            staged.append((path, fields[3]))
+    return staged
+
+def get_worktree_blobs(project_root, paths):
+    """Return {path: blob_sha} for the working-tree files, hashed as `git add` would store them."""
+    if not paths:
+        return {}
+    try:
+        out = subprocess.check_output(
+            ["git", "hash-object", "--", *paths], cwd=project_root, stderr=subprocess.DEVNULL
+        ).decode()
+    except (subprocess.CalledProcessError, OSError):
+        return {}
+    return dict(zip(paths, out.split()))
+
+def get_mypy_config_hash(project_root):
+    digest = hashlib.sha256(" ".join(MYPY_FLAGS).encode())
+    for name in MYPY_CONFIG_FILES:
+        try:
+            with open(os.path.join(project_root, name), "rb") as f:
+                digest.update(name.encode() + b"\0" + f.read())
+        except OSError:
+            continue
+    return digest.hexdigest()
+
+def get_result_cache_path(project_root):
+    return os.path.join(project_root, ".mypy_cache", "jaggers-type-safety.json")
+
+def load_result_cache(cache_path):
+    try:
+        with open(cache_path, "r") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except Exception:
+        return {}
+
+def save_result_cache(cache_path, cache):
+    """Evict stale/oldest entries, then write atomically."""
+    cutoff = time.time() - RESULT_CACHE_MAX_AGE
+    entries = sorted(((k, v) for k, v in cache.items() if v >= cutoff), key=lambda kv: kv[1])
+    cache = dict(entries[-RESULT_CACHE_MAX_ENTRIES:])
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write mypy result cache: {e}", file=sys.stderr)
+
+def run_mypy(targets, is_strict, project_root):
+    """Type-check all targets in a single invocation within the JAGGERS_MYPY_BUDGET time budget.
+
+    Returns (ok, passed) where passed lists the targets safe to cache: all of
+    them when mypy exited cleanly, none otherwise. A target without errors of
+    its own can still fail through a broken module it imports, so a partial
+    failure caches nothing.
+    """
+    venv_path = os.path.join(project_root, ".venv")
+    python = os.path.join(venv_path, "bin", "python")
+    if not os.path.exists(os.path.join(venv_path, "bin", "activate")):
+        print(f"{YELLOW}⚠️  Venv not found at {venv_path}, skipping check{NC}")
+        return True, []
 
-    cmd = f"source {VENV_PATH}/bin/activate && python -m mypy {target} --explicit-package-bases"
-    
+    budget = get_mypy_time_budget()
+    deadline = time.monotonic() + budget
     try:
-        result = subprocess.run(cmd, shell=True, executable="/bin/bash", capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            if is_strict:
-                print(f"{RED}❌ MYPY FAILED (STRICT MODE){NC}", file=sys.stderr)
-                print(result.stdout, file=sys.stderr)
-                print(f"\n{RED}🚫 COMMIT BLOCKED: Fix type errors in {target}{NC}", file=sys.stderr)
-                print(f"{CYAN}💡 Run: source .venv/bin/activate && python -m mypy {target}{NC}", file=sys.stderr)
-                return False
+        commands = mypy_commands(python, targets, project_root)
+        for i, cmd in enumerate(commands):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                result = subprocess.run(cmd, cwd=project_root, capture_output=True, text=True, timeout=remaining)
+            except subprocess.TimeoutExpired:
+                break
+
+            # dmypy exits 2 when the daemon itself failed; fall back to a batch run
+            if result.returncode not in (0, 1) and i + 1 < len(commands):
+                continue
+
+            if result.returncode != 0:
+                failing = sorted({
+                    line.split(":", 1)[0] for line in result.stdout.splitlines() if ": error:" in line
+                }) or targets
+                if is_strict:
+                    print(f"{RED}❌ MYPY FAILED (STRICT MODE){NC}", file=sys.stderr)
+                    print(result.stdout, file=sys.stderr)
+                    print(f"\n{RED}🚫 COMMIT BLOCKED: Fix type errors in {', '.join(failing)}{NC}", file=sys.stderr)
+                    print(f"{CYAN}💡 Run: source .venv/bin/activate && python -m mypy {' '.join(failing)}{NC}", file=sys.stderr)
+                    return False, []
+                else:
+                    print(f"{YELLOW}⚠️  MYPY WARNING (LENIENT MODE){NC}", file=sys.stderr)
+                    print("\n".join(result.stdout.splitlines()[:20]), file=sys.stderr)
+                    print(f"\n{YELLOW}⚡ Type errors exist in {', '.join(failing)} (commit allowed){NC}", file=sys.stderr)
+                    return True, []
             else:
-                print(f"{YELLOW}⚠️  MYPY WARNING (LENIENT MODE){NC}", file=sys.stderr)
-                print("\n".join(result.stdout.splitlines()[:20]), file=sys.stderr)
-                print(f"\n{YELLOW}⚡ Type errors exist in {target} (commit allowed){NC}", file=sys.stderr)
-                return True
-        else:
-            print(f"{GREEN}✅ MYPY PASSED: {target}{NC}", file=sys.stderr)
-            return True
+                print(f"{GREEN}✅ MYPY PASSED: {len(targets)} file(s){NC}", file=sys.stderr)
+                return True, list(targets)
+
+        print(f"{YELLOW}⚠️  Type check exceeded {budget:.0f}s budget, skipping (commit allowed){NC}", file=sys.stderr)
+        return True, [] # Fail open
 
     except Exception as e:
         print(f"Error running mypy: {e}", file=sys.stderr)
-        return True # Fail open
+        return True, [] # Fail open
 
-try:
-    ctx = AgentContext()
+def main():
+    try:
+        ctx = AgentContext()
+        project_root = get_project_root()
 
-    # 1. Check Git Commits (Shell tools)
-    if ctx.is_shell_tool():
-        command = ctx.get_command()
-        if 'git commit' in command:
-            print(f"{CYAN}🔍 TYPE SAFETY CHECK: Validating staged Python files...{NC}", file=sys.stderr)
+        # 1. Check Git Commits (Shell tools)
+        if ctx.is_shell_tool():
+            command = ctx.get_command()
+            if 'git commit' in command:
+                print(f"{CYAN}🔍 TYPE SAFETY CHECK: Validating staged Python files...{NC}", file=sys.stderr)
             
-            # Get staged files
-            try:
-                staged = subprocess.check_output(
-                    "git diff --cached --name-only --diff-filter=ACM | grep '\.py$'", 
-                    shell=True, cwd=PROJECT_ROOT
-                ).decode().strip().splitlines()
-            except subprocess.CalledProcessError:
-                staged = []
-
-            if not staged:
-                print(f"{GREEN}✅ No Python files staged{NC}", file=sys.stderr)
-                ctx.allow()
+                # Get staged files with their blob hashes
+                staged = get_staged_blobs(project_root)
 
-            failed = False
-            
-            # Check individual files
-            for f in staged:
-                full_path = os.path.join(PROJECT_ROOT, f)
-                if is_strict_path(full_path):
-                    if not run_mypy(full_path, True):
-                        failed = True
-
-            # If failed, block the tool
-            if failed:
-                ctx.block(reason="Type safety violations in strict directory.")
+                if not staged:
+                    print(f"{GREEN}✅ No Python files staged{NC}", file=sys.stderr)
+                    ctx.allow()
+
+                # Skip strict-zone files whose exact staged content already passed
+                config_hash = get_mypy_config_hash(project_root)
+                cache_path = get_result_cache_path(project_root)
+                cache = load_result_cache(cache_path)
+                pending = {}
+                skipped = 0
+                for f, blob in staged:
+                    full_path = os.path.join(project_root, f)
+                    if not is_strict_path(full_path, project_root):
+                        continue
+                    key = f"{blob}:{config_hash}"
+                    if key in cache:
+                        cache[key] = time.time()  # Refresh for LRU eviction
+                        skipped += 1
+                    else:
+                        pending[full_path] = (blob, key)
+
+                if skipped:
+                    print(f"{GREEN}⏭️  {skipped} unchanged file(s) already passed, skipping{NC}", file=sys.stderr)
+
+                # Check remaining strict-zone files in one mypy invocation
+                ok = True
+                if pending:
+                    ok, passed = run_mypy(list(pending), True, project_root)
+                    # mypy read the working tree: with partial staging that is not the
+                    # staged blob, so only cache files whose working copy is what gets committed
+                    worktree = get_worktree_blobs(project_root, passed)
+                    for path in passed:
+                        blob, key = pending[path]
+                        if worktree.get(path) == blob:
+                            cache[key] = time.time()
+                if pending or skipped:
+                    save_result_cache(cache_path, cache)
+
+                # If failed, block the tool
+                if not ok:
+                    ctx.block(reason="Type safety violations in strict directory.")
             
-            ctx.allow()
+                ctx.allow()
 
-    # 2. Check Edits (Write/Edit tools)
-    elif ctx.is_write_tool() or ctx.is_edit_tool():
-        file_path = ctx.get_file_path()
-        if file_path.endswith('.py') and is_strict_path(file_path):
-            ctx.allow(system_message=f"""{YELLOW}⚠️  EDITING STRICT TYPE-SAFE FILE{NC}
+        # 2. Check Edits (Write/Edit tools)
+        elif ctx.is_write_tool() or ctx.is_edit_tool():
+            file_path = ctx.get_file_path()
+            if file_path.endswith('.py') and is_strict_path(file_path, project_root):
+                ctx.allow(system_message=f"""{YELLOW}⚠️  EDITING STRICT TYPE-SAFE FILE{NC}
 This file is in a STRICT zone ({', '.join(STRICT_DIRS)}).
 Any type errors will BLOCK commits.
 """)
 
-except Exception:
-    sys.exit(0)
+    except Exception:
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
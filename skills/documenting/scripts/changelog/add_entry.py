@@ -7,13 +7,21 @@ Automatically:
 - Creates category if missing
 - Maintains category ordering per Keep a Changelog
 - Preserves existing entries
+
+Many entries can be added at once with --batch (JSON array or NDJSON, from a
+file or stdin): one parse and one atomic write for the whole batch.
 """
 
-import re
+import json
 import sys
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Tuple
+
+try:
+    from .changelog_model import Changelog, update_text_file
+except ImportError:  # Run as a script
+    from changelog_model import Changelog, update_text_file
 
 
 class ChangeCategory(Enum):
@@ -41,132 +49,79 @@ def add_entry(changelog_content: str, category: ChangeCategory, description: str
     Returns:
         Updated changelog content
     """
-    lines = changelog_content.splitlines()
-
-    # Find [Unreleased] section
-    unreleased_idx = None
-    for i, line in enumerate(lines):
-        if re.match(r"^## \[Unreleased\]", line):
-            unreleased_idx = i
-            break
-
-    if unreleased_idx is None:
-        raise ValueError("CHANGELOG missing [Unreleased] section")
-
-    # Find next version section (end of Unreleased)
-    next_version_idx = len(lines)
-    for i in range(unreleased_idx + 1, len(lines)):
-        if re.match(r"^## \[.+\]", lines[i]):
-            next_version_idx = i
-            break
-
-    # Find or create category section
-    category_name = category.value
-    category_idx = None
-
-    for i in range(unreleased_idx + 1, next_version_idx):
-        if lines[i].strip() == f"### {category_name}":
-            category_idx = i
-            break
-
-    if category_idx is None:
-        # Category doesn't exist, create it in proper order
-        category_idx = _insert_category_in_order(
-            lines,
-            unreleased_idx,
-            next_version_idx,
-            category_name
-        )
-        # Update next_version_idx as lines shifted
-        # Wait, if I insert, I need to know how many lines. 
-        # _insert_category_in_order returns the index of the new category header.
-        # But if it inserted blank lines, the indices after it shifted. 
-        # But next_version_idx is an index, so if I insert BEFORE it, it shifts.
-        # Let's check _insert_category_in_order implementation logic.
-        # It mutates 'lines' list.
-        # If it inserts 2 lines, next_version_idx should increase by 2.
-        # But wait, next_version_idx was calculated based on initial list.
-        # I should probably re-calculate or just use the return value.
-        # But wait, the function mutates the list.
-        # Let's look at the implementation below.
-        
-        # Recalculate next_version_idx to be safe? 
-        # Or rely on finding the category index.
-        pass
-
-    # Re-find next version idx just to be safe if lines shifted
-    for i in range(unreleased_idx + 1, len(lines)):
-        if re.match(r"^## \[.+\]", lines[i]):
-            next_version_idx = i
-            break
-    else:
-        next_version_idx = len(lines)
-        
-    # Re-find category index
-    for i in range(unreleased_idx + 1, next_version_idx):
-        if lines[i].strip() == f"### {category_name}":
-            category_idx = i
-            break
-
-    # Find where to insert the entry (after category header)
-    insert_idx = category_idx + 1
-
-    # Skip existing entries to add at end of category
-    while insert_idx < len(lines) and insert_idx < next_version_idx and lines[insert_idx].strip().startswith("- "):
-        insert_idx += 1
-
-    # Insert the new entry
-    entry_line = f"- {description}"
-    lines.insert(insert_idx, entry_line)
-
-    return '\n'.join(lines)
-
-
-def _insert_category_in_order(
-    lines: list,
-    unreleased_idx: int,
-    next_version_idx: int,
-    category_name: str
-) -> int:
+    changelog = Changelog(changelog_content)
+    changelog.add_entry(category.value, description)
+    return changelog.render()
+
+
+def add_entries(changelog_content: str, entries: Iterable[Tuple[ChangeCategory, str]]) -> str:
     """
-    Insert category header in proper Keep a Changelog order.
+    Add many entries to [Unreleased] in one parse.
 
-    Returns:
-        Index where category header was inserted
+    Entries keep their relative order within each category.
+    """
+    changelog = Changelog(changelog_content)
+    for category, description in entries:
+        changelog.add_entry(category.value, description)
+    return changelog.render()
+
+
+def parse_category(name: str) -> ChangeCategory:
+    """Resolve a category name case-insensitively ("added", "Added", "ADDED")."""
+    try:
+        return ChangeCategory[str(name).upper()]
+    except KeyError:
+        raise ValueError(f"Invalid category '{name}' (valid: {', '.join(CATEGORY_ORDER)})") from None
+
+
+def load_entries(text: str) -> List[Tuple[ChangeCategory, str]]:
+    """
+    Parse batch entries from JSON or NDJSON.
+
+    Accepts a JSON array, or one JSON value per line, where each entry is
+    either {"category": ..., "description": ...} or [category, description].
+    """
+    text = text.strip()
+    if not text:
+        return []
+    try:
+        items = json.loads(text)
+        if not isinstance(items, list):
+            items = [items]
+    except json.JSONDecodeError:
+        items = []
+        for lineno, line in enumerate(text.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Line {lineno}: invalid JSON: {e}") from None
+
+    entries = []
+    for i, item in enumerate(items, 1):
+        if isinstance(item, dict):
+            category, description = item.get("category"), item.get("description")
+        elif isinstance(item, list) and len(item) == 2:
+            category, description = item
+        else:
+            raise ValueError(f"Entry {i}: expected {{\"category\", \"description\"}} or [category, description]")
+        if not isinstance(description, str) or not description.strip():
+            raise ValueError(f"Entry {i}: missing description")
+        entries.append((parse_category(category), description.strip()))
+    return entries
+
+
+def add_entries_to_file(filepath: Path, entries: List[Tuple[ChangeCategory, str]]) -> None:
     """
-    category_order_idx = CATEGORY_ORDER.index(category_name)
-
-    # Find existing categories in Unreleased section
-    existing_categories = []
-    # Note: next_version_idx is based on current lines state
-    for i in range(unreleased_idx + 1, next_version_idx):
-        match = re.match(r"^### (.+)$", lines[i])
-        if match:
-            cat = match.group(1)
-            if cat in CATEGORY_ORDER:
-                existing_categories.append((i, cat))
-
-    # Find insertion point
-    insert_idx = next_version_idx
-    for idx, cat in existing_categories:
-        cat_order_idx = CATEGORY_ORDER.index(cat)
-        if category_order_idx < cat_order_idx:
-            # Insert before this category
-            insert_idx = idx
-            break
-
-    # Insert category header with blank line before if not first
-    if existing_categories:
-        lines.insert(insert_idx, "")
-        insert_idx += 1
-    else:
-        # First category, add blank line after [Unreleased]
-        lines.insert(unreleased_idx + 1, "")
-        insert_idx = unreleased_idx + 2
-
-    lines.insert(insert_idx, f"### {category_name}")
-
-    return insert_idx
+    Add all entries to CHANGELOG file with one parse and one atomic write.
+
+    Safe against concurrent writers: see changelog_model.update_text_file().
+    """
+    if not filepath.exists():
+        raise FileNotFoundError(f"CHANGELOG not found: {filepath}")
+
+    update_text_file(filepath, lambda content: add_entries(content, entries))
 
 
 def add_entry_to_file(
@@ -175,12 +130,7 @@ def add_entry_to_file(
     description: str
 ) -> None:
     """Add entry to CHANGELOG file."""
-    if not filepath.exists():
-        raise FileNotFoundError(f"CHANGELOG not found: {filepath}")
-
-    content = filepath.read_text(encoding='utf-8')
-    updated = add_entry(content, category, description)
-    filepath.write_text(updated, encoding='utf-8')
+    add_entries_to_file(filepath, [(category, description)])
 
     print(f"✅ Added to {filepath.name}:")
     print(f"   [{category.value}] {description}")
@@ -188,13 +138,31 @@ def add_entry_to_file(
 
 def main():
     """CLI entry point."""
+    if len(sys.argv) == 4 and sys.argv[2] == "--batch":
+        filepath = Path(sys.argv[1])
+        source = sys.argv[3]
+        try:
+            text = sys.stdin.read() if source == "-" else Path(source).read_text(encoding='utf-8')
+            entries = load_entries(text)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+
+        add_entries_to_file(filepath, entries)
+        print(f"✅ Added {len(entries)} entr{'y' if len(entries) == 1 else 'ies'} to {filepath.name}")
+        for category, description in entries:
+            print(f"   [{category.value}] {description}")
+        return
+
     if len(sys.argv) != 4:
         print("Usage: add_entry.py <changelog_file> <category> <description>")
+        print("       add_entry.py <changelog_file> --batch <entries.json|entries.ndjson|->")
         print("")
         print("Categories: Added, Changed, Deprecated, Removed, Fixed, Security")
         print("")
         print("Example:")
         print('  add_entry.py CHANGELOG.md Added "New semantic search feature"')
+        print("  add_entry.py CHANGELOG.md --batch entries.ndjson")
         sys.exit(1)
 
     filepath = Path(sys.argv[1])
@@ -203,8 +171,8 @@ def main():
 
     # Validate category
     try:
-        category = ChangeCategory[category_str.upper()]
-    except KeyError:
+        category = parse_category(category_str)
+    except ValueError:
         print(f"ERROR: Invalid category '{category_str}'")
         print(f"Valid: {', '.join(CATEGORY_ORDER)}")
         sys.exit(1)
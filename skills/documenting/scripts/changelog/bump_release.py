@@ -11,6 +11,11 @@ import sys
 from datetime import date
 from pathlib import Path
 
+try:
+    from .changelog_model import Changelog, update_text_file
+except ImportError:  # Run as a script
+    from changelog_model import Changelog, update_text_file
+
 
 SEMVER_PATTERN = r"^\d+\.\d+\.\d+$"
 
@@ -34,52 +39,9 @@ def bump_release(changelog_content: str, version: str, release_date: str = None)
     if release_date is None:
         release_date = date.today().strftime('%Y-%m-%d')
 
-    lines = changelog_content.splitlines()
-
-    # Find [Unreleased] section
-    unreleased_idx = None
-    for i, line in enumerate(lines):
-        if re.match(r"^## \[Unreleased\]", line):
-            unreleased_idx = i
-            break
-
-    if unreleased_idx is None:
-        raise ValueError("CHANGELOG missing [Unreleased] section")
-
-    # Replace [Unreleased] with [version] - date
-    lines[unreleased_idx] = f"## [{version}] - {release_date}"
-
-    # Insert new empty [Unreleased] section at top
-    # Find where to insert (after header, before first version)
-    header_end_idx = 0
-    # Assuming standard format: Header, then empty line, then Unreleased.
-    # We want to keep header, insert Unreleased, then the renamed old unreleased.
-    
-    # Actually, we renamed the old [Unreleased] to [version].
-    # So now we just need to insert [Unreleased] before it.
-    
-    # lines[unreleased_idx] is now the new version header.
-    # We insert before unreleased_idx.
-    # But usually there is an empty line before sections.
-    
-    # Keep a Changelog format:
-    # Header
-    #
-    # ## [Unreleased]
-    # ...
-    #
-    # ## [1.0.0] - ...
-    
-    # If unreleased_idx points to "## [Unreleased]", we changed it to "## [1.0.0] - ..."
-    # We want:
-    # ## [Unreleased]
-    #
-    # ## [1.0.0] - ...
-    
-    lines.insert(unreleased_idx, "")
-    lines.insert(unreleased_idx, "## [Unreleased]")
-
-    return '\n'.join(lines)
+    changelog = Changelog(changelog_content)
+    changelog.release(version, release_date)
+    return changelog.render()
 
 
 def bump_release_file(filepath: Path, version: str, release_date: str = None) -> None:
@@ -87,9 +49,7 @@ def bump_release_file(filepath: Path, version: str, release_date: str = None) ->
     if not filepath.exists():
         raise FileNotFoundError(f"CHANGELOG not found: {filepath}")
 
-    content = filepath.read_text(encoding='utf-8')
-    updated = bump_release(content, version, release_date)
-    filepath.write_text(updated, encoding='utf-8')
+    update_text_file(filepath, lambda content: bump_release(content, version, release_date))
 
     actual_date = release_date or date.today().strftime('%Y-%m-%d')
     print(f"✅ Released version {version} ({actual_date})")
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Parsed CHANGELOG.md model shared by the changelog scripts.
+
+Release sections (`## [X]`) and their `### Category` blocks are located by
+character offsets into the original text. Sections are scanned lazily, only
+as far as a lookup needs; [Unreleased] sits at the top, so edits never walk
+the rest of a long release history. Edits are recorded against those
+offsets and rendered in one splice, leaving every other byte of the file
+untouched.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locking, writes stay atomic
+    fcntl = None
+
+
+CATEGORY_ORDER = ["Added", "Changed", "Deprecated", "Removed", "Fixed", "Security"]
+
+SECTION_RE = re.compile(r"## \[(.+?)\](?: - (\S+))?")
+
+MAX_MERGE_RETRIES = 5
+
+
+class Category:
+    """A `### Name` block: header offset and the end of its leading `- ` entries."""
+
+    __slots__ = ("name", "start", "entries_end")
+
+    def __init__(self, name: str, start: int, entries_end: int):
+        self.name = name
+        self.start = start
+        self.entries_end = entries_end
+
+
+class Section:
+    """A `## [title]` release section spanning text[start:end]."""
+
+    def __init__(self, text: str, title: str, date: Optional[str], start: int, end: int):
+        self.title = title
+        self.date = date
+        self.start = start
+        self.end = end
+        line_end = text.find("\n", start, end)
+        self.header_end = end if line_end == -1 else line_end + 1
+        self._text = text
+        self._categories = None
+
+    def _parse_categories(self):
+        self._categories = {}
+        self.category_list: List[Category] = []
+        self.content_end = self.header_end  # End of the last non-blank line
+        current = None
+        pos = self.header_end
+        while pos < self.end:
+            nl = self._text.find("\n", pos, self.end)
+            line_end = self.end if nl == -1 else nl + 1
+            stripped = self._text[pos:line_end].strip()
+            if stripped:
+                self.content_end = line_end
+            if stripped.startswith("### "):
+                current = Category(stripped[4:], pos, line_end)
+                self._categories.setdefault(current.name, current)
+                self.category_list.append(current)
+            elif current is not None:
+                if stripped.startswith("- ") and current.entries_end == pos:
+                    current.entries_end = line_end
+            pos = line_end
+
+    @property
+    def categories(self) -> Dict[str, Category]:
+        """First occurrence of each category in this section, by name."""
+        if self._categories is None:
+            self._parse_categories()
+        return self._categories
+
+
+class Changelog:
+    """Lazily parsed changelog with splice-based edits.
+
+    Usage:
+        log = Changelog(content)
+        log.add_entry("Fixed", "Crash on empty input")
+        content = log.render()
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        first_nl = text.find("\n")
+        self.newline = "\r\n" if first_nl > 0 and text[first_nl - 1] == "\r" else "\n"
+        self._sections: List[Section] = []
+        self._by_title: Dict[str, Section] = {}
+        self._next_header = self._find_header(0)
+        self._pending: Dict[str, List[str]] = {}  # category -> new [Unreleased] entries
+        self._release = None
+
+    # ── Parsing ──────────────────────────────────────────────────────────────
+
+    def _find_header(self, pos: int) -> int:
+        """Offset of the next `## [...]` line at or after pos, or -1."""
+        text = self.text
+        while True:
+            i = text.find("## [", pos)
+            if i == -1:
+                return -1
+            if (i == 0 or text[i - 1] == "\n") and SECTION_RE.match(text, i):
+                return i
+            pos = i + 1
+
+    def _scan_next(self) -> Optional[Section]:
+        start = self._next_header
+        if start == -1:
+            return None
+        match = SECTION_RE.match(self.text, start)
+        line_end = self.text.find("\n", start)
+        self._next_header = self._find_header(len(self.text) if line_end == -1 else line_end + 1)
+        end = len(self.text) if self._next_header == -1 else self._next_header
+        section = Section(self.text, match.group(1), match.group(2), start, end)
+        self._sections.append(section)
+        self._by_title.setdefault(section.title, section)
+        return section
+
+    def section(self, title: str) -> Optional[Section]:
+        """Return the first section with this title, scanning no further than needed."""
+        while title not in self._by_title:
+            if self._scan_next() is None:
+                return None
+        return self._by_title[title]
+
+    def sections(self) -> List[Section]:
+        """All sections, in document order."""
+        while self._scan_next() is not None:
+            pass
+        return list(self._sections)
+
+    def unreleased(self) -> Section:
+        section = self.section("Unreleased")
+        if section is None:
+            raise ValueError("CHANGELOG missing [Unreleased] section")
+        return section
+
+    # ── Edits ────────────────────────────────────────────────────────────────
+
+    def add_entry(self, category: str, description: str) -> None:
+        """Queue `- description` at the end of category under [Unreleased]."""
+        if self._release is not None:
+            raise ValueError("Cannot add entries after release() on the same Changelog")
+        self.unreleased()
+        self._pending.setdefault(category, []).append(description)
+
+    def release(self, version: str, release_date: str) -> None:
+        """Turn [Unreleased] into [version] - date and open a new empty [Unreleased]."""
+        self.unreleased()
+        self._release = (version, release_date)
+
+    def _edits(self) -> list:
+        """(start, end, rank, replacement) splices against the original text."""
+        nl = self.newline
+        edits = []
+        if self._pending:
+            section = self.unreleased()
+            existing = section.categories
+            for name, descriptions in self._pending.items():
+                rank = CATEGORY_ORDER.index(name) if name in CATEGORY_ORDER else len(CATEGORY_ORDER)
+                entries = "".join(f"- {d}{nl}" for d in descriptions)
+                if name in existing:
+                    offset = existing[name].entries_end
+                    edits.append((offset, offset, rank, entries))
+                    continue
+                # New category: before the first later category per Keep a Changelog order,
+                # otherwise after the last non-blank line of the section
+                higher = next(
+                    (c for c in section.category_list
+                     if c.name in CATEGORY_ORDER and CATEGORY_ORDER.index(c.name) > rank),
+                    None,
+                )
+                if higher is not None:
+                    edits.append((higher.start, higher.start, rank, f"### {name}{nl}{entries}{nl}"))
+                else:
+                    offset = section.content_end
+                    edits.append((offset, offset, rank, f"{nl}### {name}{nl}{entries}"))
+        if self._release is not None:
+            section = self.unreleased()
+            version, release_date = self._release
+            header = self.text[section.start:section.header_end].rstrip("\r\n")
+            edits.append((section.start, section.start + len(header), -1,
+                          f"## [Unreleased]{nl}{nl}## [{version}] - {release_date}"))
+        return sorted(edits, key=lambda e: (e[0], e[2]))
+
+    def render(self) -> str:
+        """Return the text with all queued edits spliced in."""
+        edits = self._edits()
+        if not edits:
+            return self.text
+        out = []
+        pos = 0
+        for start, end, _rank, replacement in edits:
+            if start > pos or not out:
+                out.append(self.text[pos:start])
+                # Inserting after a final line that has no newline of its own
+                if start == end and start > 0 and self.text[start - 1] != "\n":
+                    replacement = self.newline + replacement
+            out.append(replacement)
+            pos = max(pos, end)
+        out.append(self.text[pos:])
+        return "".join(out)
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Replace path with text via a temp file and rename, keeping its mode."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _git_dir(directory: Path) -> Optional[Path]:
+    """The .git directory of the repository containing directory (worktrees included)."""
+    for parent in [directory, *directory.parents]:
+        dot_git = parent / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            # Worktree or submodule: ".git" is a "gitdir: <path>" pointer
+            text = dot_git.read_text(encoding="utf-8").strip()
+            if text.startswith("gitdir:"):
+                return (parent / text[len("gitdir:"):].strip()).resolve()
+            return None
+    return None
+
+
+def lock_path(path: Path) -> Path:
+    """Lock file for path: inside .git/ when in a repository, else a .<name>.lock sidecar.
+
+    Keeping it under .git/ means it never shows up as an untracked file.
+    """
+    path = Path(path).resolve()
+    git_dir = _git_dir(path.parent)
+    if git_dir is None:
+        return path.with_name(f".{path.name}.lock")
+    key = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:16]
+    return git_dir / "jaggers-locks" / f"{path.name}.{key}.lock"
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Hold an exclusive advisory lock for path (on the separate file from lock_path()).
+
+    The lock lives on a separate file because write_text_atomic() replaces
+    the changelog's inode on every write.
+    """
+    if fcntl is None:
+        yield
+        return
+    lock_file_path = lock_path(path)
+    lock_file_path.parent.mkdir(exist_ok=True)
+    with open(lock_file_path, "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def file_signature(path: Path) -> tuple:
+    """(inode, mtime_ns, size): changes whenever the file is rewritten or replaced."""
+    st = os.stat(path)
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def update_text_file(
+    path: Path,
+    transform: Callable[[str], str],
+    content: Optional[str] = None,
+    signature: Optional[tuple] = None,
+) -> str:
+    """
+    Read-modify-write path under file_lock(), replacing it atomically.
+
+    Writers that go through this function are serialised by the lock. If the
+    file still changes between read and write (an editor or another tool that
+    ignores the lock), transform is re-applied to the new content instead of
+    overwriting it, up to MAX_MERGE_RETRIES times.
+
+    Callers that already hold the file's text may pass it with the
+    file_signature() taken when it was read; it is used instead of re-reading
+    as long as the file has not changed since.
+
+    Returns the text that was written (or the unchanged content).
+    """
+    path = Path(path)
+    with file_lock(path):
+        for _ in range(MAX_MERGE_RETRIES):
+            before = file_signature(path)
+            if content is None or before != signature:
+                content = path.read_text(encoding="utf-8")
+            updated = transform(content)
+            if updated == content:
+                return content
+            if file_signature(path) != before:
+                content = None
+                continue
+            write_text_atomic(path, updated)
+            return updated
+    raise RuntimeError(f"{path} kept changing during update; gave up after {MAX_MERGE_RETRIES} attempts")
@@ -11,6 +11,7 @@ Checks:
 """
 
 import re
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -20,58 +21,126 @@ SEMVER_PATTERN = r"^\d+\.\d+\.\d+$"
 DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
 
 
-def validate_changelog(content: str) -> Dict[str, any]:
-    """
-    Validate CHANGELOG content.
+SECTION_CACHE_SIZE = 65536
 
-    Returns:
-        {
-            "valid": bool,
-            "errors": List[str],
-            "warnings": List[str]
-        }
-    """
-    errors = []
-    warnings = []
+# Per-section results keyed by section text, and whole-file results keyed by stat
+_section_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_file_cache: Dict[str, tuple] = {}
 
-    # Check header
-    if "Keep a Changelog" not in content:
-        errors.append("Missing 'Keep a Changelog' link in header")
 
-    if "Semantic Versioning" not in content:
-        warnings.append("Missing 'Semantic Versioning' link in header")
+def _split_sections(content: str) -> List[str]:
+    """Split content at every line starting with "## " (chunks keep their newlines)."""
+    chunks = []
+    start = 0
+    pos = content.find("\n## ")
+    while pos != -1:
+        chunks.append(content[start:pos + 1])
+        start = pos + 1
+        pos = content.find("\n## ", start)
+    chunks.append(content[start:])
+    return chunks
 
-    # Check for [Unreleased] section
-    if not re.search(r"^## \[Unreleased\]", content, re.MULTILINE):
-        errors.append("Missing required [Unreleased] section")
+
+def _validate_section(chunk: str) -> tuple:
+    """
+    Validate one chunk.
+
+    Every check is line-local, so results for a chunk do not depend on the rest
+    of the document. Returns (has_keep_link, has_semver_link, has_unreleased,
+    version_errors, version_warnings, category_errors).
+    """
+    version_errors = []
+    version_warnings = []
+    category_errors = []
 
     # Find all version sections
     version_pattern = r"^## \[(.+?)\](?: - (\d{4}-\d{2}-\d{2}))?$"
-    versions = re.findall(version_pattern, content, re.MULTILINE)
+    versions = re.findall(version_pattern, chunk, re.MULTILINE)
 
     for version, date in versions:
         if version == "Unreleased":
             if date:
-                warnings.append("[Unreleased] section should not have a date")
+                version_warnings.append("[Unreleased] section should not have a date")
             continue
 
         # Validate semver
         if not re.match(SEMVER_PATTERN, version):
-            errors.append(f"Invalid semantic version: [{version}] (expected X.Y.Z)")
+            version_errors.append(f"Invalid semantic version: [{version}] (expected X.Y.Z)")
 
         # Validate date
         if not date:
-            errors.append(f"Version [{version}] missing release date")
+            version_errors.append(f"Version [{version}] missing release date")
         elif not re.match(DATE_PATTERN, date):
-            errors.append(f"Invalid date format for [{version}]: {date} (expected YYYY-MM-DD)")
+            version_errors.append(f"Invalid date format for [{version}]: {date} (expected YYYY-MM-DD)")
 
     # Find all categories
     category_pattern = r"^### (.+?)$"
-    categories = re.findall(category_pattern, content, re.MULTILINE)
+    categories = re.findall(category_pattern, chunk, re.MULTILINE)
 
     for category in categories:
         if category not in VALID_CATEGORIES:
-            errors.append(f"Invalid category: '{category}' (must be one of {VALID_CATEGORIES})")
+            category_errors.append(f"Invalid category: '{category}' (must be one of {VALID_CATEGORIES})")
+
+    return (
+        "Keep a Changelog" in chunk,
+        "Semantic Versioning" in chunk,
+        re.search(r"^## \[Unreleased\]", chunk, re.MULTILINE) is not None,
+        version_errors,
+        version_warnings,
+        category_errors,
+    )
+
+
+def _cached_section(chunk: str) -> tuple:
+    # Keyed by the chunk text itself: str hashing is fast and equality makes hits exact
+    result = _section_cache.get(chunk)
+    if result is None:
+        result = _validate_section(chunk)
+        _section_cache[chunk] = result
+        if len(_section_cache) > SECTION_CACHE_SIZE:
+            _section_cache.popitem(last=False)
+    else:
+        _section_cache.move_to_end(chunk)
+    return result
+
+
+def validate_changelog(content: str) -> Dict[str, any]:
+    """
+    Validate CHANGELOG content.
+
+    The document is split into "## " sections and each section's result is
+    cached by its text, so re-validating an edited changelog only
+    re-checks the sections that changed.
+
+    Returns:
+        {
+            "valid": bool,
+            "errors": List[str],
+            "warnings": List[str]
+        }
+    """
+    errors = []
+    warnings = []
+
+    sections = [_cached_section(chunk) for chunk in _split_sections(content)]
+
+    # Check header
+    if not any(s[0] for s in sections):
+        errors.append("Missing 'Keep a Changelog' link in header")
+
+    if not any(s[1] for s in sections):
+        warnings.append("Missing 'Semantic Versioning' link in header")
+
+    # Check for [Unreleased] section
+    if not any(s[2] for s in sections):
+        errors.append("Missing required [Unreleased] section")
+
+    # Version problems first, then category problems, each in document order
+    for s in sections:
+        errors.extend(s[3])
+        warnings.extend(s[4])
+    for s in sections:
+        errors.extend(s[5])
 
     return {
         "valid": len(errors) == 0,
@@ -81,7 +150,7 @@ def validate_changelog(content: str) -> Dict[str, any]:
 
 
 def validate_file(filepath: Path) -> Dict[str, any]:
-    """Validate a CHANGELOG.md file."""
+    """Validate a CHANGELOG.md file (unchanged files are answered from memory)."""
     if not filepath.exists():
         return {
             "valid": False,
@@ -89,8 +158,16 @@ def validate_file(filepath: Path) -> Dict[str, any]:
             "warnings": []
         }
 
-    content = filepath.read_text(encoding='utf-8')
-    return validate_changelog(content)
+    st = filepath.stat()
+    key = str(filepath.resolve())
+    cached = _file_cache.get(key)
+    if cached and cached[0] == (st.st_mtime_ns, st.st_size):
+        result = cached[1]
+    else:
+        content = filepath.read_text(encoding='utf-8')
+        result = validate_changelog(content)
+        _file_cache[key] = ((st.st_mtime_ns, st.st_size), result)
+    return {"valid": result["valid"], "errors": list(result["errors"]), "warnings": list(result["warnings"])}
 
 
 def main():
@@ -4,18 +4,22 @@ Detect documentation drift between Serena memories and git-modified files.
 
 Subcommands:
   scan [--since N]   — scan all memories, report stale ones (default N=30 commits)
-  check <memory>     — check a single memory by name
+  check <memory|glob>... [--since N] [--json|--ndjson] [--jobs N]
+                     — check memories by name or glob in one run
   hook               — Stop hook mode: check session writes, output JSON if stale
 """
 
+import os
 import sys
 import re
 import json
-import fnmatch
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatchcase, translate
+from functools import lru_cache
 from pathlib import Path
 
-import yaml
+from frontmatter_loader import load_frontmatter, parse_frontmatter
 
 
 # ── Path resolution ───────────────────────────────────────────────────────────
@@ -37,91 +41,373 @@ def get_memories_dir(project_root: Path) -> Path:
 # ── Frontmatter parsing ───────────────────────────────────────────────────────
 
 def extract_frontmatter(content: str) -> dict:
-    match = re.match(r"^---\n(.*?)\n---\n", content, re.DOTALL)
-    if not match:
-        return {}
-    try:
-        return yaml.safe_load(match.group(1)) or {}
-    except yaml.YAMLError:
-        return {}
+    data, _error = parse_frontmatter(content)
+    return data if isinstance(data, dict) else {}
 
 
-def extract_tracks(content: str) -> list:
-    """Return tracks: glob list from memory frontmatter."""
-    fm = extract_frontmatter(content)
+def tracks_from(fm: dict) -> list:
     tracks = fm.get("tracks", [])
     return tracks if isinstance(tracks, list) else []
 
 
+def extract_tracks(content: str) -> list:
+    """Return tracks: glob list from memory frontmatter."""
+    return tracks_from(extract_frontmatter(content))
+
+
 def extract_updated(content: str) -> str:
-    fm = extract_frontmatter(content)
-    return str(fm.get("updated", ""))
+    return str(extract_frontmatter(content).get("updated", ""))
 
 
 # ── File matching ─────────────────────────────────────────────────────────────
 
+def _translate_class(glob_class: str) -> str:
+    """Translate one "[...]" class exactly as fnmatch reads it, never matching '/'.
+
+    fnmatch already handles "!" negation, a leading "]", and reversed ranges
+    such as "[z-a]" that are invalid in a regex, so its output is reused.
+    """
+    source = re.fullmatch(r"\(\?s:(.*)\)\\[Zz]", translate(glob_class), re.DOTALL).group(1)
+    return "(?!/)" + source
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate one fnmatch path segment to a regex that never crosses '/'."""
+    out = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i
+            if j < n and segment[j] == "!":
+                j += 1
+            if j < n and segment[j] == "]":
+                j += 1
+            j = segment.find("]", j)
+            if j == -1:
+                out.append(re.escape(c))
+                continue
+            out.append(_translate_class(segment[i - 1:j + 1]))
+            i = j + 1
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+@lru_cache(maxsize=65536)
+def _posix(path: str) -> str:
+    return Path(path).as_posix()
+
+
+@lru_cache(maxsize=None)
+def _glob_to_regex(pattern: str) -> str:
+    """Regex source matching `path + "/"` for a glob with ** segment support.
+
+    Every segment is followed by "/", so ** becomes zero or more whole
+    segments and the result is equivalent to matching segment by segment.
+    """
+    parts = []
+    for segment in _posix(pattern).split("/"):
+        if segment == "**":
+            parts.append("(?:[^/]*/)*")
+        else:
+            parts.append(_translate_segment(segment) + "/")
+    return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def _compile_tracks(tracks: tuple):
+    """Compile a tracks list into one alternation, cached per distinct list."""
+    return re.compile("|".join(f"(?:{_glob_to_regex(p)})" for p in tracks), re.DOTALL)
+
+
+@lru_cache(maxsize=65536)
 def _match_glob(path: str, pattern: str) -> bool:
     """Match a file path against a glob pattern with proper ** support."""
-    path_parts = Path(path).as_posix().split("/")
-    pattern_parts = Path(pattern).as_posix().split("/")
-
-    def _match(pp, pat):
-        if not pat:
-            return not pp
-        if pat[0] == "**":
-            # ** matches zero or more segments
-            for i in range(len(pp) + 1):
-                if _match(pp[i:], pat[1:]):
-                    return True
-            return False
-        if not pp:
-            return False
-        return fnmatch.fnmatch(pp[0], pat[0]) and _match(pp[1:], pat[1:])
-
-    return _match(path_parts, pattern_parts)
+    return _compile_tracks((pattern,)).fullmatch(_posix(path) + "/") is not None
 
 
 def match_files_to_tracks(files: list, tracks: list) -> list:
     """Return files that match any of the tracks globs (supports **)."""
-    matched = []
+    if not tracks:
+        return []
+    matcher = _compile_tracks(tuple(tracks))
+    return [f for f in files if matcher.fullmatch(_posix(f) + "/")]
+
+
+# ── Tracks index ──────────────────────────────────────────────────────────────
+
+DRIFT_INDEX_VERSION = 1
+PARALLEL_PARSE_MIN = 64  # Below this many changed memories a pool costs more than it saves
+_GLOB_CHARS = set("*?[")
+
+
+def get_drift_index_path(project_root: Path) -> Path:
+    # .serena/cache/ is already git-ignored by Serena
+    return project_root / ".serena" / "cache" / "drift_index.json"
+
+
+def _index_key(pattern: str) -> tuple:
+    """Bucket a track glob by its cheapest literal lookup key.
+
+    ("prefix", "cli/src/")   leading literal segments (or the full literal path)
+    ("ext", ".py")           no literal prefix, but a *.ext final segment
+    ("any", "")              neither; always a candidate
+    """
+    segments = _posix(pattern).split("/")
+    literal = []
+    for segment in segments:
+        if _GLOB_CHARS & set(segment):
+            break
+        literal.append(segment)
+    if len(literal) == len(segments):
+        return ("prefix", "/".join(literal))
+    if literal:
+        return ("prefix", "/".join(literal) + "/")
+    last = segments[-1]
+    if last.startswith("*.") and not _GLOB_CHARS & set(last[2:]):
+        return ("ext", last[1:])
+    return ("any", "")
+
+
+def _build_buckets(memories: dict) -> dict:
+    buckets = {"prefix": {}, "ext": {}, "any": []}
+    for name in sorted(memories):
+        keys = {_index_key(p) for p in memories[name]["tracks"]}
+        for kind, key in sorted(keys):
+            if kind == "any":
+                buckets["any"].append(name)
+            else:
+                buckets[kind].setdefault(key, []).append(name)
+    return buckets
+
+
+def _parse_memory(path: str) -> tuple:
+    """Return (tracks, updated) for one memory file; runs in pool workers."""
+    data, _error = load_frontmatter(Path(path))
+    fm = data if isinstance(data, dict) else {}
+    return [str(t) for t in tracks_from(fm)], str(fm.get("updated", ""))
+
+
+def load_drift_index(project_root: Path, jobs: int = None) -> dict:
+    """Load the persisted tracks index, re-parsing only memories whose mtime/size changed.
+
+    When many memories need re-parsing they are parsed in a process pool of
+    `jobs` workers (default: one per CPU).
+
+    Returns {"memories": {stem: {mtime_ns, size, tracks, updated}}, "buckets": {...}}.
+    """
+    memories_dir = get_memories_dir(project_root)
+    index_path = get_drift_index_path(project_root)
+
+    cached = {}
+    try:
+        data = json.loads(index_path.read_text(encoding="utf-8"))
+        if data.get("version") == DRIFT_INDEX_VERSION:
+            cached = data.get("memories", {})
+    except (OSError, ValueError):
+        pass
+
+    memories = {}
+    stale_files = []
+    for md_file in memories_dir.glob("*.md"):
+        st = md_file.stat()
+        entry = cached.get(md_file.stem)
+        if not entry or entry["mtime_ns"] != st.st_mtime_ns or entry["size"] != st.st_size:
+            stale_files.append((md_file, st))
+        else:
+            memories[md_file.stem] = entry
+
+    if stale_files:
+        paths = [str(md_file) for md_file, _ in stale_files]
+        if len(paths) >= PARALLEL_PARSE_MIN and (jobs or os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                parsed = list(pool.map(_parse_memory, paths, chunksize=16))
+        else:
+            parsed = [_parse_memory(path) for path in paths]
+        for (md_file, st), (tracks, updated) in zip(stale_files, parsed):
+            memories[md_file.stem] = {
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "tracks": tracks,
+                "updated": updated,
+            }
+    changed = bool(stale_files) or memories.keys() != cached.keys()
+
+    index = {"version": DRIFT_INDEX_VERSION, "memories": memories, "buckets": _build_buckets(memories)}
+    if changed:
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(index, indent=1, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            print(f"Warning: could not write drift index: {e}", file=sys.stderr)
+    return index
+
+
+def candidate_memories(index: dict, files: list) -> dict:
+    """Return {memory: [files]} pairing each file with memories whose tracks could match it."""
+    buckets = index["buckets"]
+    candidates = {}
     for f in files:
-        for pattern in tracks:
-            if _match_glob(f, pattern):
-                matched.append(f)
-                break
-    return matched
+        path = _posix(f)
+        names = set(buckets["any"])
+        names.update(buckets["prefix"].get(path, ()))
+        names.update(buckets["prefix"].get(path + "/", ()))  # "dir/**" also matches "dir"
+        for i, ch in enumerate(path):
+            if ch == "/":
+                names.update(buckets["prefix"].get(path[:i + 1], ()))
+        # Every dotted suffix of the basename: "*.test.ts" is filed under ".test.ts"
+        dot = path.find(".", path.rfind("/") + 1)
+        while dot != -1:
+            names.update(buckets["ext"].get(path[dot:], ()))
+            dot = path.find(".", dot + 1)
+        for name in names:
+            candidates.setdefault(name, []).append(f)
+    return candidates
 
 
 # ── Git helpers ───────────────────────────────────────────────────────────────
 
+def _find_git_dir(project_root: Path):
+    """Return (git_dir, common_dir) for the repo containing project_root, or None."""
+    for parent in [project_root, *project_root.parents]:
+        dot_git = parent / ".git"
+        if dot_git.is_dir():
+            return dot_git, dot_git
+        if dot_git.is_file():
+            # Worktree or submodule: ".git" is a "gitdir: <path>" pointer
+            text = dot_git.read_text(encoding="utf-8").strip()
+            if not text.startswith("gitdir:"):
+                return None
+            git_dir = (parent / text[len("gitdir:"):].strip()).resolve()
+            common = git_dir / "commondir"
+            if common.exists():
+                return git_dir, (git_dir / common.read_text(encoding="utf-8").strip()).resolve()
+            return git_dir, git_dir
+    return None
+
+
+def get_head_sha(project_root: Path) -> str:
+    """Resolve HEAD by reading .git directly; falls back to git rev-parse."""
+    try:
+        git_dirs = _find_git_dir(project_root)
+        if git_dirs:
+            git_dir, common_dir = git_dirs
+            head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+            if not head.startswith("ref:"):
+                return head
+            ref = head[len("ref:"):].strip()
+            ref_file = common_dir / ref
+            if ref_file.exists():
+                return ref_file.read_text(encoding="utf-8").strip()
+            packed = common_dir / "packed-refs"
+            if packed.exists():
+                for line in packed.read_text(encoding="utf-8").splitlines():
+                    sha, _, name = line.partition(" ")
+                    if name == ref:
+                        return sha
+    except OSError:
+        pass
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=project_root, capture_output=True, text=True
+        )
+        return result.stdout.strip()
+    except Exception:
+        return ""
+
+
+def get_git_cache_path(project_root: Path) -> Path:
+    return project_root / ".serena" / "cache" / "drift_git.json"
+
+
+_recent_files_memo = {}
+
+
 def get_recent_modified_files(project_root: Path, since_n_commits: int = 30) -> list:
-    """Get files modified in the last N commits."""
+    """Get files modified in the last N commits.
+
+    The result only depends on HEAD, so it is cached on disk per HEAD commit
+    (and in memory per process); an unchanged HEAD costs no git call at all.
+    """
+    head = get_head_sha(project_root)
+    memo_key = (str(project_root), head, since_n_commits)
+    if head and memo_key in _recent_files_memo:
+        return list(_recent_files_memo[memo_key])
+
+    cache_path = get_git_cache_path(project_root)
+    cache = {}
+    if head:
+        try:
+            cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cache = {}
+        if cache.get("head") != head:
+            cache = {"head": head, "log": {}}
+        files = cache["log"].get(str(since_n_commits))
+        if files is not None:
+            _recent_files_memo[memo_key] = files
+            return list(files)
+
     try:
         result = subprocess.run(
             ["git", "log", f"-{since_n_commits}", "--name-only", "--format="],
             cwd=project_root, capture_output=True, text=True
         )
-        return [l.strip() for l in result.stdout.splitlines() if l.strip()]
+        if result.returncode != 0:
+            return []
+        files = [l.strip() for l in result.stdout.splitlines() if l.strip()]
     except Exception:
         return []
 
+    if head:
+        _recent_files_memo[memo_key] = files
+        cache["log"][str(since_n_commits)] = files
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(cache), encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    return list(files)
+
 
 def get_session_written_files(project_root: Path) -> list:
-    """Get files with uncommitted or staged changes."""
+    """Get files with uncommitted or staged changes (untracked files excluded).
+
+    One `git status --porcelain=v2 -z` call covers both the working tree
+    and the index.
+    """
     try:
-        r1 = subprocess.run(
-            ["git", "diff", "HEAD", "--name-only"],
-            cwd=project_root, capture_output=True, text=True
-        )
-        r2 = subprocess.run(
-            ["git", "diff", "--cached", "--name-only"],
+        result = subprocess.run(
+            ["git", "status", "--porcelain=v2", "-z", "--untracked-files=no"],
             cwd=project_root, capture_output=True, text=True
         )
-        files = r1.stdout.splitlines() + r2.stdout.splitlines()
-        return list({f.strip() for f in files if f.strip()})
     except Exception:
         return []
 
+    files = set()
+    records = iter(result.stdout.split("\0"))
+    for record in records:
+        kind = record[:1]
+        if kind == "1":
+            files.add(record.split(" ", 8)[8])
+        elif kind == "2":
+            files.add(record.split(" ", 9)[9])
+            next(records, None)  # Rename/copy source path
+        elif kind == "u":
+            files.add(record.split(" ", 10)[10])
+    return list(files)
+
 
 # ── Core logic ────────────────────────────────────────────────────────────────
 
@@ -132,18 +418,17 @@ def scan_memories(project_root: Path, since_n_commits: int = 30) -> dict:
         return {}
 
     modified_files = get_recent_modified_files(project_root, since_n_commits)
+    index = load_drift_index(project_root)
     stale = {}
 
-    for md_file in sorted(memories_dir.glob("*.md")):
-        content = md_file.read_text(encoding="utf-8")
-        tracks = extract_tracks(content)
-        if not tracks:
-            continue
-        matched = match_files_to_tracks(modified_files, tracks)
+    candidates = candidate_memories(index, modified_files)
+    for name in sorted(candidates):
+        entry = index["memories"][name]
+        matched = match_files_to_tracks(candidates[name], entry["tracks"])
         if matched:
-            stale[md_file.stem] = {
+            stale[name] = {
                 "files": matched[:5],
-                "updated": extract_updated(content),
+                "updated": entry["updated"],
             }
 
     return stale
@@ -180,33 +465,95 @@ def cmd_scan(args: list):
     sys.exit(1 if stale else 0)
 
 
-def cmd_check(args: list):
-    if not args:
-        print("Usage: drift_detector.py check <memory-name>")
-        sys.exit(1)
+def check_memories(project_root: Path, patterns: list, since_n_commits: int = 30, jobs: int = None) -> list:
+    """Check every memory named (or glob-matched) by patterns against one modified-file set.
+
+    Returns one result dict per memory, in pattern order:
+    {"memory", "status": "stale" | "ok" | "no_tracks" | "missing", "matched", "updated"}.
+    """
+    index = load_drift_index(project_root, jobs) if get_memories_dir(project_root).exists() else {"memories": {}}
+    names = []
+    for pattern in patterns:
+        if set(pattern) & _GLOB_CHARS:
+            hits = sorted(n for n in index["memories"] if fnmatchcase(n, pattern))
+        else:
+            hits = [pattern]
+        names.extend(n for n in hits if n not in names)
+
+    modified = None
+    results = []
+    for name in names:
+        entry = index["memories"].get(name)
+        result = {"memory": name, "status": "ok", "matched": [], "updated": None}
+        if entry is None:
+            result["status"] = "missing"
+        elif not entry["tracks"]:
+            result["status"] = "no_tracks"
+            result["updated"] = entry["updated"]
+        else:
+            if modified is None:
+                modified = get_recent_modified_files(project_root, since_n_commits)
+            result["updated"] = entry["updated"]
+            result["matched"] = match_files_to_tracks(modified, entry["tracks"])
+            if result["matched"]:
+                result["status"] = "stale"
+        results.append(result)
+    return results
+
+
+def format_check_result(result: dict) -> str:
+    name = result["memory"]
+    if result["status"] == "missing":
+        return f"Memory not found: {name}"
+    if result["status"] == "no_tracks":
+        return f"{name}: no tracks: field — skipping drift check."
+    if result["status"] == "stale":
+        return f"{name}: STALE — matched: {', '.join(result['matched'][:3])}"
+    return f"{name}: up to date."
 
-    memory_name = args[0]
-    project_root = find_project_root()
-    md_file = get_memories_dir(project_root) / f"{memory_name}.md"
 
-    if not md_file.exists():
-        print(f"Memory not found: {memory_name}")
+def cmd_check(args: list):
+    usage = "Usage: drift_detector.py check <memory|glob>... [--since N] [--json|--ndjson] [--jobs N]"
+    since, jobs, fmt = 30, None, "text"
+    patterns = []
+    it = iter(args)
+    for arg in it:
+        if arg in ("--since", "--jobs"):
+            value = next(it, None)
+            if value is None or not value.isdigit():
+                print(usage)
+                sys.exit(1)
+            if arg == "--since":
+                since = int(value)
+            else:
+                jobs = int(value) or None
+        elif arg in ("--json", "--ndjson"):
+            fmt = arg[2:]
+        else:
+            patterns.append(arg)
+    if not patterns:
+        print(usage)
         sys.exit(1)
 
-    content = md_file.read_text(encoding="utf-8")
-    tracks = extract_tracks(content)
-    if not tracks:
-        print(f"{memory_name}: no tracks: field — skipping drift check.")
-        sys.exit(0)
-
-    modified = get_recent_modified_files(project_root, 30)
-    matched = match_files_to_tracks(modified, tracks)
-    if matched:
-        print(f"{memory_name}: STALE — matched: {', '.join(matched[:3])}")
-        sys.exit(1)
+    project_root = find_project_root()
+    results = check_memories(project_root, patterns, since, jobs)
+
+    if fmt == "json":
+        counts = {}
+        for r in results:
+            counts[r["status"]] = counts.get(r["status"], 0) + 1
+        print(json.dumps({"since": since, "counts": counts, "results": results}, indent=2))
+    elif fmt == "ndjson":
+        for r in results:
+            print(json.dumps(r))
     else:
-        print(f"{memory_name}: up to date.")
-        sys.exit(0)
+        for r in results:
+            print(format_check_result(r))
+        if not results:
+            print(f"No memories match: {' '.join(patterns)}")
+
+    failed = not results or any(r["status"] in ("stale", "missing") for r in results)
+    sys.exit(1 if failed else 0)
 
 
 def cmd_hook(_args: list):
@@ -220,14 +567,12 @@ def cmd_hook(_args: list):
     if not memories_dir.exists():
         sys.exit(0)
 
-    stale_names = []
-    for md_file in sorted(memories_dir.glob("*.md")):
-        content = md_file.read_text(encoding="utf-8")
-        tracks = extract_tracks(content)
-        if not tracks:
-            continue
-        if match_files_to_tracks(session_files, tracks):
-            stale_names.append(md_file.stem)
+    index = load_drift_index(project_root)
+    candidates = candidate_memories(index, session_files)
+    stale_names = [
+        name for name in sorted(candidates)
+        if match_files_to_tracks(candidates[name], index["memories"][name]["tracks"])
+    ]
 
     if stale_names:
         names = ", ".join(stale_names[:3])
@@ -256,7 +601,8 @@ def main():
     if not args or args[0] not in SUBCOMMANDS:
         print("Usage: drift_detector.py <scan|check|hook> [options]")
         print("  scan [--since N]   scan all memories (default N=30 commits)")
-        print("  check <memory>     check a single memory")
+        print("  check <memory|glob>... [--since N] [--json|--ndjson] [--jobs N]")
+        print("                     check memories by name or glob")
         print("  hook               Stop hook mode (outputs JSON if stale)")
         sys.exit(1)
     SUBCOMMANDS[args[0]](args[1:])
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Shared YAML frontmatter loader for Serena memory files.
+
+Parsed frontmatter is cached in .serena/cache/frontmatter.json, keyed by
+mtime/size with a hash of the frontmatter text as fallback, so a memory is
+YAML-parsed once until its frontmatter actually changes — across scripts and
+across runs. Uses libyaml's CSafeLoader when PyYAML was built with it.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import yaml
+
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+CACHE_VERSION = 1
+FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---\n", re.DOTALL)
+
+
+def split_frontmatter(content: str) -> Optional[str]:
+    """Return the raw YAML between the leading --- markers, or None."""
+    match = FRONTMATTER_RE.match(content)
+    return match.group(1) if match else None
+
+
+def parse_frontmatter(content: str) -> Tuple[Optional[object], Optional[str]]:
+    """Parse frontmatter without caching.
+
+    Returns (data, error): data is None when there is no frontmatter block or
+    the YAML is invalid, in which case error holds the parser message.
+    """
+    raw = split_frontmatter(content)
+    if raw is None:
+        return None, None
+    try:
+        return yaml.load(raw, Loader=SafeLoader), None
+    except yaml.YAMLError as e:
+        return None, str(e)
+
+
+def read_frontmatter_block(path: Path) -> str:
+    """Read only the leading lines of path that split_frontmatter() can match.
+
+    Stops at the closing --- line (or after the first line when the file does
+    not open with ---), so large memory bodies are never loaded.
+    """
+    lines = []
+    with open(path, encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            lines.append(line)
+            if (i == 0 and line != "---\n") or (i >= 2 and line == "---\n"):
+                break
+    return "".join(lines)
+
+
+# ── JSON encoding of safe-loaded YAML values ──────────────────────────────────
+
+def _encode(value):
+    """Make a safe-loaded value JSON-serialisable; TypeError if it cannot round-trip."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        if not all(isinstance(k, str) and not k.startswith("$") for k in value):
+            raise TypeError("frontmatter mapping key cannot be cached")
+        return {k: _encode(v) for k, v in value.items()}
+    raise TypeError(f"{type(value).__name__} cannot be cached")
+
+
+def _decode(value):
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if isinstance(value, dict):
+        if len(value) == 1:
+            if "$datetime" in value:
+                return datetime.fromisoformat(value["$datetime"])
+            if "$date" in value:
+                return date.fromisoformat(value["$date"])
+        return {k: _decode(v) for k, v in value.items()}
+    return value
+
+
+# ── Cache ─────────────────────────────────────────────────────────────────────
+
+def get_cache_path(md_path: Path) -> Optional[Path]:
+    """Cache file for a memory: the nearest enclosing .serena/cache/, or None."""
+    for parent in Path(md_path).resolve().parents:
+        if parent.name == ".serena":
+            return parent / "cache" / "frontmatter.json"
+    return None
+
+
+class FrontmatterCache:
+    """Frontmatter results for the memories of one project, keyed by resolved path."""
+
+    def __init__(self, cache_path: Optional[Path]):
+        self.cache_path = cache_path
+        self.entries: Dict[str, dict] = {}
+        self.dirty = False
+        if cache_path is None:
+            return
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data.get("entries", {})
+        except (OSError, ValueError):
+            pass
+
+    def load(self, path: Path, content: Optional[str] = None) -> Tuple[Optional[object], Optional[str]]:
+        """Return (data, error) for path; content may be passed if already read."""
+        path = Path(path)
+        key = str(path.resolve())
+        st = path.stat()
+        entry = self.entries.get(key)
+        if content is None and entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return _decode(entry["data"]), entry["error"]
+
+        if content is None:
+            content = read_frontmatter_block(path)
+        # Hash only the frontmatter, so body edits (e.g. INDEX regeneration) keep the entry valid
+        raw = split_frontmatter(content)
+        digest = hashlib.sha1(raw.encode("utf-8")).hexdigest() if raw is not None else ""
+        if entry and entry["sha1"] == digest:
+            if entry["mtime_ns"] != st.st_mtime_ns or entry["size"] != st.st_size:
+                entry["mtime_ns"], entry["size"] = st.st_mtime_ns, st.st_size
+                self.dirty = True
+            return _decode(entry["data"]), entry["error"]
+
+        data, error = parse_frontmatter(content)
+        self.record(key, st, digest, data, error)
+        return data, error
+
+    def record(self, key: str, st: os.stat_result, digest: str, data, error: Optional[str]) -> None:
+        try:
+            encoded = _encode(data)
+        except TypeError:
+            # Exotic YAML (binary, sets, non-string keys): re-parse next time
+            self.entries.pop(key, None)
+            return
+        self.entries[key] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha1": digest,
+            "data": encoded,
+            "error": error,
+        }
+        self.dirty = True
+
+    def update(self, entries: Dict[str, dict]) -> None:
+        """Merge entries produced by another process (e.g. a pool worker)."""
+        self.entries.update(entries)
+        self.dirty = True
+
+    def save(self) -> None:
+        """Atomically write the cache if anything changed."""
+        if not self.dirty or self.cache_path is None:
+            return
+        # Forget files that no longer exist so the cache does not grow forever
+        self.entries = {k: v for k, v in self.entries.items() if os.path.exists(k)}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(
+                json.dumps({"version": CACHE_VERSION, "entries": self.entries}, sort_keys=True),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, self.cache_path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Warning: could not write frontmatter cache: {e}", file=sys.stderr)
+
+
+_caches: Dict[Optional[Path], FrontmatterCache] = {}
+
+
+def get_cache(md_path: Path) -> FrontmatterCache:
+    cache_path = get_cache_path(md_path)
+    if cache_path not in _caches:
+        _caches[cache_path] = FrontmatterCache(cache_path)
+    return _caches[cache_path]
+
+
+def load_frontmatter(md_path: Path, content: Optional[str] = None) -> Tuple[Optional[object], Optional[str]]:
+    """Cached equivalent of parse_frontmatter() for a file on disk."""
+    return get_cache(md_path).load(md_path, content)
+
+
+@atexit.register
+def save_caches() -> None:
+    for cache in _caches.values():
+        cache.save()
@@ -9,16 +9,31 @@ Workflow:
 4. Suggest README.md updates
 5. Suggest CLAUDE.md/AGENT.md updates
 6. Validate all changes
+
+With --git <rev-range>, every commit in the range is classified into a
+ChangeType and documented in one run (document_changes()).
+
+Docs are loaded once into an in-memory DocWorkspace; the CHANGELOG edit is
+applied there, the independent stages (SSOT, suggestions, validation) run
+concurrently against it, and all writes are committed together at the end.
 """
 
+import re
+import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, timezone
 
-from scripts.changelog.add_entry import add_entry_to_file, ChangeCategory
-from scripts.changelog.validate_changelog import validate_file as validate_changelog_file
+from scripts.changelog.add_entry import add_entries, ChangeCategory
+from scripts.changelog.changelog_model import file_signature, update_text_file
+from scripts.changelog.validate_changelog import (
+    validate_changelog,
+    validate_file as validate_changelog_file,
+)
 
 
 class ChangeType(Enum):
@@ -42,6 +57,151 @@ CHANGE_TYPE_TO_CATEGORY = {
 }
 
 
+# Conventional Commit types (https://www.conventionalcommits.org) -> ChangeType
+COMMIT_TYPE_TO_CHANGE_TYPE = {
+    "feat": ChangeType.FEATURE,
+    "feature": ChangeType.FEATURE,
+    "fix": ChangeType.BUGFIX,
+    "bugfix": ChangeType.BUGFIX,
+    "hotfix": ChangeType.BUGFIX,
+    "refactor": ChangeType.REFACTOR,
+    "perf": ChangeType.REFACTOR,
+    "docs": ChangeType.DOCS,
+    "doc": ChangeType.DOCS,
+    "chore": ChangeType.CHORE,
+    "build": ChangeType.CHORE,
+    "ci": ChangeType.CHORE,
+    "test": ChangeType.CHORE,
+    "tests": ChangeType.CHORE,
+    "style": ChangeType.CHORE,
+    "revert": ChangeType.CHORE,
+}
+
+# Fallback for free-form subjects, checked against the first word(s)
+COMMIT_KEYWORDS = [
+    (re.compile(r"^(add|adds|added|implement|introduce|support|create|new)\b", re.IGNORECASE), ChangeType.FEATURE),
+    (re.compile(r"^(fix|fixes|fixed|resolve|correct|patch|handle)\b", re.IGNORECASE), ChangeType.BUGFIX),
+    (re.compile(r"^(refactor|restructure|simplify|rename|move|extract|split|speed|optimi[sz]e|cache|make)\b",
+                re.IGNORECASE), ChangeType.REFACTOR),
+    (re.compile(r"^(doc|docs|document|readme|changelog)\b", re.IGNORECASE), ChangeType.DOCS),
+]
+
+CONVENTIONAL_RE = re.compile(r"^(?P<type>[A-Za-z]+)(?:\((?P<scope>[^)]*)\))?(?P<bang>!)?:\s*(?P<description>.+)$")
+SUBJECT_TAG_RE = re.compile(r"^(?:\[[^\]]*\]\s*)+")
+
+
+def classify_commit(subject: str, body: str = "") -> tuple:
+    """
+    Classify a commit message into (ChangeType, description, details).
+
+    Conventional Commit subjects ("feat(api)!: ...") use their type, scope and
+    breaking marker; other subjects fall back to keyword matching on their
+    first word (after any leading "[tag]"), defaulting to CHORE.
+    """
+    subject = subject.strip()
+    details = {}
+    if "BREAKING CHANGE" in body:
+        details["breaking"] = True
+
+    match = CONVENTIONAL_RE.match(subject)
+    if match and match.group("type").lower() in COMMIT_TYPE_TO_CHANGE_TYPE:
+        change_type = COMMIT_TYPE_TO_CHANGE_TYPE[match.group("type").lower()]
+        description = match.group("description").strip()
+        if match.group("scope"):
+            details["scope"] = match.group("scope")
+        if match.group("bang"):
+            details["breaking"] = True
+    else:
+        description = SUBJECT_TAG_RE.sub("", subject) or subject
+        change_type = next(
+            (ct for pattern, ct in COMMIT_KEYWORDS if pattern.match(description)),
+            ChangeType.CHORE,
+        )
+
+    if details.get("breaking"):
+        change_type = ChangeType.BREAKING
+    description = description[:1].upper() + description[1:]
+    return change_type, description, details
+
+
+def read_git_changes(repo: Path, rev_range: str) -> List[tuple]:
+    """Classify every non-merge commit in rev_range, oldest first, with one git call."""
+    proc = subprocess.run(
+        ["git", "log", "--no-merges", "--reverse", "--format=%x1e%H%x1f%s%x1f%b%x1f", "--name-only", rev_range],
+        cwd=repo, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise ValueError(f"git log {rev_range} failed: {proc.stderr.strip()}")
+
+    changes = []
+    for record in proc.stdout.split("\x1e")[1:]:
+        sha, subject, body, files = record.split("\x1f", 3)
+        change_type, description, details = classify_commit(subject, body)
+        details["commit"] = sha
+        details["files_changed"] = [f for f in files.splitlines() if f.strip()]
+        changes.append((change_type, description, details))
+    return changes
+
+
+class DocWorkspace:
+    """Docs read at most once per run; edits stay in memory until commit()."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._files: Dict[Path, dict] = {}
+
+    def _load(self, path: Path) -> dict:
+        entry = self._files.get(path)
+        if entry is None:
+            if path.exists():
+                signature = file_signature(path)
+                original = path.read_text(encoding='utf-8')
+            else:
+                signature, original = None, None
+            entry = {"signature": signature, "original": original, "text": original, "edits": []}
+            self._files[path] = entry
+        return entry
+
+    def read(self, path: Path) -> Optional[str]:
+        """Current in-memory text of path (None if it does not exist)."""
+        with self._lock:
+            return self._load(path)["text"]
+
+    def edit(self, path: Path, transform: Callable[[str], str]) -> None:
+        """Apply transform to path's in-memory text; exceptions leave it unchanged."""
+        with self._lock:
+            entry = self._load(path)
+            if entry["text"] is None:
+                raise FileNotFoundError(f"{path.name} not found: {path}")
+            entry["text"] = transform(entry["text"])
+            entry["edits"].append(transform)
+
+    def commit(self) -> List[Path]:
+        """Write every edited file once (locked, atomic); returns the paths written.
+
+        If a file changed on disk since it was loaded, the recorded edits are
+        replayed on the new content rather than overwriting it.
+        """
+        written = []
+        with self._lock:
+            for path, entry in self._files.items():
+                if not entry["edits"] or entry["text"] == entry["original"]:
+                    continue
+
+                def replay(content, edits=tuple(entry["edits"])):
+                    for transform in edits:
+                        content = transform(content)
+                    return content
+
+                entry["original"] = entry["text"] = update_text_file(
+                    path, replay, content=entry["original"], signature=entry["signature"]
+                )
+                entry["signature"] = file_signature(path)
+                entry["edits"] = []
+                written.append(path)
+        return written
+
+
 class DocumentingOrchestrator:
     """Coordinates documentation updates across multiple doc types."""
 
@@ -89,32 +249,80 @@ class DocumentingOrchestrator:
                 "validation_errors": List[str]
             }
         """
-        details = details or {}
+        return self.document_changes([(change_type, description, details)])
+
+    def document_changes(self, changes: List[tuple]) -> Dict:
+        """
+        Document many (change_type, description, details) changes in one run.
+
+        All CHANGELOG entries are applied with one parse, the docs are
+        validated once and every file is written at most once. Returns the
+        same structure as document_change(), with suggestions collected
+        across changes, plus "changelog_entries": the number of entries added.
+        """
         result = {
             "changelog_updated": False,
+            "changelog_entries": 0,
             "ssot_updated": False,
             "ssot_file": None,
             "readme_suggestions": [],
             "claude_suggestions": [],
             "validation_errors": []
         }
+        workspace = DocWorkspace()
+        changes = [(change_type, description, details or {}) for change_type, description, details in changes]
 
-        # 1. Update CHANGELOG
+        # 1. Update CHANGELOG (in memory; written at commit)
         if self.changelog_path.exists():
-            try:
-                category = CHANGE_TYPE_TO_CATEGORY[change_type]
+            entries = []
+            for i, (change_type, description, details) in enumerate(changes):
                 if details.get("breaking"):
                     description = f"**BREAKING**: {description}"
-
-                add_entry_to_file(self.changelog_path, category, description)
-                result["changelog_updated"] = True
+                    changes[i] = (change_type, description, details)
+                entries.append((CHANGE_TYPE_TO_CATEGORY[change_type], description))
+            try:
+                workspace.edit(self.changelog_path, lambda text: add_entries(text, entries))
+                result["changelog_updated"] = bool(entries)
+                result["changelog_entries"] = len(entries)
             except Exception as e:
                 result["validation_errors"].append(f"CHANGELOG update failed: {e}")
 
+        # 2-5. Independent stages run concurrently against the workspace
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            # 5. Validate all documentation (as it will be written)
+            validation = pool.submit(self.validate_all, workspace)
+            stages = [
+                pool.submit(self._document_stages, change_type, description, details)
+                for change_type, description, details in changes
+            ]
+
+            for stage in stages:
+                stage_result = stage.result()
+                if stage_result.get("ssot_updated"):
+                    result["ssot_updated"] = True
+                    result["ssot_file"] = stage_result["ssot_file"]
+                for key in ("readme_suggestions", "claude_suggestions"):
+                    for suggestion in stage_result.get(key, []):
+                        if suggestion not in result[key]:
+                            result[key].append(suggestion)
+            result["validation_errors"].extend(validation.result()["errors"])
+
+        # 6. Commit all writes together
+        try:
+            workspace.commit()
+        except Exception as e:
+            result["changelog_updated"] = False
+            result["validation_errors"].append(f"CHANGELOG update failed: {e}")
+
+        return result
+
+    def _document_stages(self, change_type: ChangeType, description: str, details: Dict) -> Dict:
+        """SSOT update and doc suggestions for one change (no file writes)."""
+        result = {}
+
         # 2. Update/Create SSOT (if relevant)
         if change_type in [ChangeType.FEATURE, ChangeType.REFACTOR, ChangeType.BREAKING]:
-            ssot_result = self._update_ssot(change_type, description, details)
-            result.update(ssot_result)
+            result.update(self._update_ssot(change_type, description, details))
 
         # 3. Generate README suggestions
         if change_type == ChangeType.FEATURE:
@@ -124,10 +332,6 @@ class DocumentingOrchestrator:
         if change_type in [ChangeType.FEATURE, ChangeType.REFACTOR]:
             result["claude_suggestions"] = self._generate_claude_suggestions(description, details)
 
-        # 5. Validate all documentation
-        validation = self.validate_all()
-        result["validation_errors"].extend(validation["errors"])
-
         return result
 
     def _update_ssot(self, change_type: ChangeType, description: str, details: Dict) -> Dict:
@@ -171,14 +375,17 @@ class DocumentingOrchestrator:
 
         return suggestions
 
-    def validate_all(self) -> Dict:
-        """Validate all documentation."""
+    def validate_all(self, workspace: Optional[DocWorkspace] = None) -> Dict:
+        """Validate all documentation (the workspace's pending state, if given)."""
         errors = []
         warnings = []
 
         # Validate CHANGELOG
         if self.changelog_path.exists():
-            result = validate_changelog_file(self.changelog_path)
+            if workspace is not None:
+                result = validate_changelog(workspace.read(self.changelog_path))
+            else:
+                result = validate_changelog_file(self.changelog_path)
             errors.extend(result.get("errors", []))
             warnings.extend(result.get("warnings", []))
 
@@ -192,32 +399,7 @@ class DocumentingOrchestrator:
         }
 
 
-def main():
-    """CLI entry point."""
-    if len(sys.argv) < 4:
-        print("Usage: orchestrator.py <project_root> <change_type> <description> [--scope=X] [--category=Y]")
-        print("")
-        print("Change Types: feature, bugfix, refactor, breaking, docs, chore")
-        print("")
-        print("Example:")
-        print('  orchestrator.py . feature "Add semantic search" --scope=search --category=backend')
-        sys.exit(1)
-
-    project_root = Path(sys.argv[1])
-    change_type = ChangeType(sys.argv[2])
-    description = sys.argv[3]
-
-    # Parse optional details
-    details = {}
-    for arg in sys.argv[4:]:
-        if arg.startswith("--"):
-            key, value = arg[2:].split("=", 1)
-            details[key] = value
-
-    orchestrator = DocumentingOrchestrator(project_root)
-    result = orchestrator.document_change(change_type, description, details)
-
-    # Print results
+def print_result(result: Dict) -> None:
     print("")
     print("📝 Documentation Update Results")
     print("=" * 60)
@@ -251,5 +433,54 @@ def main():
     print("✅ All documentation validated")
 
 
+def main():
+    """CLI entry point."""
+    if len(sys.argv) == 4 and sys.argv[2] == "--git":
+        project_root = Path(sys.argv[1])
+        try:
+            changes = read_git_changes(project_root, sys.argv[3])
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+
+        counts = {}
+        for change_type, description, _details in changes:
+            counts[change_type.value] = counts.get(change_type.value, 0) + 1
+            print(f"  [{change_type.value}] {description}")
+        summary = ", ".join(f"{n} {name}" for name, n in sorted(counts.items()))
+        print(f"Documenting {len(changes)} commit{'s' if len(changes) != 1 else ''} from {sys.argv[3]}"
+              + (f" ({summary})" if summary else ""))
+
+        orchestrator = DocumentingOrchestrator(project_root)
+        print_result(orchestrator.document_changes(changes))
+        return
+
+    if len(sys.argv) < 4:
+        print("Usage: orchestrator.py <project_root> <change_type> <description> [--scope=X] [--category=Y]")
+        print("       orchestrator.py <project_root> --git <rev-range>")
+        print("")
+        print("Change Types: feature, bugfix, refactor, breaking, docs, chore")
+        print("")
+        print("Example:")
+        print('  orchestrator.py . feature "Add semantic search" --scope=search --category=backend')
+        print("  orchestrator.py . --git v1.2.0..HEAD")
+        sys.exit(1)
+
+    project_root = Path(sys.argv[1])
+    change_type = ChangeType(sys.argv[2])
+    description = sys.argv[3]
+
+    # Parse optional details
+    details = {}
+    for arg in sys.argv[4:]:
+        if arg.startswith("--"):
+            key, value = arg[2:].split("=", 1)
+            details[key] = value
+
+    orchestrator = DocumentingOrchestrator(project_root)
+    result = orchestrator.document_change(change_type, description, details)
+    print_result(result)
+
+
 if __name__ == "__main__":
     main()
@@ -4,41 +4,67 @@ Validate SSOT memory metadata compliance.
 
 Checks if a memory file has all required frontmatter fields and follows
 the naming conventions defined in the SSOT guidelines.
+
+Given a directory, a glob or several files, validates all of them in one
+process (using a process pool for large trees) and prints an aggregated
+report, or JSON with --json.
 """
 
+import glob
+import hashlib
+import json
+import os
+import shutil
 import sys
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from pathlib import Path
-import yaml
+
+from frontmatter_loader import get_cache, load_frontmatter, parse_frontmatter
+
+
+def iter_headings(lines):
+    """Yield (heading, summary) for every ## section (not ###) in one pass over lines.
+
+    A section's summary is the first sentence of the first plain-text line after
+    its heading, skipping blank, heading, table and list lines and anything inside
+    ``` fences (fence state counted from the heading). Sections still waiting for
+    a summary are grouped by fence parity, so each line is looked at once however
+    many headings are pending; memory is bounded by the unresolved headings.
+    """
+    pending = deque()          # [heading, summary] in document order; summary None until found
+    outside, inside = [], []   # unresolved entries outside / inside a fence
+    for line in lines:
+        l = line.strip()
+        if l.startswith("```"):
+            outside, inside = inside, outside
+        elif outside and l and l[0] not in "#|-":
+            # Take up to first period, strip trailing period
+            sentence = l.partition(".")[0].strip()[:120]
+            for entry in outside:
+                entry[1] = sentence
+            outside = []
+            while pending and pending[0][1] is not None:
+                yield tuple(pending.popleft())
+        if line.startswith("## ") and not line.startswith("### "):
+            entry = [line[3:].strip(), None]
+            pending.append(entry)
+            outside.append(entry)
+    for heading, summary in pending:
+        yield heading, summary or ""
 
 
 def extract_headings(content: str) -> list:
     """Extract (heading, first_sentence) for every ## section (not ###)."""
-    results = []
-    lines = content.splitlines()
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if line.startswith("## ") and not line.startswith("### "):
-            heading = line[3:].strip()
-            summary = ""
-            j = i + 1
-            in_code = False
-            while j < len(lines):
-                l = lines[j].strip()
-                if l.startswith("```"):
-                    in_code = not in_code
-                    j += 1
-                    continue
-                if not in_code and l and not l.startswith("#") and not l.startswith("|") and not l.startswith("-"):
-                    # Take up to first period, strip trailing period
-                    sentence = l.split(".")[0].strip()
-                    summary = sentence[:120]
-                    break
-                j += 1
-            results.append((heading, summary))
-        i += 1
-    return results
+    return list(iter_headings(content.splitlines()))
+
+
+def extract_headings_from_file(path) -> list:
+    """Like extract_headings(), streaming the file instead of loading it whole."""
+    with open(path, encoding="utf-8") as f:
+        return list(iter_headings(f))
 
 
 def generate_index_table(headings: list) -> str:
@@ -55,9 +81,42 @@ def generate_index_table(headings: list) -> str:
     return "\n".join(rows) + "\n"
 
 
-def inject_index(content: str, table: str) -> str:
+INDEX_FORMAT = 1  # Bump when generate_index_table() output changes
+FINGERPRINT_RE = re.compile(r"<!-- INDEX:[^\n]*?\bfingerprint: ([0-9a-f]+) -->")
+
+
+def heading_fingerprint(headings: list) -> str:
+    """Short hash of the (heading, summary) structure an INDEX table is built from."""
+    digest = hashlib.sha1(f"{INDEX_FORMAT}\n".encode("utf-8"))
+    for heading, summary in headings:
+        digest.update(f"{heading}\0{summary}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def index_fingerprint(content: str) -> str:
+    """Fingerprint recorded in an existing INDEX block, or "" if there is none."""
+    match = FINGERPRINT_RE.search(content)
+    return match.group(1) if match and "<!-- END INDEX -->" in content else ""
+
+
+def read_index_fingerprint(path: Path) -> str:
+    """index_fingerprint() of a file, reading it only up to the end of its INDEX block."""
+    fingerprint, closed = "", False
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not fingerprint:
+                match = FINGERPRINT_RE.search(line)
+                fingerprint = match.group(1) if match else ""
+            closed = closed or "<!-- END INDEX -->" in line
+            if fingerprint and closed:
+                return fingerprint
+    return ""
+
+
+def inject_index(content: str, table: str, fingerprint: str = "") -> str:
     """Replace existing INDEX block or insert one after frontmatter closing ---."""
-    header = "<!-- INDEX: auto-generated by validate_metadata.py — do not edit manually -->\n"
+    stamp = f" | fingerprint: {fingerprint}" if fingerprint else ""
+    header = f"<!-- INDEX: auto-generated by validate_metadata.py — do not edit manually{stamp} -->\n"
     footer = "<!-- END INDEX -->"
     block = f"{header}{table}{footer}"
 
@@ -74,6 +133,42 @@ def inject_index(content: str, table: str) -> str:
     return block + "\n" + content
 
 
+def write_if_changed(path: Path, new_content: str, old_content: str) -> bool:
+    """Atomically replace path with new_content unless the bytes are identical."""
+    new_bytes = new_content.encode("utf-8")
+    if new_bytes == old_content.encode("utf-8"):
+        return False
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(new_bytes)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def refresh_index(path: Path) -> bool:
+    """Regenerate the INDEX block if the heading structure changed; True if the file was rewritten.
+
+    The fingerprint is computed while streaming the headings from disk, so an
+    up-to-date file is never held in memory; it is only read whole when the
+    INDEX block actually has to be rewritten.
+    """
+    with open(path, encoding="utf-8") as f:
+        headings = iter_headings(f)
+        first = next(headings, None)
+        if first is None:
+            return False
+        fingerprint = heading_fingerprint(chain([first], headings))
+    if read_index_fingerprint(path) == fingerprint:
+        return False  # Table already matches the headings; skip generation entirely
+    content = path.read_text(encoding="utf-8")
+    new_content = inject_index(content, generate_index_table(extract_headings(content)), fingerprint)
+    return write_if_changed(path, new_content, content)
+
+
 REQUIRED_FIELDS = {
     "ssot": ["title", "version", "updated", "scope", "category", "subcategory", "domain"],
     "pattern": ["title", "version", "updated", "scope", "category", "domain"],
@@ -87,14 +182,10 @@ CATEGORY_SUFFIXES = ["ssot", "pattern", "plan", "reference", "archive", "trouble
 
 def extract_frontmatter(content):
     """Extract YAML frontmatter from markdown content."""
-    match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
-    if not match:
-        return None
-    try:
-        return yaml.safe_load(match.group(1))
-    except yaml.YAMLError as e:
-        print(f"ERROR: Invalid YAML frontmatter: {e}")
-        return None
+    metadata, error = parse_frontmatter(content)
+    if error:
+        print(f"ERROR: Invalid YAML frontmatter: {error}")
+    return metadata
 
 
 def validate_naming(filename):
@@ -124,33 +215,37 @@ def validate_version(version):
     return bool(re.match(pattern, str(version)))
 
 
-def validate_metadata(filepath):
-    """Validate memory metadata."""
+def check_memory(filepath) -> dict:
+    """Validate one memory file and regenerate its INDEX block, without printing.
+
+    Returns {"file", "valid", "errors", "warnings", "yaml_error", "index_regenerated"}.
+    """
     path = Path(filepath)
+    result = {
+        "file": str(filepath),
+        "valid": False,
+        "errors": [],
+        "warnings": [],
+        "yaml_error": None,
+        "index_regenerated": False,
+    }
+    errors = result["errors"]
+    warnings = result["warnings"]
 
     if not path.exists():
-        print(f"ERROR: File not found: {filepath}")
-        return False
-
-    print(f"Validating: {path.name}")
-    print("=" * 60)
-
-    errors = []
-    warnings = []
+        errors.append(f"File not found: {filepath}")
+        return result
 
     # Check naming convention
     naming_errors = validate_naming(path.name)
     errors.extend(naming_errors)
 
-    # Read content
-    content = path.read_text(encoding='utf-8')
-
-    # Extract frontmatter
-    metadata = extract_frontmatter(content)
+    # Extract frontmatter (cached across runs while the file is unchanged; only
+    # the frontmatter lines are read on a miss)
+    metadata, result["yaml_error"] = load_frontmatter(path)
     if metadata is None:
         errors.append("Missing or invalid YAML frontmatter (should be between --- markers)")
-        print_results(errors, warnings)
-        return False
+        return result
 
     # Determine category from filename suffix
     category = None
@@ -195,18 +290,113 @@ def validate_metadata(filepath):
     if category == "ssot" and "changelog" not in metadata:
         warnings.append("SSOT files should include a changelog section in frontmatter")
 
-    print_results(errors, warnings)
+    result["valid"] = len(errors) == 0
+
+    # Regenerate INDEX block regardless of schema validity (navigation aid)
+    result["index_regenerated"] = refresh_index(path)
+
+    return result
+
+
+def validate_metadata(filepath):
+    """Validate memory metadata."""
+    path = Path(filepath)
+
+    if not path.exists():
+        print(f"ERROR: File not found: {filepath}")
+        return False
+
+    print(f"Validating: {path.name}")
+    print("=" * 60)
 
-    # Regenerate INDEX block unconditionally (navigation aid, independent of schema validity)
-    headings = extract_headings(content)
-    if headings:
-        table = generate_index_table(headings)
-        new_content = inject_index(content, table)
-        if new_content != content:
-            path.write_text(new_content, encoding="utf-8")
-            print("  ✏️  INDEX regenerated.")
+    result = check_memory(path)
+    if result["yaml_error"]:
+        print(f"ERROR: Invalid YAML frontmatter: {result['yaml_error']}")
+    print_results(result["errors"], result["warnings"])
+    if result["index_regenerated"]:
+        print("  ✏️  INDEX regenerated.")
 
-    return len(errors) == 0
+    return result["valid"]
+
+
+# ── Batch mode ────────────────────────────────────────────────────────────────
+
+PARALLEL_MIN_FILES = 32  # Below this a process pool costs more than it saves
+
+
+def collect_memory_files(targets: list) -> list:
+    """Expand files, directories (recursively) and glob patterns into .md paths."""
+    files = []
+    seen = set()
+    for target in targets:
+        path = Path(target)
+        if path.is_dir():
+            matches = sorted(path.rglob("*.md"))
+        elif glob.has_magic(target):
+            matches = sorted(Path(p) for p in glob.glob(target, recursive=True))
+        else:
+            matches = [path]
+        for match in matches:
+            key = os.path.abspath(match)
+            if key not in seen:
+                seen.add(key)
+                files.append(match)
+    return files
+
+
+def _check_in_worker(filepath: str) -> tuple:
+    """Pool task: validate one file and hand its frontmatter cache entry back to the parent."""
+    result = check_memory(filepath)
+    key = str(Path(filepath).resolve())
+    return result, key, get_cache(Path(filepath)).entries.get(key)
+
+
+def validate_batch(files: list, jobs: int = None) -> list:
+    """Validate many memory files, in a process pool when there are enough of them."""
+    paths = [str(f) for f in files]
+    workers = jobs or os.cpu_count() or 1
+    if len(paths) < PARALLEL_MIN_FILES or workers < 2:
+        return [check_memory(p) for p in paths]
+
+    results = []
+    chunksize = max(1, len(paths) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result, key, entry in pool.map(_check_in_worker, paths, chunksize=chunksize):
+            results.append(result)
+            if entry is not None and Path(key).exists():
+                get_cache(Path(key)).update({key: entry})
+    return results
+
+
+def summarize(results: list) -> dict:
+    return {
+        "files": len(results),
+        "valid": sum(r["valid"] for r in results),
+        "invalid": sum(not r["valid"] for r in results),
+        "with_warnings": sum(bool(r["warnings"]) for r in results),
+        "index_regenerated": sum(r["index_regenerated"] for r in results),
+    }
+
+
+def format_batch_report(results: list) -> str:
+    lines = []
+    for r in results:
+        if r["valid"] and not r["warnings"]:
+            continue
+        lines.append(f"{'⚠️ ' if r['valid'] else '❌'} {r['file']}")
+        if r["yaml_error"]:
+            lines.append(f"    ERROR: Invalid YAML frontmatter: {r['yaml_error'].splitlines()[0]}")
+        lines.extend(f"    error: {e}" for e in r["errors"])
+        lines.extend(f"    warning: {w}" for w in r["warnings"])
+    s = summarize(results)
+    if lines:
+        lines.append("")
+    lines.append(
+        f"Validated {s['files']} file{'s' if s['files'] != 1 else ''}: "
+        f"{s['valid']} valid, {s['invalid']} invalid, {s['with_warnings']} with warnings, "
+        f"{s['index_regenerated']} INDEX regenerated"
+    )
+    return "\n".join(lines)
 
 
 def print_results(errors, warnings):
@@ -228,14 +418,40 @@ def print_results(errors, warnings):
 
 
 def main():
-    if len(sys.argv) < 2:
+    args = sys.argv[1:]
+    if not args:
         print("Usage: validate_metadata.py <memory-file.md>")
+        print("       validate_metadata.py <file|dir|glob>... [--json] [--jobs N]")
         print("Example: validate_metadata.py analytics_volatility_ssot.md")
+        print("Example: validate_metadata.py .serena/memories/ --json")
         sys.exit(1)
 
-    filepath = sys.argv[1]
-    success = validate_metadata(filepath)
-    sys.exit(0 if success else 1)
+    as_json, jobs, targets = False, None, []
+    it = iter(args)
+    for arg in it:
+        if arg == "--json":
+            as_json = True
+        elif arg == "--jobs":
+            value = next(it, "")
+            if not value.isdigit():
+                print("--jobs expects a number")
+                sys.exit(1)
+            jobs = int(value) or None
+        else:
+            targets.append(arg)
+
+    # A single explicit file keeps the detailed per-file report
+    if len(targets) == 1 and not as_json and not Path(targets[0]).is_dir() and not glob.has_magic(targets[0]):
+        success = validate_metadata(targets[0])
+        sys.exit(0 if success else 1)
+
+    files = collect_memory_files(targets)
+    results = validate_batch(files, jobs)
+    if as_json:
+        print(json.dumps({"summary": summarize(results), "results": results}, indent=2))
+    else:
+        print(format_batch_report(results))
+    sys.exit(0 if results and all(r["valid"] for r in results) else 1)
 
 
 if __name__ == "__main__":
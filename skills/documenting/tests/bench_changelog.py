@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark changelog edits on long release histories.
+
+Run directly (not collected by pytest):
+  python3 tests/bench_changelog.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from scripts.changelog.add_entry import add_entry, ChangeCategory
+from scripts.changelog.bump_release import bump_release
+from scripts.changelog import validate_changelog as validator
+
+
+def make_changelog(n_releases: int) -> str:
+    parts = [
+        "# Changelog\n\nAll notable changes to this project will be documented in this file.\n\n"
+        "## [Unreleased]\n\n### Added\n- Pending feature\n\n"
+    ]
+    for i in range(n_releases, 0, -1):
+        parts.append(
+            f"## [{i // 100}.{i % 100}.0] - 2026-01-01\n\n"
+            f"### Added\n- Feature {i}\n- Another feature {i}\n\n"
+            f"### Fixed\n- Bug {i}\n\n"
+        )
+    return "".join(parts)
+
+
+def bench(n_releases: int, repeat: int = 20):
+    content = make_changelog(n_releases)
+    timings = {}
+    for name, fn in [
+        ("add_entry (existing category)", lambda: add_entry(content, ChangeCategory.ADDED, "New feature")),
+        ("add_entry (new category)", lambda: add_entry(content, ChangeCategory.SECURITY, "Patch")),
+        ("bump_release", lambda: bump_release(content, "99.0.0", "2026-03-01")),
+    ]:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        timings[name] = (time.perf_counter() - start) / repeat
+    size_kb = len(content) / 1024
+    print(f"{n_releases:>7} releases ({size_kb:>8.0f} KB)  " + "  ".join(
+        f"{name}: {t * 1000:6.2f} ms" for name, t in timings.items()
+    ))
+
+
+def bench_validate(n_releases: int):
+    content = make_changelog(n_releases)
+    edited = add_entry(content, ChangeCategory.FIXED, "Edited")
+    validator._section_cache.clear()
+    start = time.perf_counter()
+    validator.validate_changelog(content)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    validator.validate_changelog(edited)
+    warm = time.perf_counter() - start
+    print(f"{n_releases:>7} releases  validate cold: {cold * 1000:7.2f} ms  after one edit: {warm * 1000:7.2f} ms")
+
+
+def main():
+    for n in (100, 1_000, 10_000, 50_000):
+        bench(n)
+    print()
+    for n in (1_000, 10_000):
+        bench_validate(n)
+
+
+if __name__ == "__main__":
+    main()
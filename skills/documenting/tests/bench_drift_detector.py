@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark drift_detector track matching at scale.
+
+Run directly (not collected by pytest):
+  python3 tests/bench_drift_detector.py
+"""
+
+import sys
+import time
+import random
+import fnmatch
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from drift_detector import match_files_to_tracks, _compile_tracks
+
+
+DIRS = ["cli/src", "cli/lib", "hooks", "skills/documenting/scripts", "docs/plans", "config", "src/api/v1", "src/core"]
+EXTS = ["py", "ts", "js", "md", "json", "yaml"]
+
+
+def reference_match(path: str, pattern: str) -> bool:
+    """The previous recursive per-segment fnmatch matcher, for comparison."""
+    def _match(pp, pat):
+        if not pat:
+            return not pp
+        if pat[0] == "**":
+            return any(_match(pp[i:], pat[1:]) for i in range(len(pp) + 1))
+        if not pp:
+            return False
+        return fnmatch.fnmatch(pp[0], pat[0]) and _match(pp[1:], pat[1:])
+
+    return _match(path.split("/"), pattern.split("/"))
+
+
+def make_files(n: int, rng: random.Random) -> list:
+    return [
+        f"{rng.choice(DIRS)}/{'/'.join(f'pkg{rng.randrange(20)}' for _ in range(rng.randrange(3)))}/mod{i}.{rng.choice(EXTS)}"
+        .replace("//", "/")
+        for i in range(n)
+    ]
+
+
+def make_patterns(n: int, rng: random.Random) -> list:
+    shapes = ["{d}/**/*.{e}", "{d}/*.{e}", "{d}/pkg{k}/**", "**/mod{k}?.{e}", "{d}/**/pkg{k}/*.[jt]s"]
+    return [
+        rng.choice(shapes).format(d=rng.choice(DIRS), e=rng.choice(EXTS), k=rng.randrange(20))
+        for _ in range(n)
+    ]
+
+
+def bench(n_files: int, n_patterns: int, per_memory: int = 10, with_reference: bool = False):
+    rng = random.Random(n_files * 31 + n_patterns)
+    files = make_files(n_files, rng)
+    patterns = make_patterns(n_patterns, rng)
+    memories = [patterns[i:i + per_memory] for i in range(0, len(patterns), per_memory)]
+    _compile_tracks.cache_clear()
+
+    start = time.perf_counter()
+    matched = sum(len(match_files_to_tracks(files, tracks)) for tracks in memories)
+    elapsed = time.perf_counter() - start
+
+    pairs = n_files * n_patterns
+    print(f"{n_files:>7} files x {n_patterns:>5} patterns  {elapsed * 1000:>9.1f} ms  "
+          f"{pairs / elapsed / 1e6:>7.1f}M pairs/s  ({matched} matches)")
+
+    if with_reference:
+        start = time.perf_counter()
+        expected = sum(
+            sum(1 for f in files if any(reference_match(f, p) for p in tracks))
+            for tracks in memories
+        )
+        ref_elapsed = time.perf_counter() - start
+        assert expected == matched, (expected, matched)
+        print(f"{'':>34}reference: {ref_elapsed * 1000:>9.1f} ms  ({ref_elapsed / elapsed:.0f}x slower)")
+
+
+def main():
+    print("Track matching (compiled per-memory alternations, 10 patterns per memory)")
+    bench(1_000, 100, with_reference=True)
+    for n_files, n_patterns in [(1_000, 1_000), (10_000, 100), (10_000, 1_000)]:
+        bench(n_files, n_patterns)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark documenting a git range in one run vs one orchestrator process per commit.
+
+Run directly (not collected by pytest):
+  python3 tests/bench_orchestrator.py [n_commits]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SKILL_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SKILL_DIR))
+from scripts.orchestrator import read_git_changes
+
+SUBJECTS = [
+    "feat(api): add endpoint {i}",
+    "fix: handle empty payload {i}",
+    "refactor: split module {i}",
+    "docs: describe option {i}",
+    "chore: bump dependency {i}",
+    "Add search filter {i}",
+]
+
+CHANGELOG = """# Changelog
+
+The format is based on [Keep a Changelog](https://keepachangelog.com/en/1.0.0/),
+and this project adheres to [Semantic Versioning](https://semver.org/spec/v2.0.0.html).
+
+## [Unreleased]
+
+## [0.1.0] - 2026-01-01
+
+### Added
+- Initial release
+"""
+
+
+def git(repo: Path, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def make_repo(root: Path, n_commits: int):
+    git(root, "init", "-q")
+    git(root, "config", "user.email", "bench@example.com")
+    git(root, "config", "user.name", "bench")
+    (root / "CHANGELOG.md").write_text(CHANGELOG, encoding="utf-8")
+    git(root, "add", "CHANGELOG.md")
+    git(root, "commit", "-q", "-m", "chore: initial")
+    for i in range(n_commits):
+        git(root, "commit", "-q", "--allow-empty", "-m", SUBJECTS[i % len(SUBJECTS)].format(i=i))
+
+
+def run_orchestrator(*args):
+    subprocess.run(
+        [sys.executable, "-m", "scripts.orchestrator", *args],
+        cwd=SKILL_DIR, check=True, capture_output=True,
+        env={**os.environ, "PYTHONPATH": str(SKILL_DIR)},
+    )
+
+
+def main():
+    n_commits = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_repo(root, n_commits)
+        rev_range = f"HEAD~{n_commits}..HEAD"
+        changes = read_git_changes(root, rev_range)
+
+        start = time.perf_counter()
+        for change_type, description, details in changes:
+            run_orchestrator(str(root), change_type.value, description)
+        per_invocation = time.perf_counter() - start
+        after_loop = (root / "CHANGELOG.md").read_text(encoding="utf-8")
+
+        (root / "CHANGELOG.md").write_text(CHANGELOG, encoding="utf-8")
+        start = time.perf_counter()
+        run_orchestrator(str(root), "--git", rev_range)
+        batch = time.perf_counter() - start
+        after_batch = (root / "CHANGELOG.md").read_text(encoding="utf-8")
+
+    same = "identical" if after_loop == after_batch else "DIFFERENT"
+    print(f"{n_commits} commits")
+    print(f"  one process per commit: {per_invocation:8.2f} s  {n_commits / per_invocation:9.1f} commits/s")
+    print(f"  --git batch:            {batch:8.2f} s  {n_commits / batch:9.1f} commits/s  "
+          f"({per_invocation / batch:.0f}x faster, CHANGELOG {same})")
+
+
+if __name__ == "__main__":
+    main()
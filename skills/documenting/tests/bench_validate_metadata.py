@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark validate_metadata heading extraction and validation on large generated memories.
+
+Run directly (not collected by pytest):
+  python3 tests/bench_validate_metadata.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from validate_metadata import check_memory, extract_headings_from_file, iter_headings
+
+
+def reference_extract(content: str) -> list:
+    """The previous per-heading forward scan, for comparison."""
+    results = []
+    lines = content.splitlines()
+    for i, line in enumerate(lines):
+        if line.startswith("## ") and not line.startswith("### "):
+            summary = ""
+            in_code = False
+            for l in (x.strip() for x in lines[i + 1:]):
+                if l.startswith("```"):
+                    in_code = not in_code
+                    continue
+                if not in_code and l and not l.startswith("#") and not l.startswith("|") and not l.startswith("-"):
+                    summary = l.split(".")[0].strip()[:120]
+                    break
+            results.append((line[3:].strip(), summary))
+    return results
+
+
+def make_typical(size: int) -> str:
+    """Sections with prose, lists, tables and fenced code."""
+    section = (
+        "## Section {i}\n"
+        "Handles part {i} of the pipeline. Details follow.\n\n"
+        "- bullet one\n- bullet two\n\n"
+        "| a | b |\n|---|---|\n| 1 | 2 |\n\n"
+        "```python\ndef f{i}():\n    return {i}\n```\n\n"
+        "### Notes\nMore prose here.\n\n"
+    )
+    parts, total, i = [], 0, 0
+    while total < size:
+        chunk = section.format(i=i)
+        parts.append(chunk)
+        total += len(chunk)
+        i += 1
+    return "---\ntitle: Bench\n---\n\n" + "".join(parts)
+
+
+def make_adversarial(n_headings: int) -> str:
+    """Headings with no summary until the very end: quadratic for a forward scan."""
+    return "".join(f"## Heading {i}\n- item\n" for i in range(n_headings)) + "Finally some text.\n"
+
+
+def time_it(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_file(size_mb: int):
+    content = make_typical(size_mb * 1024 * 1024)
+    fd, path = tempfile.mkstemp(suffix="_ssot.md")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        del content
+        headings, elapsed = time_it(extract_headings_from_file, path)
+
+        # Memory while streaming, without holding the results list
+        tracemalloc.start()
+        with open(path, encoding="utf-8") as f:
+            count = sum(1 for _ in iter_headings(f))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert count == len(headings)
+        print(f"{size_mb:>4} MB file  {elapsed * 1000:>9.1f} ms  {size_mb / elapsed:>7.1f} MB/s  "
+              f"{len(headings):>8} sections  streaming peak {peak / 1024:.0f} KB")
+
+        # Full validation of a file whose INDEX is already current (the common case)
+        check_memory(path)
+        result, elapsed = time_it(check_memory, path)
+        tracemalloc.start()
+        check_memory(path)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert not result["index_regenerated"]
+        print(f"{'':>4}    check_memory  {elapsed * 1000:>9.1f} ms  (up to date)  peak {peak / 1024:.0f} KB")
+    finally:
+        os.unlink(path)
+
+
+def bench_adversarial(n_headings: int):
+    content = make_adversarial(n_headings)
+    headings, elapsed = time_it(lambda c: list(iter_headings(c.splitlines())), content)
+    expected, ref_elapsed = time_it(reference_extract, content)
+    assert headings == expected
+    print(f"{n_headings:>7} pending headings  {elapsed * 1000:>9.1f} ms  "
+          f"reference {ref_elapsed * 1000:>9.1f} ms  ({ref_elapsed / elapsed:.0f}x slower)")
+
+
+def main():
+    print("Streaming extraction from disk (typical memory layout)")
+    for size_mb in (1, 10, 50):
+        bench_file(size_mb)
+    print("\nHeadings without summaries (worst case for a per-heading forward scan)")
+    for n in (1_000, 2_000, 4_000):
+        bench_adversarial(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,16 @@
 
 import pytest
 from pathlib import Path
-from scripts.changelog.validate_changelog import validate_changelog
-from scripts.changelog.add_entry import add_entry, ChangeCategory
+from scripts.changelog import validate_changelog as validate_changelog_module
+from scripts.changelog.validate_changelog import validate_changelog, validate_file
+from scripts.changelog.add_entry import (
+    add_entry, add_entries_to_file, load_entries, ChangeCategory,
+)
 from scripts.changelog.bump_release import bump_release
+from scripts.changelog.changelog_model import Changelog, lock_path, update_text_file
 from datetime import date
 import tempfile
+import multiprocessing
 
 
 def test_valid_changelog_passes():
@@ -199,3 +204,184 @@ def test_bump_release_validates_semver():
 
     with pytest.raises(ValueError, match="semantic version"):
         bump_release(changelog_content, "1.0")
+
+
+def test_add_entry_splices_without_touching_history():
+    """Only the [Unreleased] region changes; history bytes and trailing newline are kept."""
+    history = "".join(f"## [1.0.{i}] - 2026-01-01\n\n### Fixed\n- Fix {i}\n\n" for i in range(200, 0, -1))
+    changelog_content = "# Changelog\n\n## [Unreleased]\n\n### Added\n- Feature A\n\n" + history
+
+    result = add_entry(changelog_content, ChangeCategory.ADDED, "Feature B")
+
+    assert result == changelog_content.replace("- Feature A\n", "- Feature A\n- Feature B\n", 1)
+
+
+def test_changelog_scans_only_needed_sections():
+    log = Changelog("# Changelog\n\n## [Unreleased]\n\n## [1.0.0] - 2026-01-01\n\n## [0.9.0] - 2025-12-01\n")
+    assert log.unreleased().title == "Unreleased"
+    assert len(log._sections) == 1
+    assert [s.title for s in log.sections()] == ["Unreleased", "1.0.0", "0.9.0"]
+    assert log.section("0.9.0").date == "2025-12-01"
+
+
+def test_changelog_batches_new_categories_in_order():
+    log = Changelog("## [Unreleased]\n\n### Fixed\n- Bug\n\n## [1.0.0] - 2026-01-01\n")
+    log.add_entry("Security", "Patch")
+    log.add_entry("Changed", "Tweak")
+    log.add_entry("Added", "Thing")
+    log.add_entry("Fixed", "Other bug")
+
+    assert log.render() == (
+        "## [Unreleased]\n\n"
+        "### Added\n- Thing\n\n"
+        "### Changed\n- Tweak\n\n"
+        "### Fixed\n- Bug\n- Other bug\n\n"
+        "### Security\n- Patch\n\n"
+        "## [1.0.0] - 2026-01-01\n"
+    )
+
+
+def test_changelog_handles_crlf_and_missing_final_newline():
+    log = Changelog("## [Unreleased]\r\n\r\n### Added\r\n- A")
+    log.add_entry("Added", "B")
+    assert log.render() == "## [Unreleased]\r\n\r\n### Added\r\n- A\r\n- B\r\n"
+
+
+def test_load_entries_accepts_json_and_ndjson():
+    expected = [(ChangeCategory.FIXED, "Bug A"), (ChangeCategory.ADDED, "Feature B")]
+    assert load_entries('[{"category": "fixed", "description": "Bug A"}, ["Added", "Feature B"]]') == expected
+    assert load_entries('{"category": "Fixed", "description": "Bug A"}\n\n["ADDED", "Feature B"]\n') == expected
+
+    with pytest.raises(ValueError, match="Invalid category"):
+        load_entries('[["Improved", "x"]]')
+    with pytest.raises(ValueError, match="Line 2"):
+        load_entries('["Added", "x"]\nnot json')
+
+
+def test_add_entries_to_file_single_write(tmp_path):
+    changelog = tmp_path / "CHANGELOG.md"
+    changelog.write_text("# Changelog\n\n## [Unreleased]\n\n## [1.0.0] - 2026-01-01\n", encoding="utf-8")
+    entries = [(ChangeCategory.FIXED, f"Fix {i}") for i in range(50)] + [(ChangeCategory.ADDED, "Feature")]
+
+    add_entries_to_file(changelog, entries)
+
+    content = changelog.read_text(encoding="utf-8")
+    fixes = "".join(f"- Fix {i}\n" for i in range(50))
+    assert content == (
+        "# Changelog\n\n## [Unreleased]\n\n### Added\n- Feature\n\n### Fixed\n" + fixes
+        + "\n## [1.0.0] - 2026-01-01\n"
+    )
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_validate_changelog_rechecks_only_changed_sections(monkeypatch):
+    header = "# Changelog\n\n[Keep a Changelog](x) [Semantic Versioning](y)\n\n"
+    releases = "".join(f"## [1.{i}.0] - 2026-01-01\n\n### Added\n- Thing {i}\n\n" for i in range(50))
+    content = header + "## [Unreleased]\n\n### Added\n- New\n\n" + releases
+    validate_changelog_module._section_cache.clear()
+    first = validate_changelog(content)
+
+    calls = []
+    original = validate_changelog_module._validate_section
+    monkeypatch.setattr(validate_changelog_module, "_validate_section",
+                        lambda chunk: calls.append(chunk) or original(chunk))
+
+    assert validate_changelog(content) == first
+    assert calls == []
+
+    edited = content.replace("- New\n", "- New\n\n### Improved\n- Oops\n")
+    result = validate_changelog(edited)
+    assert len(calls) == 1 and calls[0].startswith("## [Unreleased]")
+    assert result["errors"] == [
+        f"Invalid category: 'Improved' (must be one of {validate_changelog_module.VALID_CATEGORIES})"
+    ]
+
+
+def test_validate_file_reuses_result_until_file_changes(tmp_path):
+    changelog = tmp_path / "CHANGELOG.md"
+    changelog.write_text("# Changelog\n\n## [Unreleased]\n", encoding="utf-8")
+    result = validate_file(changelog)
+    assert result["errors"] == ["Missing 'Keep a Changelog' link in header"]
+
+    result["errors"].clear()  # Callers get their own copy
+    assert validate_file(changelog)["errors"] == ["Missing 'Keep a Changelog' link in header"]
+
+    changelog.write_text("# Changelog\n\nKeep a Changelog, Semantic Versioning\n\n## [Unreleased]\n", encoding="utf-8")
+    assert validate_file(changelog)["valid"] is True
+
+
+def _append_entries(path, worker, count):
+    for i in range(count):
+        add_entries_to_file(Path(path), [(ChangeCategory.ADDED, f"worker {worker} entry {i}")])
+
+
+def test_concurrent_add_entries_lose_nothing(tmp_path):
+    """Many processes appending at once: every entry lands, the file stays valid."""
+    changelog = tmp_path / "CHANGELOG.md"
+    changelog.write_text(
+        "# Changelog\n\nKeep a Changelog, Semantic Versioning\n\n## [Unreleased]\n\n## [1.0.0] - 2026-01-01\n",
+        encoding="utf-8",
+    )
+    workers, per_worker = 8, 25
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_append_entries, args=(str(changelog), w, per_worker)) for w in range(workers)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=60)
+        assert p.exitcode == 0
+
+    content = changelog.read_text(encoding="utf-8")
+    entries = [line for line in content.splitlines() if line.startswith("- worker")]
+    assert len(entries) == workers * per_worker
+    assert len(set(entries)) == workers * per_worker
+    assert content.count("### Added") == 1
+    assert validate_changelog(content)["valid"] is True
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_update_text_file_reapplies_edit_after_foreign_write(tmp_path):
+    """A writer that ignores the lock is merged with, not overwritten."""
+    changelog = tmp_path / "CHANGELOG.md"
+    changelog.write_text("## [Unreleased]\n\n### Added\n- A\n", encoding="utf-8")
+    attempts = []
+
+    def transform(content):
+        if not attempts:
+            changelog.write_text(content + "- From editor\n", encoding="utf-8")
+        attempts.append(content)
+        return add_entry(content, ChangeCategory.ADDED, "Ours")
+
+    update_text_file(changelog, transform)
+
+    assert len(attempts) == 2
+    assert changelog.read_text(encoding="utf-8") == "## [Unreleased]\n\n### Added\n- A\n- From editor\n- Ours\n"
+
+
+def test_lock_file_lives_in_git_dir(tmp_path):
+    """Inside a repository the lock never appears as an untracked file."""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "docs").mkdir()
+    changelog = tmp_path / "docs" / "CHANGELOG.md"
+    changelog.write_text("## [Unreleased]\n", encoding="utf-8")
+
+    update_text_file(changelog, lambda content: add_entry(content, ChangeCategory.ADDED, "New"))
+
+    assert lock_path(changelog).parent == tmp_path / ".git" / "jaggers-locks"
+    assert lock_path(changelog) != lock_path(tmp_path / "CHANGELOG.md")
+    assert sorted(p.name for p in (tmp_path / "docs").iterdir()) == ["CHANGELOG.md"]
+
+
+def test_lock_file_follows_worktree_gitdir(tmp_path):
+    git_dir = tmp_path / "main" / ".git" / "worktrees" / "wt"
+    git_dir.mkdir(parents=True)
+    worktree = tmp_path / "wt"
+    worktree.mkdir()
+    (worktree / ".git").write_text(f"gitdir: {git_dir}\n", encoding="utf-8")
+
+    assert lock_path(worktree / "CHANGELOG.md").parent == git_dir / "jaggers-locks"
+
+
+def test_lock_file_is_sidecar_outside_git(tmp_path, monkeypatch):
+    monkeypatch.setattr("scripts.changelog.changelog_model._git_dir", lambda directory: None)
+    assert lock_path(tmp_path / "CHANGELOG.md") == tmp_path.resolve() / ".CHANGELOG.md.lock"
@@ -1,8 +1,16 @@
+import json
+import subprocess
 import pytest
 from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
-from drift_detector import extract_tracks, match_files_to_tracks, format_scan_report
+import drift_detector
+from drift_detector import (
+    extract_tracks, match_files_to_tracks, format_scan_report, _match_glob,
+    load_drift_index, candidate_memories, get_drift_index_path,
+    get_head_sha, get_git_cache_path, get_recent_modified_files, get_session_written_files,
+    check_memories,
+)
 
 
 MEMORY_WITH_TRACKS = """---
@@ -78,3 +86,207 @@ def test_match_files_to_tracks_direct_child():
     tracks = ["hooks/**/*.py"]
     matched = match_files_to_tracks(files, tracks)
     assert "hooks/skill-suggestion.py" in matched
+
+
+def test_match_glob_trailing_double_star():
+    """dir/** matches the directory itself and anything below it"""
+    assert _match_glob("hooks", "hooks/**")
+    assert _match_glob("hooks/a/b/c.py", "hooks/**")
+    assert not _match_glob("hooksx/a.py", "hooks/**")
+
+
+def test_match_glob_wildcards_stay_in_segment():
+    """* and ? never cross a path separator"""
+    assert _match_glob("src/a.py", "src/*.py")
+    assert not _match_glob("src/sub/a.py", "src/*.py")
+    assert _match_glob("src/a.py", "src/?.py")
+    assert not _match_glob("src/ab/c.py", "src/ab?c.py")
+
+
+def test_match_glob_character_classes():
+    assert _match_glob("cli/a.ts", "cli/*.[jt]s")
+    assert not _match_glob("cli/a.cs", "cli/*.[jt]s")
+    assert _match_glob("cli/b.ts", "cli/[!a].ts")
+    assert not _match_glob("cli/a.ts", "cli/[!a].ts")
+
+
+def test_match_glob_character_class_edge_cases():
+    """Classes are read exactly as fnmatch reads them"""
+    # Reversed range is empty rather than a regex error
+    assert not _match_glob("a", "[z-a]")
+    assert _match_glob("x", "[z-ax]")
+    assert match_files_to_tracks(["a.py"], ["[z-a]*.py", "*.py"]) == ["a.py"]
+    # "]" right after "[" or "[!" is a member, not the end of the class
+    assert _match_glob("a", "[!]]")
+    assert not _match_glob("]", "[!]]")
+    assert _match_glob("]", "[]]")
+    # Unterminated class is a literal "["
+    assert _match_glob("[a", "[a")
+    # Negated classes and ranges spanning "/" still stay inside one segment
+    assert not _match_glob("a/b", "a[!x]b")
+    assert not _match_glob("a/b", "a[+-0]b")
+
+
+def _fnmatch_segments(path, pattern):
+    """Reference matcher: fnmatchcase per segment, ** spans whole segments."""
+    from fnmatch import fnmatchcase
+
+    def match(parts, pats):
+        if not pats:
+            return not parts
+        if pats[0] == "**":
+            return any(match(parts[i:], pats[1:]) for i in range(len(parts) + 1))
+        return bool(parts) and fnmatchcase(parts[0], pats[0]) and match(parts[1:], pats[1:])
+
+    return match(Path(path).as_posix().split("/"), Path(pattern).as_posix().split("/"))
+
+
+def test_match_glob_agrees_with_fnmatch_fuzz():
+    import random
+    rng = random.Random(7)
+    pattern_tokens = list("ab-z!]^[\\*?./&~|") + ["**/", "[!", "[a-", "[z-a]", "[!]]", "[]"]
+    path_chars = list("ab-z!]^[\\./&~|+0")
+    for _ in range(5000):
+        pattern = "".join(rng.choice(pattern_tokens) for _ in range(rng.randint(1, 7)))
+        path = "".join(rng.choice(path_chars) for _ in range(rng.randint(1, 6)))
+        if not path.strip("/") or not pattern.strip("/"):
+            continue
+        assert _match_glob(path, pattern) == _fnmatch_segments(path, pattern), (path, pattern)
+
+
+def test_match_files_to_tracks_preserves_order():
+    files = ["hooks/b.py", "docs/x.md", "hooks/a.py"]
+    assert match_files_to_tracks(files, ["hooks/*.py", "nothing/**"]) == ["hooks/b.py", "hooks/a.py"]
+
+
+def _write_memory(memories_dir, name, tracks):
+    track_lines = "".join(f'  - "{t}"\n' for t in tracks)
+    (memories_dir / f"{name}.md").write_text(
+        f"---\ntitle: {name}\nupdated: 2026-02-01\ntracks:\n{track_lines}---\n\n## Purpose\nTest.\n",
+        encoding="utf-8",
+    )
+
+
+def test_candidate_memories_uses_prefix_ext_and_wildcard_buckets(tmp_path):
+    memories_dir = tmp_path / ".serena" / "memories"
+    memories_dir.mkdir(parents=True)
+    _write_memory(memories_dir, "cli_ssot", ["cli/src/**/*.ts"])
+    _write_memory(memories_dir, "py_ssot", ["**/*.py"])
+    _write_memory(memories_dir, "any_ssot", ["**/README*"])
+    _write_memory(memories_dir, "config_ssot", ["config/settings.json"])
+
+    index = load_drift_index(tmp_path)
+    candidates = candidate_memories(index, ["cli/src/core/diff.ts", "hooks/a.py", "config/settings.json"])
+
+    assert candidates["cli_ssot"] == ["cli/src/core/diff.ts"]
+    assert candidates["py_ssot"] == ["hooks/a.py"]
+    assert candidates["config_ssot"] == ["config/settings.json"]
+    assert len(candidates["any_ssot"]) == 3
+
+
+def test_candidate_memories_matches_multi_dot_extensions(tmp_path):
+    """*.test.ts is bucketed under .test.ts; files must be looked up by every suffix"""
+    memories_dir = tmp_path / ".serena" / "memories"
+    memories_dir.mkdir(parents=True)
+    _write_memory(memories_dir, "tests_ssot", ["**/*.test.ts"])
+    _write_memory(memories_dir, "ts_ssot", ["**/*.ts"])
+    _write_memory(memories_dir, "archive_ssot", ["**/*.tar.gz"])
+
+    index = load_drift_index(tmp_path)
+    files = ["cli/src/diff.test.ts", "cli/src/diff.ts", "dist/v1.2.tar.gz", "a.b/c.gz"]
+    candidates = candidate_memories(index, files)
+
+    assert candidates["tests_ssot"] == ["cli/src/diff.test.ts"]
+    assert candidates["ts_ssot"] == ["cli/src/diff.test.ts", "cli/src/diff.ts"]
+    assert candidates["archive_ssot"] == ["dist/v1.2.tar.gz"]
+    # Candidates are a superset of real matches for every memory
+    for name, entry in index["memories"].items():
+        assert set(match_files_to_tracks(files, entry["tracks"])) <= set(candidates.get(name, []))
+
+
+def test_load_drift_index_reparses_only_changed_memories(tmp_path):
+    memories_dir = tmp_path / ".serena" / "memories"
+    memories_dir.mkdir(parents=True)
+    _write_memory(memories_dir, "a_ssot", ["hooks/**"])
+    _write_memory(memories_dir, "b_ssot", ["cli/**"])
+    load_drift_index(tmp_path)
+    assert get_drift_index_path(tmp_path).exists()
+
+    _write_memory(memories_dir, "b_ssot", ["docs/api/**"])
+    (memories_dir / "a_ssot.md").unlink()
+    index = load_drift_index(tmp_path)
+
+    assert set(index["memories"]) == {"b_ssot"}
+    assert index["memories"]["b_ssot"]["tracks"] == ["docs/api/**"]
+    assert index["buckets"]["prefix"] == {"docs/api/": ["b_ssot"]}
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def _init_repo(root):
+    _git(root, "init", "-q")
+    _git(root, "config", "user.email", "t@example.com")
+    _git(root, "config", "user.name", "t")
+    (root / "a.py").write_text("a\n", encoding="utf-8")
+    (root / "old name.md").write_text("x\n", encoding="utf-8")
+    _git(root, "add", ".")
+    _git(root, "commit", "-q", "-m", "init")
+
+
+def test_get_session_written_files_parses_porcelain_v2(tmp_path):
+    _init_repo(tmp_path)
+    (tmp_path / "a.py").write_text("b\n", encoding="utf-8")
+    _git(tmp_path, "mv", "old name.md", "new name.md")
+    (tmp_path / "untracked.txt").write_text("u\n", encoding="utf-8")
+
+    assert sorted(get_session_written_files(tmp_path)) == ["a.py", "new name.md"]
+
+
+def test_get_recent_modified_files_cached_per_head(tmp_path, monkeypatch):
+    _init_repo(tmp_path)
+    head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=tmp_path,
+                          capture_output=True, text=True).stdout.strip()
+    assert get_head_sha(tmp_path) == head
+
+    files = get_recent_modified_files(tmp_path, 5)
+    assert sorted(files) == ["a.py", "old name.md"]
+    assert json.loads(get_git_cache_path(tmp_path).read_text())["head"] == head
+
+    # Same HEAD: answered from cache without running git
+    monkeypatch.setattr(subprocess, "run", lambda *a, **k: pytest.fail("git called"))
+    assert get_recent_modified_files(tmp_path, 5) == files
+    monkeypatch.undo()
+
+    (tmp_path / "b.py").write_text("b\n", encoding="utf-8")
+    _git(tmp_path, "add", "b.py")
+    _git(tmp_path, "commit", "-q", "-m", "second")
+    assert get_recent_modified_files(tmp_path, 1) == ["b.py"]
+
+
+def test_check_memories_expands_globs_and_shares_modified_set(tmp_path, monkeypatch):
+    memories_dir = tmp_path / ".serena" / "memories"
+    memories_dir.mkdir(parents=True)
+    _write_memory(memories_dir, "cli_ssot", ["cli/**"])
+    _write_memory(memories_dir, "cli_core_ssot", ["cli/core/**"])
+    _write_memory(memories_dir, "hooks_ssot", ["hooks/**"])
+    (memories_dir / "plain.md").write_text("---\ntitle: plain\n---\n", encoding="utf-8")
+
+    calls = []
+    def fake_recent(root, n):
+        calls.append(n)
+        return ["cli/main.ts"]
+    monkeypatch.setattr(drift_detector, "get_recent_modified_files", fake_recent)
+
+    results = check_memories(tmp_path, ["cli_*", "hooks_ssot", "plain", "nope", "cli_ssot"], 7)
+
+    assert [(r["memory"], r["status"]) for r in results] == [
+        ("cli_core_ssot", "ok"),
+        ("cli_ssot", "stale"),
+        ("hooks_ssot", "ok"),
+        ("plain", "no_tracks"),
+        ("nope", "missing"),
+    ]
+    assert results[1]["matched"] == ["cli/main.ts"]
+    assert calls == [7]
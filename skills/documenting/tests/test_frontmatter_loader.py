@@ -0,0 +1,90 @@
+import json
+import os
+import pytest
+from datetime import date
+from pathlib import Path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import frontmatter_loader
+from frontmatter_loader import (
+    FrontmatterCache, get_cache_path, parse_frontmatter, read_frontmatter_block, split_frontmatter,
+)
+
+
+MEMORY = """---
+title: Test SSOT
+updated: 2026-02-01
+tracks:
+  - "cli/**"
+---
+
+## Purpose
+Test memory.
+"""
+
+
+@pytest.fixture
+def memory(tmp_path):
+    memories_dir = tmp_path / ".serena" / "memories"
+    memories_dir.mkdir(parents=True)
+    path = memories_dir / "test_ssot.md"
+    path.write_text(MEMORY, encoding="utf-8")
+    return path
+
+
+def test_parse_frontmatter_reports_errors():
+    assert parse_frontmatter("no frontmatter") == (None, None)
+    data, error = parse_frontmatter("---\ntitle: [unclosed\n---\n")
+    assert data is None and error
+
+
+@pytest.mark.parametrize("content", [
+    MEMORY,
+    "no frontmatter\n---\ntitle: x\n---\n",
+    "---\n---\ntitle: x\n---\nbody\n",
+    "---\n\n---\nbody\n---\n",
+    "---\ntitle: x\n---",
+    "---\ntitle: unclosed\n",
+])
+def test_read_frontmatter_block_matches_full_read(tmp_path, content):
+    path = tmp_path / "test_ssot.md"
+    path.write_text(content + "## Body\n" * 1000, encoding="utf-8")
+    block = read_frontmatter_block(path)
+    assert split_frontmatter(block) == split_frontmatter(path.read_text(encoding="utf-8"))
+    if "\n---\n" in content or not content.startswith("---\n"):
+        assert len(block) < len(MEMORY)  # Never reads past the closing marker
+
+
+def test_cache_round_trips_dates_and_skips_reparse(memory, monkeypatch):
+    cache_path = get_cache_path(memory)
+    assert cache_path == memory.parent.parent / "cache" / "frontmatter.json"
+
+    cache = FrontmatterCache(cache_path)
+    data, error = cache.load(memory)
+    assert error is None
+    assert data == {"title": "Test SSOT", "updated": date(2026, 2, 1), "tracks": ["cli/**"]}
+    cache.save()
+    assert json.loads(cache_path.read_text())["version"] == frontmatter_loader.CACHE_VERSION
+
+    monkeypatch.setattr(frontmatter_loader, "parse_frontmatter", lambda c: pytest.fail("re-parsed"))
+    assert FrontmatterCache(cache_path).load(memory) == (data, None)
+
+    # Body-only edits keep the cached frontmatter valid
+    memory.write_text(MEMORY + "\n## More\nText.\n", encoding="utf-8")
+    assert FrontmatterCache(cache_path).load(memory) == (data, None)
+
+
+def test_cache_reparses_changed_frontmatter(memory):
+    cache = FrontmatterCache(get_cache_path(memory))
+    cache.load(memory)
+    memory.write_text(MEMORY.replace("Test SSOT", "Renamed"), encoding="utf-8")
+    os.utime(memory, ns=(1, 1))
+    data, _ = cache.load(memory)
+    assert data["title"] == "Renamed"
+
+
+def test_uncacheable_values_are_not_persisted(memory):
+    memory.write_text("---\n1: one\n---\n", encoding="utf-8")
+    cache = FrontmatterCache(get_cache_path(memory))
+    assert cache.load(memory) == ({1: "one"}, None)
+    assert cache.entries == {}
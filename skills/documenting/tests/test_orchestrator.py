@@ -3,7 +3,10 @@
 
 import pytest
 from pathlib import Path
-from scripts.orchestrator import DocumentingOrchestrator, ChangeType
+import subprocess
+from scripts.orchestrator import (
+    DocumentingOrchestrator, ChangeType, DocWorkspace, classify_commit, read_git_changes,
+)
 
 
 def test_orchestrator_routes_to_correct_docs(tmp_path):
@@ -50,3 +53,112 @@ def test_orchestrator_validates_all_docs():
     """Orchestrator should validate all documentation after updates."""
     # Test validation integration
     pass
+
+
+CHANGELOG = """# Changelog
+
+The format is based on [Keep a Changelog](https://keepachangelog.com/en/1.0.0/),
+and this project adheres to [Semantic Versioning](https://semver.org/spec/v2.0.0.html).
+
+## [Unreleased]
+
+## [0.1.0] - 2026-02-01
+
+### Added
+- Initial release
+"""
+
+
+def test_document_change_reads_and_writes_each_file_once(tmp_path, monkeypatch):
+    """The CHANGELOG is read once, validated in memory and written once."""
+    (tmp_path / "CHANGELOG.md").write_text(CHANGELOG, encoding="utf-8")
+    (tmp_path / "CLAUDE.md").write_text("# Claude\n", encoding="utf-8")
+
+    reads, writes = [], []
+    original_read = Path.read_text
+    monkeypatch.setattr(Path, "read_text", lambda self, *a, **k: reads.append(self.name) or original_read(self, *a, **k))
+    import scripts.changelog.changelog_model as model
+    original_write = model.write_text_atomic
+    monkeypatch.setattr(model, "write_text_atomic", lambda path, text: writes.append(path.name) or original_write(path, text))
+
+    result = DocumentingOrchestrator(tmp_path).document_change(
+        ChangeType.FEATURE, "Add search", {"files_changed": ["requirements.txt"]}
+    )
+
+    assert result["changelog_updated"] is True
+    assert result["validation_errors"] == []
+    assert result["claude_suggestions"] == [
+        "Review ## Architecture section for: Add search",
+        "Update ## Development Environment section",
+    ]
+    assert reads == ["CHANGELOG.md"]
+    assert writes == ["CHANGELOG.md"]
+    assert "### Added\n- Add search\n" in (tmp_path / "CHANGELOG.md").read_text(encoding="utf-8")
+
+
+def test_document_change_reports_invalid_changelog_without_writing(tmp_path):
+    changelog = tmp_path / "CHANGELOG.md"
+    changelog.write_text("# Changelog\n\n## [0.1.0] - 2026-02-01\n", encoding="utf-8")
+
+    result = DocumentingOrchestrator(tmp_path).document_change(ChangeType.BUGFIX, "Fix crash")
+
+    assert result["changelog_updated"] is False
+    assert "CHANGELOG update failed: CHANGELOG missing [Unreleased] section" in result["validation_errors"]
+    assert changelog.read_text(encoding="utf-8") == "# Changelog\n\n## [0.1.0] - 2026-02-01\n"
+
+
+def test_workspace_commit_replays_edits_on_external_change(tmp_path):
+    path = tmp_path / "CHANGELOG.md"
+    path.write_text("## [Unreleased]\n\n### Fixed\n- A\n", encoding="utf-8")
+    workspace = DocWorkspace()
+    workspace.edit(path, lambda text: text + "- B\n")
+
+    path.write_text("## [Unreleased]\n\n### Fixed\n- A\n- Elsewhere\n", encoding="utf-8")
+    workspace.commit()
+
+    assert path.read_text(encoding="utf-8") == "## [Unreleased]\n\n### Fixed\n- A\n- Elsewhere\n- B\n"
+
+
+@pytest.mark.parametrize("subject, body, expected", [
+    ("feat(api): add search endpoint", "", (ChangeType.FEATURE, "Add search endpoint", {"scope": "api"})),
+    ("fix!: drop legacy flag", "", (ChangeType.BREAKING, "Drop legacy flag", {"breaking": True})),
+    ("refactor: split parser", "BREAKING CHANGE: new API", (ChangeType.BREAKING, "Split parser", {"breaking": True})),
+    ("docs: explain tracks", "", (ChangeType.DOCS, "Explain tracks", {})),
+    ("[user-1] Add batch mode", "", (ChangeType.FEATURE, "Add batch mode", {})),
+    ("Fixed crash on empty input", "", (ChangeType.BUGFIX, "Fixed crash on empty input", {})),
+    ("Bump version", "", (ChangeType.CHORE, "Bump version", {})),
+])
+def test_classify_commit(subject, body, expected):
+    assert classify_commit(subject, body) == expected
+
+
+def test_document_changes_from_git_range(tmp_path):
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+    git("init", "-q")
+    git("config", "user.email", "t@example.com")
+    git("config", "user.name", "t")
+    (tmp_path / "CHANGELOG.md").write_text(CHANGELOG, encoding="utf-8")
+    git("add", ".")
+    git("commit", "-q", "-m", "chore: initial")
+    for subject in ["feat: add export", "fix: handle empty list", "Merge-free chore", "feat: add import"]:
+        git("commit", "-q", "--allow-empty", "-m", subject)
+
+    changes = read_git_changes(tmp_path, "HEAD~4..HEAD")
+    assert [c[1] for c in changes] == ["Add export", "Handle empty list", "Merge-free chore", "Add import"]
+
+    result = DocumentingOrchestrator(tmp_path).document_changes(changes)
+
+    assert result["changelog_entries"] == 4
+    assert result["validation_errors"] == []
+    assert result["readme_suggestions"] == [
+        "Consider adding to ## Features section: Add export",
+        "Consider adding to ## Features section: Add import",
+    ]
+    content = (tmp_path / "CHANGELOG.md").read_text(encoding="utf-8")
+    assert "## [Unreleased]\n\n### Added\n- Add export\n- Add import\n\n### Changed\n- Merge-free chore\n\n" \
+           "### Fixed\n- Handle empty list\n\n## [0.1.0]" in content
+
+    with pytest.raises(ValueError, match="git log"):
+        read_git_changes(tmp_path, "no-such-ref..HEAD")
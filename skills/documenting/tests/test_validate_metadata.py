@@ -2,7 +2,13 @@ import pytest
 from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
-from validate_metadata import extract_headings, generate_index_table, inject_index
+import validate_metadata
+from validate_metadata import (
+    extract_headings, generate_index_table, inject_index,
+    collect_memory_files, validate_batch, summarize,
+    refresh_index, index_fingerprint, heading_fingerprint,
+    extract_headings_from_file,
+)
 
 
 SAMPLE = """---
@@ -62,3 +68,102 @@ def test_inject_index_adds_when_missing():
     result = inject_index(content, new_table)
     assert "<!-- INDEX:" in result
     assert "| [Foo](#foo) | Bar baz. |" in result
+
+
+VALID_MEMORY = """---
+title: Valid
+version: 1.0.0
+updated: 2026-02-24
+scope: test
+category: ssot
+subcategory: test
+domain: [test]
+changelog: []
+---
+
+## Purpose
+Does things.
+"""
+
+
+def _memory_tree(tmp_path):
+    memories = tmp_path / ".serena" / "memories"
+    (memories / "nested").mkdir(parents=True)
+    (memories / "good_ssot.md").write_text(VALID_MEMORY, encoding="utf-8")
+    (memories / "nested" / "other_ssot.md").write_text(VALID_MEMORY, encoding="utf-8")
+    (memories / "bad_ssot.md").write_text("---\ntitle: [bad\n---\n", encoding="utf-8")
+    return memories
+
+
+def test_collect_memory_files_expands_dirs_and_globs(tmp_path):
+    memories = _memory_tree(tmp_path)
+    files = collect_memory_files([str(memories), str(memories / "good_*.md")])
+    assert sorted(f.name for f in files) == ["bad_ssot.md", "good_ssot.md", "other_ssot.md"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_batch_aggregates_results(tmp_path, monkeypatch, jobs):
+    monkeypatch.setattr(validate_metadata, "PARALLEL_MIN_FILES", 1)
+    memories = _memory_tree(tmp_path)
+    results = validate_batch(collect_memory_files([str(memories)]), jobs=jobs)
+
+    by_name = {Path(r["file"]).name: r for r in results}
+    assert by_name["good_ssot.md"]["valid"] and by_name["good_ssot.md"]["index_regenerated"]
+    assert not by_name["bad_ssot.md"]["valid"]
+    assert by_name["bad_ssot.md"]["yaml_error"]
+    assert summarize(results) == {
+        "files": 3, "valid": 2, "invalid": 1, "with_warnings": 0, "index_regenerated": 2,
+    }
+    assert "<!-- INDEX:" in (memories / "good_ssot.md").read_text(encoding="utf-8")
+
+
+def test_refresh_index_skips_unchanged_headings(tmp_path):
+    path = tmp_path / "good_ssot.md"
+    path.write_text(VALID_MEMORY, encoding="utf-8")
+    assert refresh_index(path)
+
+    content = path.read_text(encoding="utf-8")
+    assert index_fingerprint(content) == heading_fingerprint([("Purpose", "Does things")])
+    mtime = path.stat().st_mtime_ns
+    assert not refresh_index(path)
+    assert path.stat().st_mtime_ns == mtime
+
+    # Body edits outside the indexed structure do not rewrite the file
+    path.write_text(content + "\nMore detail.\n", encoding="utf-8")
+    assert not refresh_index(path)
+
+    path.write_text(content.replace("Does things", "Does other things"), encoding="utf-8")
+    assert refresh_index(path)
+    assert "Does other things |" in path.read_text(encoding="utf-8")
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_check_memory_streams_up_to_date_files(tmp_path, monkeypatch):
+    path = tmp_path / "good_ssot.md"
+    path.write_text(VALID_MEMORY + "".join(f"\n## Part {i}\nBody {i}.\n" for i in range(200)), encoding="utf-8")
+    assert validate_metadata.check_memory(path)["index_regenerated"]
+
+    # Frontmatter is cached and the INDEX is current: nothing reads the file whole
+    monkeypatch.setattr(Path, "read_text", lambda *a, **k: pytest.fail("file read whole"))
+    result = validate_metadata.check_memory(path)
+    assert result["valid"] and not result["index_regenerated"]
+
+
+def test_extract_headings_tracks_fences_per_heading(tmp_path):
+    content = (
+        "## First\n"
+        "```\n"
+        "## Second\n"
+        "code. inside\n"
+        "```\n"
+        "- list\n"
+        "Shared text. More.\n"
+        "## Empty\n"
+    )
+    # "Second" starts its own fence count inside First's fence, so it sees "code" first
+    expected = [("First", "Shared text"), ("Second", "code"), ("Empty", "")]
+    assert extract_headings(content) == expected
+
+    path = tmp_path / "big_ssot.md"
+    path.write_text(content, encoding="utf-8")
+    assert extract_headings_from_file(path) == expected
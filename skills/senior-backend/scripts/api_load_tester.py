@@ -1,81 +1,1579 @@
 #!/usr/bin/env python3
 """
 Api Load Tester
-Automated tool for senior backend tasks
+HTTP load generator for backend services.
+
+Requests are issued by an asyncio engine over keep-alive HTTP/1.1
+connections, in one of two modes:
+
+  closed loop  (default) --concurrency connections each send the next request
+               as soon as the previous response arrives
+  open loop    --rate requests/s are started on a fixed timetable, however
+               slowly responses come back, using up to --concurrency
+               connections from a shared pool
+
+The run starts with an optional --ramp, during which the rate (or the number of
+active connections) rises linearly from zero, then a --warmup at full load.
+Neither is measured; statistics cover only the following --duration seconds.
+
+Instead of a single URL, --scenario loads a YAML or JSON file of weighted
+endpoints with headers, templated bodies and think times (see
+compile_scenario). Every variant is encoded to bytes before the run starts.
+
+Every run is recorded in a SQLite store (--db, default
+.jaggers/cache/load-tests.db under the project root) under a hash of the requests and load shape. `api_load_tester.py compare`
+checks the latest run against a baseline of the same scenario and exits with
+REGRESSION_EXIT_CODE when throughput, p99 latency or error rate got
+significantly worse.
+
+Any HTTP server can stand in as a target, e.g. `python -m http.server 8000`.
 """
 
 import os
 import sys
+import re
 import json
+import math
+import time
+import queue
+import random
+import sqlite3
+import hashlib
+import itertools
+import socket
+import ssl
+import asyncio
 import argparse
+import multiprocessing
+from array import array
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+try:
+    import yaml
+except ImportError:  # JSON scenarios still work without PyYAML
+    yaml = None
+
+USER_AGENT = "api-load-tester/1.0"
+
+# Share of failed requests above which the report flags the run
+ERROR_RATE_WARNING = 0.01
+# Achieved/target rate below which an open-loop run is flagged as saturated
+SATURATION_WARNING = 0.9
+
+# Seconds between live statistics updates
+REPORT_INTERVAL = 1.0
+# Seconds --workers processes get to start up and report ready
+WORKER_STARTUP_TIMEOUT = 30.0
+
+# ${name} placeholders in scenario paths, headers and bodies
+TEMPLATE_RE = re.compile(r"\$\{(\w+)\}")
+# Upper bound on compiled variants per endpoint (product of its variables' values)
+MAX_VARIANTS = 10000
+# Minimum length of the weighted endpoint order the engine cycles through
+DECK_SIZE = 4096
+
+# Results store, relative to the project root (see default_db_path)
+DEFAULT_DB = Path(".jaggers") / "cache" / "load-tests.db"
+# `compare` exit status when a regression is detected (1 is used for errors)
+REGRESSION_EXIT_CODE = 3
+
+
+class Target:
+    """Parsed http(s) URL of the endpoint under test."""
+
+    __slots__ = ("url", "scheme", "host", "port", "path", "host_header", "ssl")
+
+    def __init__(self, url: str, insecure: bool = False):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Target must be an http:// or https:// URL: {url}")
+        self.url = url
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.path = parts.path or "/"
+        if parts.query:
+            self.path += "?" + parts.query
+        self.host_header = parts.netloc.rpartition("@")[2]
+        self.ssl = None
+        if parts.scheme == "https":
+            self.ssl = ssl.create_default_context()
+            if insecure:
+                self.ssl.check_hostname = False
+                self.ssl.verify_mode = ssl.CERT_NONE
+
+
+def build_request(
+    target: Target,
+    method: str,
+    headers: Dict[str, str],
+    body: Optional[bytes],
+    path: Optional[str] = None,
+) -> bytes:
+    """Encode one complete HTTP/1.1 request; it is built once and resent as-is."""
+    merged = {"User-Agent": USER_AGENT, "Accept": "*/*"}
+    given = {name.lower() for name in headers}
+    merged = {name: value for name, value in merged.items() if name.lower() not in given}
+    merged.update(headers)
+    if body is not None and "content-length" not in given:
+        merged["Content-Length"] = str(len(body))
+    lines = [f"{method} {path or target.path} HTTP/1.1", f"Host: {target.host_header}"]
+    lines.extend(f"{name}: {value}" for name, value in merged.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b"")
+
+
+class CompiledRequest:
+    """One fully encoded request variant of a scenario endpoint."""
+
+    __slots__ = ("name", "raw", "head_only", "think_time")
+
+    def __init__(self, name: str, raw: bytes, head_only: bool = False, think_time: float = 0.0):
+        self.name = name
+        self.raw = raw
+        self.head_only = head_only
+        self.think_time = think_time
+
+
+class RequestPlan:
+    """Compiled requests and the weighted order in which to send them.
+
+    groups lists, per endpoint, the indexes of its variants in requests. deck
+    holds endpoint indexes in proportion to their weights, shuffled once;
+    engines cycle through it and send each endpoint's variants in turn, so
+    sending a request never formats or encodes anything.
+    """
+
+    def __init__(self, requests: List[CompiledRequest], deck: List[int], groups: Optional[List[List[int]]] = None):
+        self.requests = requests
+        self.deck = deck
+        self.groups = groups if groups is not None else [[index] for index in range(len(requests))]
+        self.endpoints = len(self.groups)
+
+    @classmethod
+    def single(cls, name: str, raw: bytes, head_only: bool = False) -> "RequestPlan":
+        return cls([CompiledRequest(name, raw, head_only)], [0])
+
+    def digest(self, *load_shape) -> str:
+        """Scenario hash: the exact requests, their order, and the load shape."""
+        h = hashlib.sha256()
+        for request in self.requests:
+            h.update(len(request.raw).to_bytes(8, "big"))
+            h.update(request.raw)
+            h.update(repr(request.think_time).encode())
+        h.update(json.dumps([self.deck, self.groups, list(load_shape)]).encode())
+        return h.hexdigest()[:16]
+
+    def cursor(self, offset: int = 0) -> Iterator[CompiledRequest]:
+        """Endless iterator over the deck, starting offset entries (and as far into each endpoint's variants) in."""
+        offset %= len(self.deck)
+        order = self.deck[offset:] + self.deck[:offset]
+        if all(len(group) == 1 for group in self.groups):
+            return itertools.cycle([self.requests[self.groups[index][0]] for index in order])
+        variants = []
+        for group in self.groups:
+            start = offset * len(group) // len(self.deck)
+            variants.append(itertools.cycle([self.requests[index] for index in group[start:] + group[:start]]))
+        return (next(variants[index]) for index in itertools.cycle(order))
+
+
+def load_scenario(path: Path) -> Dict:
+    """Read a scenario from .yaml/.yml (needs PyYAML) or .json."""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml"):
+        if yaml is None:
+            raise ValueError("PyYAML is required for YAML scenarios (pip install pyyaml)")
+        scenario = yaml.safe_load(text)
+    else:
+        scenario = json.loads(text)
+    if not isinstance(scenario, dict) or not isinstance(scenario.get("endpoints"), list) \
+            or not scenario["endpoints"]:
+        raise ValueError(f"{path}: scenario needs a non-empty 'endpoints' list")
+    return scenario
+
+
+def _template_names(value) -> set:
+    """Variable names referenced by ${...} anywhere in value."""
+    if isinstance(value, str):
+        return set(TEMPLATE_RE.findall(value))
+    if isinstance(value, dict):
+        return set().union(set(), *(_template_names(k) | _template_names(v) for k, v in value.items()))
+    if isinstance(value, list):
+        return set().union(set(), *(_template_names(v) for v in value))
+    return set()
+
+
+def _render(value, bindings: Dict):
+    """Substitute bindings into value; a string that is just "${name}" takes the value's own type."""
+    if isinstance(value, str):
+        whole = TEMPLATE_RE.fullmatch(value)
+        if whole:
+            return bindings[whole.group(1)]
+        return TEMPLATE_RE.sub(lambda m: str(bindings[m.group(1)]), value)
+    if isinstance(value, dict):
+        return {str(_render(k, bindings)): _render(v, bindings) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_render(v, bindings) for v in value]
+    return value
+
+
+def compile_scenario(scenario: Dict, target: Target, extra_headers: Optional[Dict[str, str]] = None) -> RequestPlan:
+    """
+    Encode every request a scenario can send.
+
+    Scenario keys:
+        base_url    default target URL; endpoint paths are relative to its path
+        headers     headers for every endpoint
+        variables   name -> value, or list of values (one variant per value)
+        think_time  default pause in seconds after each request (closed loop)
+        seed        seed for the weighted request order (default 0)
+        endpoints   list of {name, method, path, weight, headers, body, think_time}
+
+    ${name} in a path, header or body is replaced by a variable. An endpoint
+    gets one variant per combination of the variables it uses, sent in turn
+    whenever the endpoint comes up. Mapping and list bodies are sent as JSON.
+    """
+    variables = scenario.get("variables") or {}
+    default_headers = {**(scenario.get("headers") or {}), **(extra_headers or {})}
+    default_think = float(scenario.get("think_time", 0))
+    base_path = urlsplit(target.url).path.rstrip("/")
+
+    requests: List[CompiledRequest] = []
+    groups: List[List[int]] = []
+    weights: List[float] = []
+    for number, endpoint in enumerate(scenario["endpoints"], 1):
+        if not isinstance(endpoint, dict):
+            raise ValueError(f"Endpoint {number} must be a mapping")
+        method = str(endpoint.get("method", "GET")).upper()
+        path = str(endpoint.get("path", "/"))
+        name = str(endpoint.get("name") or f"{method} {path}")
+        weight = float(endpoint.get("weight", 1))
+        if weight <= 0:
+            raise ValueError(f"Endpoint {name!r}: weight must be positive")
+        think_time = float(endpoint.get("think_time", default_think))
+        headers = {**default_headers, **(endpoint.get("headers") or {})}
+        body = endpoint.get("body")
+        if isinstance(body, (dict, list)) and not any(h.lower() == "content-type" for h in headers):
+            headers["Content-Type"] = "application/json"
+
+        used = sorted(_template_names([path, headers, body]))
+        missing = [n for n in used if n not in variables]
+        if missing:
+            raise ValueError(f"Endpoint {name!r}: undefined variable(s) {', '.join(missing)}")
+        choices = [v if isinstance(v, list) else [v] for v in (variables[n] for n in used)]
+        variants = math.prod(len(c) for c in choices)
+        if variants == 0:
+            raise ValueError(f"Endpoint {name!r}: a variable it uses has no values")
+        if variants > MAX_VARIANTS:
+            raise ValueError(f"Endpoint {name!r}: {variants} variants exceed the limit of {MAX_VARIANTS}")
+
+        groups.append(list(range(len(requests), len(requests) + variants)))
+        weights.append(weight)
+        for combo in itertools.product(*choices):
+            bindings = dict(zip(used, combo))
+            path_bindings = {k: quote(str(v), safe="") for k, v in bindings.items()}
+            rendered = TEMPLATE_RE.sub(lambda m: path_bindings[m.group(1)], path)
+            if isinstance(body, (dict, list)):
+                payload = json.dumps(_render(body, bindings), separators=(",", ":")).encode("utf-8")
+            elif body is not None:
+                payload = str(_render(body, bindings)).encode("utf-8")
+            else:
+                payload = None
+            raw = build_request(
+                target,
+                method,
+                {k: str(_render(v, bindings)) for k, v in headers.items()},
+                payload,
+                path=base_path + "/" + rendered.lstrip("/"),
+            )
+            requests.append(CompiledRequest(name, raw, method == "HEAD", think_time))
+
+    # Deck slots per endpoint in exact proportion to the weights (largest remainder), then shuffled
+    size = max(DECK_SIZE, len(groups))
+    total = sum(weights)
+    quotas = [w / total * size for w in weights]
+    counts = [int(q) for q in quotas]
+    by_remainder = sorted(range(len(quotas)), key=lambda i: counts[i] - quotas[i])
+    for index in by_remainder[:size - sum(counts)]:
+        counts[index] += 1
+    starved = [requests[groups[index][0]].name for index, count in enumerate(counts) if not count]
+    if starved:
+        raise ValueError(f"Endpoint(s) {', '.join(map(repr, starved))}: weight too small to ever be sent "
+                         f"(below 1/{size} of the total)")
+    deck = [index for index, count in enumerate(counts) for _ in range(count)]
+    random.Random(scenario.get("seed", 0)).shuffle(deck)
+    return RequestPlan(requests, deck, groups)
+
+
+def parse_response_head(head: bytes) -> Tuple[int, Optional[int], bool, bool]:
+    """Return (status, content_length, chunked, keep_alive) from a response head."""
+    lines = head.split(b"\r\n")
+    version, status = lines[0].split(b" ", 2)[:2]
+    length = None
+    chunked = False
+    connection = b""
+    for line in lines[1:]:
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name == b"content-length":
+            length = int(value)
+        elif name == b"transfer-encoding":
+            chunked = b"chunked" in value.lower()
+        elif name == b"connection":
+            connection = value.strip().lower()
+    if version == b"HTTP/1.1":
+        keep_alive = connection != b"close"
+    else:
+        keep_alive = connection == b"keep-alive"
+    return int(status), length, chunked, keep_alive
+
+
+class HttpConnection:
+    """A keep-alive connection that reopens itself after the server closes it."""
+
+    def __init__(self, target: Target):
+        self.target = target
+        self.reader = None
+        self.writer = None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def request(self, raw: bytes, head_only: bool = False) -> Tuple[int, int]:
+        """Send raw and read the full response; returns (status, body_bytes)."""
+        reused = self.writer is not None
+        if not reused:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.target.host, self.target.port, ssl=self.target.ssl
+            )
+        self.writer.write(raw)
+        try:
+            head = await self.reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if reused and not e.partial:
+                # Idle keep-alive connection closed by the server: retry once on a fresh one
+                self.close()
+                return await self.request(raw, head_only)
+            raise
+
+        status, length, chunked, keep_alive = parse_response_head(head)
+        received = 0
+        if head_only or status < 200 or status in (204, 304):
+            pass
+        elif chunked:
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if size == 0:
+                    while await self.reader.readuntil(b"\r\n") != b"\r\n":
+                        pass  # Trailers
+                    break
+                received += len(await self.reader.readexactly(size + 2)) - 2
+        elif length is not None:
+            received = len(await self.reader.readexactly(length))
+        else:
+            received = len(await self.reader.read())
+            keep_alive = False
+
+        if not keep_alive:
+            self.close()
+        return status, received
+
+
+class ConnectionPool:
+    """Up to size connections, opened on demand and reused most-recent first."""
+
+    def __init__(self, target: Target, size: int):
+        self.target = target
+        self.idle = asyncio.LifoQueue()
+        self.created = 0
+        self.size = size
+        self.connections: List[HttpConnection] = []
+
+    async def get(self) -> HttpConnection:
+        if self.idle.empty() and self.created < self.size:
+            self.created += 1
+            conn = HttpConnection(self.target)
+            self.connections.append(conn)
+            return conn
+        return await self.idle.get()
+
+    def put(self, conn: HttpConnection):
+        self.idle.put_nowait(conn)
+
+    def close(self):
+        for conn in self.connections:
+            conn.close()
+
+
+def error_kind(exc: BaseException) -> str:
+    """Short label used to group failed requests in the report."""
+    if isinstance(exc, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(exc, (ConnectionRefusedError, socket.gaierror)):
+        return "connect"
+    if isinstance(exc, (asyncio.IncompleteReadError, ConnectionError)):
+        return "disconnect"
+    if isinstance(exc, (ValueError, IndexError, asyncio.LimitOverrunError)):
+        return "protocol"
+    return "socket"
+
+
+# Histogram layout: values below 2**SUB_BUCKET_BITS µs get one bucket each; every
+# higher power of two is split into 2**(SUB_BUCKET_BITS - 1) equal buckets
+SUB_BUCKET_BITS = 8
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_BUCKETS = SUB_BUCKETS >> 1
+MAX_EXPONENT = 28  # Values up to 2**36 µs (~19 hours); larger ones share the top bucket
+HISTOGRAM_BUCKETS = SUB_BUCKETS + MAX_EXPONENT * HALF_BUCKETS
+
+REPORT_PERCENTILES = (50, 90, 99, 99.9)
+
+
+def _bucket_index(value: int) -> int:
+    if value < SUB_BUCKETS:
+        return value
+    exponent = value.bit_length() - SUB_BUCKET_BITS
+    if exponent > MAX_EXPONENT:
+        return HISTOGRAM_BUCKETS - 1
+    return exponent * HALF_BUCKETS + (value >> exponent)
+
+
+def _bucket_high(index: int) -> int:
+    """Largest value that falls into bucket index."""
+    if index < SUB_BUCKETS:
+        return index
+    exponent = (index - SUB_BUCKETS) // HALF_BUCKETS + 1
+    return ((index - exponent * HALF_BUCKETS + 1) << exponent) - 1
+
+
+class LatencyHistogram:
+    """Fixed-size log-linear histogram of latencies, in whole microseconds.
+
+    Same bucket layout as HdrHistogram with two significant digits: any value
+    is reported within 1/128 of what was recorded, and memory stays at
+    HISTOGRAM_BUCKETS counters (~30 KB) however many values are recorded.
+    Histograms of the same layout merge by adding counts.
+    """
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * HISTOGRAM_BUCKETS))
+        self.total = 0
+        self.sum = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, seconds: float):
+        value = max(0, int(seconds * 1_000_000))
+        self.counts[_bucket_index(value)] += 1
+        if not self.total or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.total += 1
+        self.sum += value
+
+    def merge(self, other: "LatencyHistogram"):
+        if not other.total:
+            return
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        self.min = other.min if not self.total else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.total += other.total
+        self.sum += other.sum
+
+    def __getstate__(self):
+        # Sparse, so per-interval deltas sent between processes stay small
+        sparse = {index: count for index, count in enumerate(self.counts) if count}
+        return sparse, self.total, self.sum, self.min, self.max
+
+    def __setstate__(self, state):
+        sparse, self.total, self.sum, self.min, self.max = state
+        self.counts = array("Q", bytes(8 * HISTOGRAM_BUCKETS))
+        for index, count in sparse.items():
+            self.counts[index] = count
+
+    def to_dict(self) -> Dict:
+        sparse, total, total_sum, low, high = self.__getstate__()
+        return {'counts': {str(k): v for k, v in sparse.items()}, 'total': total,
+                'sum': total_sum, 'min': low, 'max': high}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        histogram = cls.__new__(cls)
+        histogram.__setstate__((
+            {int(k): v for k, v in data['counts'].items()},
+            data['total'], data['sum'], data['min'], data['max'],
+        ))
+        return histogram
+
+    def percentile(self, q: float) -> int:
+        """Nearest-rank percentile in µs (the highest value of its bucket, capped at max)."""
+        if not self.total:
+            return 0
+        rank = max(1, math.ceil(q / 100 * self.total))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return max(self.min, min(_bucket_high(index), self.max))
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """min/mean/percentiles/max in milliseconds, for reports."""
+        summary = {
+            'min': self.min / 1000,
+            'mean': round(self.sum / self.total / 1000, 3) if self.total else 0.0,
+        }
+        for q in REPORT_PERCENTILES:
+            summary[f'p{q:g}'] = self.percentile(q) / 1000
+        summary['max'] = self.max / 1000
+        return summary
+
+
+class RunStats:
+    """Counters and latency histograms of the measured requests.
+
+    latency runs from the request's scheduled start, so in open-loop mode it
+    includes time spent waiting behind a saturated service or connection
+    pool (coordinated-omission correction); service_time runs from when the
+    request was actually written. In closed-loop mode the two are the same.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.errors: Dict[str, int] = {}
+        self.status_codes: Dict[int, int] = {}
+        self.bytes_received = 0
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.last_done = 0.0  # Seconds from the start of the measured window
+        self.interval = None  # Deltas: report interval they close (1 = first of the window)
+
+    def merge(self, other: "RunStats"):
+        self.requests += other.requests
+        self.failures += other.failures
+        for kind, count in other.errors.items():
+            self.errors[kind] = self.errors.get(kind, 0) + count
+        for status, count in other.status_codes.items():
+            self.status_codes[status] = self.status_codes.get(status, 0) + count
+        self.bytes_received += other.bytes_received
+        self.latency.merge(other.latency)
+        self.service_time.merge(other.service_time)
+        self.last_done = max(self.last_done, other.last_done)
+
+    def record(self, latency: float, service_time: float, status: int, received: int):
+        self.requests += 1
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+        self.bytes_received += received
+        self.latency.record(latency)
+        self.service_time.record(service_time)
+        if status >= 400:
+            self.failures += 1
+
+    def record_error(self, kind: str):
+        self.requests += 1
+        self.failures += 1
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+class StatsAggregator:
+    """Merges per-interval RunStats deltas and prints live progress lines."""
+
+    def __init__(self):
+        self.total = RunStats()
+        self.interval_responses: Dict[int, int] = {}
+        self.interval_latency: Dict[int, Dict[int, int]] = {}  # Sparse bucket counts
+        self.printed_requests = 0
+        self.printed_at = 0.0  # Measured-window time of the last printed line
+
+    def add(self, delta: RunStats):
+        self.total.merge(delta)
+        if delta.interval is not None:
+            responses = self.interval_responses.get(delta.interval, 0)
+            self.interval_responses[delta.interval] = responses + delta.latency.total
+            counts = self.interval_latency.setdefault(delta.interval, {})
+            for index, count in enumerate(delta.latency.counts):
+                if count:
+                    counts[index] = counts.get(index, 0) + count
+
+    def throughput_samples(self, duration: float) -> List[float]:
+        """Responses/s in each complete report interval of the measured window."""
+        full = int(duration / REPORT_INTERVAL + 1e-9)
+        return [self.interval_responses.get(i, 0) / REPORT_INTERVAL for i in range(1, full + 1)]
+
+    def latency_samples(self, duration: float, q: float = 99) -> List[float]:
+        """Latency percentile q (ms) of each complete report interval that had responses."""
+        full = int(duration / REPORT_INTERVAL + 1e-9)
+        samples = []
+        for interval in range(1, full + 1):
+            counts = self.interval_latency.get(interval)
+            if not counts:
+                continue
+            rank = max(1, math.ceil(q / 100 * sum(counts.values())))
+            seen = 0
+            for index in sorted(counts):
+                seen += counts[index]
+                if seen >= rank:
+                    samples.append(_bucket_high(index) / 1000)
+                    break
+        return samples
+
+    def print_live(self):
+        total = self.total
+        window = total.last_done - self.printed_at
+        if total.requests == self.printed_requests or window < REPORT_INTERVAL / 2:
+            return
+        print(
+            f"  📈 {total.last_done:5.1f}s  {total.requests} requests  "
+            f"{(total.requests - self.printed_requests) / window:.0f} req/s  "
+            f"p99 {total.latency.percentile(99) / 1000:g} ms  errors {total.failures}"
+        )
+        self.printed_requests = total.requests
+        self.printed_at = total.last_done
+
+
+class LoadEngine:
+    """Drives one closed- or open-loop run on the current event loop.
+
+    Statistics are handed to on_report as RunStats deltas, one per
+    report_interval and a final one when the run ends.
+    """
+
+    def __init__(
+        self,
+        target: Target,
+        plan: RequestPlan,
+        concurrency: int,
+        rate: Optional[float],
+        duration: float,
+        warmup: float,
+        ramp: float,
+        timeout: float,
+        on_report: Callable[[RunStats], None],
+        report_interval: float = REPORT_INTERVAL,
+        start_at: Optional[float] = None,
+        phase: float = 0.0,
+        deck_offset: int = 0,
+        verbose: bool = False,
+    ):
+        self.target = target
+        self.plan = plan
+        self.requests = plan.cursor(deck_offset)
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.warmup = warmup
+        self.ramp = ramp
+        self.timeout = timeout
+        self.on_report = on_report
+        self.report_interval = report_interval
+        self.start_at = start_at  # Wall-clock start shared by all workers (default: now)
+        self.phase = phase  # Open loop: offset of this worker's timetable
+        self.verbose = verbose
+        self.stats = RunStats()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self.loop = loop
+        self.start = loop.time()
+        if self.start_at is not None:
+            self.start += self.start_at - time.time()
+        self.measure_start = self.start + self.ramp + self.warmup
+        self.end = self.measure_start + self.duration
+        self.tick = 1
+        reporter = asyncio.ensure_future(self._report_loop())
+        try:
+            if self.rate:
+                await self._open_loop()
+            else:
+                await self._closed_loop()
+        finally:
+            reporter.cancel()
+        self._flush()
+
+    def _flush(self):
+        delta, self.stats = self.stats, RunStats()
+        delta.interval = self.tick
+        self.on_report(delta)
+
+    async def _report_loop(self):
+        # Aligned to the shared start, so every worker reports at the same moments
+        while True:
+            await self._sleep_until(self.measure_start + self.tick * self.report_interval)
+            if self.stats.requests:
+                self._flush()
+            self.tick += 1
+
+    async def _sleep_until(self, when: float):
+        delay = when - self.loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _issue(self, conn: HttpConnection, scheduled: float, request: CompiledRequest):
+        """Send one request; only those scheduled inside the measured window count."""
+        sent = self.loop.time()
+        try:
+            status, received = await asyncio.wait_for(
+                conn.request(request.raw, request.head_only), self.timeout
+            )
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError, ValueError, IndexError) as e:
+            conn.close()
+            if scheduled >= self.measure_start:
+                self.stats.record_error(error_kind(e))
+                self.stats.last_done = self.loop.time() - self.measure_start
+            return
+        done = self.loop.time()
+        if scheduled >= self.measure_start:
+            self.stats.record(done - scheduled, done - sent, status, received)
+            self.stats.last_done = done - self.measure_start
+
+    # ── Closed loop ──────────────────────────────────────────────────────────
+
+    async def _closed_loop(self):
+        if self.verbose:
+            print(f"🔁 Closed loop: {self.concurrency} connections")
+
+        async def worker(index: int):
+            # Ramp: connections join one by one, evenly spread over the ramp period
+            await self._sleep_until(self.start + self.ramp * index / self.concurrency)
+            conn = HttpConnection(self.target)
+            try:
+                while True:
+                    now = self.loop.time()
+                    if now >= self.end:
+                        break
+                    request = next(self.requests)
+                    await self._issue(conn, now, request)
+                    if request.think_time:
+                        await asyncio.sleep(request.think_time)
+            finally:
+                conn.close()
+
+        await asyncio.gather(*(worker(i) for i in range(self.concurrency)))
+
+    # ── Open loop ────────────────────────────────────────────────────────────
+
+    def _offset(self, k: int) -> float:
+        """Scheduled start of request k, relative to the start of the run.
+
+        During the ramp the rate grows linearly from 0 to self.rate, so
+        k requests have been started after sqrt(2 * k * ramp / rate) seconds.
+        """
+        ramp_requests = self.rate * self.ramp / 2
+        if k < ramp_requests:
+            return math.sqrt(2 * k * self.ramp / self.rate)
+        return self.ramp + (k - ramp_requests) / self.rate
+
+    async def _pooled(self, pool: ConnectionPool, scheduled: float, request: CompiledRequest):
+        conn = await pool.get()
+        try:
+            await self._issue(conn, scheduled, request)
+        finally:
+            pool.put(conn)
+
+    async def _open_loop(self):
+        if self.verbose:
+            print(f"⏱️  Open loop: {self.rate:g} req/s over up to {self.concurrency} connections")
+        pool = ConnectionPool(self.target, self.concurrency)
+        pending = set()
+        k = 0
+        try:
+            while True:
+                scheduled = self.start + self.phase + self._offset(k)
+                if scheduled >= self.end:
+                    break
+                await self._sleep_until(scheduled)
+                # Start everything that is due; if the loop fell behind, catch up at once
+                now = self.loop.time()
+                while scheduled <= now and scheduled < self.end:
+                    task = asyncio.ensure_future(self._pooled(pool, scheduled, next(self.requests)))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                    k += 1
+                    scheduled = self.start + self.phase + self._offset(k)
+
+            if pending:
+                _, unfinished = await asyncio.wait(set(pending), timeout=self.timeout)
+                for task in unfinished:
+                    task.cancel()
+                # Still waiting for a connection when the run ended
+                for _ in unfinished:
+                    self.stats.record_error("timeout")
+        finally:
+            pool.close()
+
+
+# ── Significance tests ───────────────────────────────────────────────────────
+
+def _betacf(a: float, b: float, x: float) -> float:
+    """Continued fraction for the incomplete beta function (modified Lentz)."""
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        for aa in (m * (b - m) * x / ((a - 1 + m2) * (a + m2)),
+                   -(a + m) * (a + b + m) * x / ((a + m2) * (a + 1 + m2))):
+            d = 1.0 + aa * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + aa / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 3e-14:
+            break
+    return h
+
+
+def _betainc(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta function I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def _t_sf(t: float, df: float) -> float:
+    """P(T > t) for Student's t distribution with df degrees of freedom."""
+    tail = 0.5 * _betainc(df / 2, 0.5, df / (df + t * t))
+    return tail if t > 0 else 1.0 - tail
+
+
+def _normal_sf(z: float) -> float:
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def welch_greater_p(a: List[float], b: List[float]) -> Optional[float]:
+    """One-sided Welch t-test p-value for mean(b) > mean(a); None if too few samples."""
+    if len(a) < 2 or len(b) < 2:
+        return None
+    ma, mb = sum(a) / len(a), sum(b) / len(b)
+    va = sum((x - ma) ** 2 for x in a) / (len(a) - 1) / len(a)
+    vb = sum((x - mb) ** 2 for x in b) / (len(b) - 1) / len(b)
+    if va + vb == 0:
+        return 0.0 if mb > ma else 1.0
+    t = (mb - ma) / math.sqrt(va + vb)
+    df = (va + vb) ** 2 / (va ** 2 / (len(a) - 1) + vb ** 2 / (len(b) - 1))
+    return _t_sf(t, df)
+
+
+def proportion_increase_p(hits_b: int, n_b: int, hits_c: int, n_c: int) -> Optional[float]:
+    """One-sided two-proportion z-test p-value for hits_c/n_c > hits_b/n_b."""
+    if not n_b or not n_c:
+        return None
+    pooled = (hits_b + hits_c) / (n_b + n_c)
+    if pooled in (0.0, 1.0):
+        return 1.0
+    z = (hits_c / n_c - hits_b / n_b) / math.sqrt(pooled * (1 - pooled) * (1 / n_b + 1 / n_c))
+    return _normal_sf(z)
+
+
+# ── Results store ────────────────────────────────────────────────────────────
+
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    scenario_hash TEXT NOT NULL,
+    label TEXT,
+    baseline INTEGER NOT NULL DEFAULT 0,
+    target TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    throughput_rps REAL NOT NULL,
+    p99_ms REAL NOT NULL,
+    error_rate REAL NOT NULL,
+    results TEXT NOT NULL,
+    latency_histogram TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_scenario ON runs (scenario_hash, baseline, id);
+"""
+
+
+def default_db_path() -> Path:
+    """DEFAULT_DB under the agent's project dir, else the enclosing git checkout, else cwd."""
+    root = os.environ.get('GEMINI_PROJECT_DIR', os.environ.get('CLAUDE_PROJECT_DIR'))
+    if not root:
+        cwd = Path.cwd()
+        root = next((p for p in [cwd, *cwd.parents] if (p / ".git").exists()), cwd)
+    return Path(root) / DEFAULT_DB
+
+
+def open_store(db_path: Path) -> sqlite3.Connection:
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(STORE_SCHEMA)
+    return conn
+
+
+def record_run(db_path: Path, results: Dict, histogram: LatencyHistogram,
+               label: Optional[str] = None, baseline: bool = False) -> int:
+    """Store one run's report and latency histogram; returns its id."""
+    conn = open_store(db_path)
+    try:
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (created_at, scenario_hash, label, baseline, target, mode, "
+                "throughput_rps, p99_ms, error_rate, results, latency_histogram) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    results['scenario_hash'],
+                    label,
+                    int(baseline),
+                    results['target'],
+                    results['mode'],
+                    results['throughput_rps'],
+                    results['latency_ms']['p99'],
+                    results['error_rate'],
+                    json.dumps(results),
+                    json.dumps(histogram.to_dict()),
+                ),
+            )
+        return cursor.lastrowid
+    finally:
+        conn.close()
+
+
+def fetch_run(conn: sqlite3.Connection, run_id: Optional[int] = None, scenario_hash: Optional[str] = None,
+              baseline: Optional[bool] = None, before: Optional[int] = None) -> Optional[sqlite3.Row]:
+    """A run by id, or the newest one matching the filters."""
+    if run_id is not None:
+        return conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+    clauses, params = [], []
+    if scenario_hash is not None:
+        clauses.append("scenario_hash = ?")
+        params.append(scenario_hash)
+    if baseline is not None:
+        clauses.append("baseline = ?")
+        params.append(int(baseline))
+    if before is not None:
+        clauses.append("id < ?")
+        params.append(before)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return conn.execute(f"SELECT * FROM runs {where} ORDER BY id DESC LIMIT 1", params).fetchone()
+
+
+def compare_runs(baseline: sqlite3.Row, candidate: sqlite3.Row, threshold: float = 0.05,
+                 alpha: float = 0.05, max_error_increase: float = 0.01) -> Dict:
+    """
+    Check candidate against baseline. A metric regresses only when the change
+    is both larger than the threshold and significant at alpha:
+
+        throughput  per-second throughput samples, one-sided Welch t-test
+        p99 latency per-second p99 samples, one-sided Welch t-test
+        error rate  absolute increase over max_error_increase, two-proportion z-test
+
+    Latency is tested per second rather than per request because consecutive
+    requests are not independent (pauses and bursts hit many at once); a
+    per-request test would flag noise as significant.
+    """
+    base, cand = json.loads(baseline['results']), json.loads(candidate['results'])
+
+    def relative(old: float, new: float) -> float:
+        return (new - old) / old if old else 0.0
+
+    checks = []
+    b_samples = base.get('throughput_samples', [])
+    c_samples = cand.get('throughput_samples', [])
+    b_tp = sum(b_samples) / len(b_samples) if b_samples else base['throughput_rps']
+    c_tp = sum(c_samples) / len(c_samples) if c_samples else cand['throughput_rps']
+    p_value = welch_greater_p(c_samples, b_samples)
+    checks.append({
+        'metric': 'throughput_rps',
+        'baseline': round(b_tp, 2),
+        'candidate': round(c_tp, 2),
+        'change': round(relative(b_tp, c_tp), 4),
+        'p_value': p_value,
+        'regression': p_value is not None and relative(b_tp, c_tp) < -threshold and p_value < alpha,
+    })
+
+    p_value = welch_greater_p(base.get('latency_p99_samples', []), cand.get('latency_p99_samples', []))
+    change = relative(base['latency_ms']['p99'], cand['latency_ms']['p99'])
+    checks.append({
+        'metric': 'p99_ms',
+        'baseline': base['latency_ms']['p99'],
+        'candidate': cand['latency_ms']['p99'],
+        'change': round(change, 4),
+        'p_value': p_value,
+        'regression': p_value is not None and change > threshold and p_value < alpha,
+    })
+
+    increase = cand['error_rate'] - base['error_rate']
+    p_value = proportion_increase_p(base['failures'], base['requests'], cand['failures'], cand['requests'])
+    checks.append({
+        'metric': 'error_rate',
+        'baseline': base['error_rate'],
+        'candidate': cand['error_rate'],
+        'change': round(increase, 6),
+        'p_value': p_value,
+        'regression': p_value is not None and increase > max_error_increase and p_value < alpha,
+    })
+
+    for check in checks:
+        if check['p_value'] is not None:
+            check['p_value'] = round(check['p_value'], 6)
+    return {
+        'baseline': {'id': baseline['id'], 'created_at': baseline['created_at'], 'label': baseline['label']},
+        'candidate': {'id': candidate['id'], 'created_at': candidate['created_at'], 'label': candidate['label']},
+        'scenario_hash': candidate['scenario_hash'],
+        'same_scenario': baseline['scenario_hash'] == candidate['scenario_hash'],
+        'threshold': threshold,
+        'alpha': alpha,
+        'informational': {
+            'p50_ms': [base['latency_ms']['p50'], cand['latency_ms']['p50']],
+            'p99.9_ms': [base['latency_ms']['p99.9'], cand['latency_ms']['p99.9']],
+        },
+        'checks': checks,
+        'regression': any(check['regression'] for check in checks),
+    }
+
+
+def print_comparison(comparison: Dict):
+    base, cand = comparison['baseline'], comparison['candidate']
+    print("\n" + "="*50)
+    print("COMPARISON")
+    print("="*50)
+    print(f"Baseline: run #{base['id']} {base['created_at']} {base['label'] or ''}".rstrip())
+    print(f"Candidate: run #{cand['id']} {cand['created_at']} {cand['label'] or ''}".rstrip())
+    print(f"Scenario: {comparison['scenario_hash']}")
+    if not comparison['same_scenario']:
+        print("⚠️  Runs have different scenario hashes; results may not be comparable")
+    for check in comparison['checks']:
+        p_value = "n/a (too few samples)" if check['p_value'] is None else f"{check['p_value']:.4f}"
+        change = f"{check['change']:+.2%}" if check['metric'] != 'error_rate' else f"{check['change']:+.4f}"
+        verdict = "❌ regression" if check['regression'] else "✓"
+        print(f"{check['metric']}: {check['baseline']} → {check['candidate']} ({change}, p={p_value}) {verdict}")
+    for metric, (old, new) in comparison['informational'].items():
+        print(f"{metric}: {old} → {new}")
+    print("="*50 + "\n")
+
+
+def compare_main(argv: List[str]) -> int:
+    """`compare` command: exit 0 if no regression, REGRESSION_EXIT_CODE if any."""
+    parser = argparse.ArgumentParser(
+        prog="api_load_tester.py compare",
+        description="Compare a recorded load-test run against a baseline"
+    )
+    parser.add_argument(
+        '--run',
+        type=int,
+        help='Candidate run id (default: latest run)'
+    )
+    parser.add_argument(
+        '--baseline',
+        type=int,
+        help='Baseline run id (default: latest baseline with the same scenario hash)'
+    )
+    parser.add_argument(
+        '--db',
+        help=f'Results database (default: {DEFAULT_DB} under the project root)'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.05,
+        help='Relative change in throughput or p99 that counts as a regression (default: 0.05)'
+    )
+    parser.add_argument(
+        '--alpha',
+        type=float,
+        default=0.05,
+        help='Significance level (default: 0.05)'
+    )
+    parser.add_argument(
+        '--max-error-increase',
+        type=float,
+        default=0.01,
+        help='Absolute error-rate increase that counts as a regression (default: 0.01)'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Output the comparison as JSON'
+    )
+    args = parser.parse_args(argv)
+
+    db_path = Path(args.db) if args.db else default_db_path()
+    if not db_path.exists():
+        print(f"❌ Error: no results database at {db_path}")
+        return 1
+    conn = open_store(db_path)
+    try:
+        candidate = fetch_run(conn, args.run)
+        if candidate is None:
+            print(f"❌ Error: run {args.run if args.run is not None else '(latest)'} not found")
+            return 1
+        if args.baseline is not None:
+            baseline = fetch_run(conn, args.baseline)
+        else:
+            baseline = fetch_run(conn, scenario_hash=candidate['scenario_hash'], baseline=True,
+                                 before=candidate['id'])
+        if baseline is None:
+            print(f"❌ Error: no baseline for scenario {candidate['scenario_hash']}; "
+                  "record one with --mark-baseline")
+            return 1
+        comparison = compare_runs(baseline, candidate, args.threshold, args.alpha, args.max_error_increase)
+    finally:
+        conn.close()
+
+    if args.json:
+        print(json.dumps(comparison, indent=2))
+    else:
+        print_comparison(comparison)
+    return REGRESSION_EXIT_CODE if comparison['regression'] else 0
+
+
+def _worker_main(index: int, settings: Dict, queue, start_event, start_at):
+    """Entry point of a --workers process: run one shard, stream deltas to queue."""
+    try:
+        target = Target(settings.pop('url'), insecure=settings.pop('insecure'))
+        queue.put(("ready", index, None))
+        start_event.wait()
+        engine = LoadEngine(
+            target,
+            on_report=lambda delta: queue.put(("stats", index, delta)),
+            start_at=start_at.value,
+            **settings,
+        )
+        asyncio.run(engine.run())
+        queue.put(("done", index, None))
+    except BaseException as e:
+        queue.put(("error", index, f"{type(e).__name__}: {e}"))
+
 
 class ApiLoadTester:
     """Main class for api load tester functionality"""
-    
-    def __init__(self, target_path: str, verbose: bool = False):
-        self.target_path = Path(target_path)
+
+    def __init__(
+        self,
+        target: Optional[str],
+        verbose: bool = False,
+        concurrency: int = 10,
+        rate: Optional[float] = None,
+        duration: float = 10.0,
+        warmup: float = 0.0,
+        ramp: float = 0.0,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None,
+        timeout: float = 10.0,
+        insecure: bool = False,
+        workers: int = 1,
+        scenario: Optional[str] = None,
+        db: Optional[str] = None,
+        store: bool = True,
+        label: Optional[str] = None,
+        mark_baseline: bool = False,
+    ):
+        self.target_url = target
         self.verbose = verbose
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.warmup = warmup
+        self.ramp = ramp
+        self.method = method.upper()
+        self.headers = headers or {}
+        self.body = body
+        self.timeout = timeout
+        self.insecure = insecure
+        # 0 = one per CPU, but never more workers than connections to share out
+        self.workers = workers or min(os.cpu_count() or 1, max(concurrency, 1))
+        self.scenario_path = Path(scenario) if scenario else None
+        self.scenario = None
+        self.db_path = (Path(db) if db else default_db_path()) if store else None
+        self.label = label
+        self.mark_baseline = mark_baseline
         self.results = {}
-    
+
     def run(self) -> Dict:
         """Execute the main functionality"""
         print(f"🚀 Running {self.__class__.__name__}...")
-        print(f"📁 Target: {self.target_path}")
-        
+        print(f"🎯 Target: {self.target_url or self.scenario_path}")
+
         try:
             self.validate_target()
             self.analyze()
             self.generate_report()
-            
+            if self.db_path is not None:
+                self.store_results()
+
             print("✅ Completed successfully!")
             return self.results
-            
+
         except Exception as e:
             print(f"❌ Error: {e}")
             sys.exit(1)
-    
+
     def validate_target(self):
-        """Validate the target path exists and is accessible"""
-        if not self.target_path.exists():
-            raise ValueError(f"Target path does not exist: {self.target_path}")
-        
+        """Validate the target URL, scenario and load settings"""
+        if self.scenario_path is not None:
+            if not self.scenario_path.exists():
+                raise ValueError(f"Scenario file does not exist: {self.scenario_path}")
+            self.scenario = load_scenario(self.scenario_path)
+            self.target_url = self.target_url or self.scenario.get("base_url")
+        if not self.target_url:
+            raise ValueError("No target URL: pass one or set base_url in the scenario")
+        self.target = Target(self.target_url, insecure=self.insecure)
+        if self.concurrency < 1:
+            raise ValueError("--concurrency must be at least 1")
+        if self.rate is not None and self.rate <= 0:
+            raise ValueError("--rate must be positive")
+        if self.duration <= 0:
+            raise ValueError("--duration must be positive")
+        if self.warmup < 0 or self.ramp < 0:
+            raise ValueError("--warmup and --ramp cannot be negative")
+        if self.workers < 1:
+            raise ValueError("--workers must be at least 1 (or 0 for one per CPU, up to --concurrency)")
+        if self.concurrency < self.workers:
+            raise ValueError("--concurrency must be at least --workers (each worker needs a connection)")
+
         if self.verbose:
-            print(f"✓ Target validated: {self.target_path}")
-    
+            print(f"✓ Target validated: {self.target.scheme}://{self.target.host_header}{self.target.path}")
+
     def analyze(self):
-        """Perform the main analysis or operation"""
+        """Run the load test"""
         if self.verbose:
-            print("📊 Analyzing...")
-        
-        # Main logic here
+            print(f"📊 Loading for {self.ramp:g}s ramp + {self.warmup:g}s warm-up + {self.duration:g}s measured...")
+
+        if self.scenario is not None:
+            plan = compile_scenario(self.scenario, self.target, self.headers)
+            if self.verbose:
+                print(f"✓ Compiled {len(plan.requests)} request variants for {plan.endpoints} endpoints")
+        else:
+            raw_request = build_request(self.target, self.method, self.headers, self.body)
+            plan = RequestPlan.single(f"{self.method} {self.target.path}", raw_request, self.method == "HEAD")
+        if self.workers > 1:
+            aggregator = self._run_workers(plan)
+        else:
+            aggregator = self._run_single(plan)
+        stats = self.stats = aggregator.total
+
+        elapsed = max(self.duration, stats.last_done)
+        throughput = stats.latency.total / elapsed if elapsed > 0 else 0.0
+
         self.results['status'] = 'success'
-        self.results['target'] = str(self.target_path)
-        self.results['findings'] = []
-        
-        # Add analysis results
+        self.results['target'] = self.target_url
+        self.results['mode'] = 'open' if self.rate else 'closed'
+        self.results['scenario_hash'] = plan.digest(self.results['mode'], self.concurrency, self.rate)
+        self.results['config'] = {
+            'method': self.method,
+            'concurrency': self.concurrency,
+            'rate': self.rate,
+            'duration': self.duration,
+            'warmup': self.warmup,
+            'ramp': self.ramp,
+            'timeout': self.timeout,
+            'workers': self.workers,
+        }
+        if self.scenario is not None:
+            self.results['config']['scenario'] = {
+                'path': str(self.scenario_path),
+                'name': self.scenario.get('name', self.scenario_path.stem),
+                'endpoints': plan.endpoints,
+                'variants': len(plan.requests),
+            }
+        self.results['elapsed'] = round(elapsed, 3)
+        self.results['requests'] = stats.requests
+        self.results['responses'] = stats.latency.total
+        self.results['failures'] = stats.failures
+        self.results['error_rate'] = round(stats.failures / stats.requests, 6) if stats.requests else 0.0
+        self.results['errors'] = dict(sorted(stats.errors.items()))
+        self.results['status_codes'] = {str(code): n for code, n in sorted(stats.status_codes.items())}
+        self.results['throughput_rps'] = round(throughput, 2)
+        self.results['throughput_samples'] = aggregator.throughput_samples(self.duration)
+        self.results['latency_p99_samples'] = aggregator.latency_samples(self.duration, 99)
+        self.results['bytes_received'] = stats.bytes_received
+        # Open loop: measured from each request's scheduled start (coordinated-omission corrected)
+        self.results['latency_ms'] = stats.latency.summary()
+        self.results['service_time_ms'] = stats.service_time.summary()
+        self.results['findings'] = self._findings()
+
+        if self.verbose:
+            print(f"✓ Load test complete: {stats.requests} requests, {len(self.results['findings'])} findings")
+
+    def _shards(self, plan: RequestPlan) -> List[Dict]:
+        """LoadEngine settings per worker: rate and connections split evenly."""
+        shards = []
+        for index in range(self.workers):
+            shards.append({
+                'plan': plan,
+                'concurrency': self.concurrency // self.workers + (index < self.concurrency % self.workers),
+                'rate': self.rate / self.workers if self.rate else None,
+                'duration': self.duration,
+                'warmup': self.warmup,
+                'ramp': self.ramp,
+                'timeout': self.timeout,
+                # Interleave the workers' timetables instead of firing in lockstep
+                'phase': index / self.rate if self.rate else 0.0,
+                # Start each worker at a different point of the request order
+                'deck_offset': index * len(plan.deck) // self.workers,
+            })
+        return shards
+
+    def _run_single(self, plan: RequestPlan) -> StatsAggregator:
+        aggregator = StatsAggregator()
+
+        def on_report(delta: RunStats):
+            aggregator.add(delta)
+            aggregator.print_live()
+
+        engine = LoadEngine(self.target, on_report=on_report, verbose=self.verbose, **self._shards(plan)[0])
+        asyncio.run(engine.run())
+        return aggregator
+
+    def _run_workers(self, plan: RequestPlan) -> StatsAggregator:
+        """Run one LoadEngine per process and merge the deltas they stream back."""
         if self.verbose:
-            print(f"✓ Analysis complete: {len(self.results.get('findings', []))} findings")
-    
+            print(f"🧵 Starting {self.workers} worker processes")
+        context = multiprocessing.get_context()
+        messages = context.Queue()
+        start_event = context.Event()
+        start_at = context.Value('d', 0.0)
+        processes = []
+        try:
+            for index, shard in enumerate(self._shards(plan)):
+                shard.update(url=self.target_url, insecure=self.insecure)
+                process = context.Process(
+                    target=_worker_main,
+                    args=(index, shard, messages, start_event, start_at),
+                    daemon=True,
+                )
+                process.start()
+                processes.append(process)
+
+            pending = set(range(self.workers))
+            deadline = time.time() + WORKER_STARTUP_TIMEOUT
+            while pending:
+                if time.time() > deadline:
+                    raise RuntimeError(f"{len(pending)} worker(s) did not start within {WORKER_STARTUP_TIMEOUT:g}s")
+                message = self._next_message(messages, processes, pending)
+                if message and message[0] == "ready":
+                    pending.discard(message[1])
+
+            # Common start time, slightly ahead so no worker begins behind schedule
+            start_at.value = time.time() + 0.1
+            start_event.set()
+            aggregator = StatsAggregator()
+            # Workers report at each interval boundary; print half an interval later
+            next_print = start_at.value + self.ramp + self.warmup + 1.5 * REPORT_INTERVAL
+
+            pending = set(range(self.workers))
+            while pending:
+                if time.time() >= next_print:
+                    aggregator.print_live()
+                    next_print += REPORT_INTERVAL
+                message = self._next_message(messages, processes, pending, timeout=next_print - time.time())
+                if message is None:
+                    continue
+                kind, index, payload = message
+                if kind == "stats":
+                    aggregator.add(payload)
+                elif kind == "done":
+                    pending.discard(index)
+            return aggregator
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+    @staticmethod
+    def _next_message(messages, processes, pending, timeout: float = 0.5):
+        """Next worker message, or None after timeout; raises if a worker failed."""
+        try:
+            message = messages.get(timeout=max(0.0, min(timeout, 0.5)))
+        except queue.Empty:
+            for index in pending:
+                exitcode = processes[index].exitcode
+                if exitcode not in (None, 0):
+                    raise RuntimeError(f"Worker {index} exited with code {exitcode}")
+            return None
+        if message[0] == "error":
+            raise RuntimeError(f"Worker {message[1]} failed: {message[2]}")
+        return message
+
+    def store_results(self):
+        """Record this run in the results database"""
+        run_id = record_run(self.db_path, self.results, self.stats.latency, self.label, self.mark_baseline)
+        self.results['run_id'] = run_id
+        kind = "baseline" if self.mark_baseline else "run"
+        print(f"💾 Recorded {kind} #{run_id} (scenario {self.results['scenario_hash']}) in {self.db_path}")
+
+    def _findings(self) -> List[str]:
+        findings = []
+        results = self.results
+        if results['requests'] == 0:
+            findings.append("No requests completed in the measured window")
+            return findings
+        if results['error_rate'] > ERROR_RATE_WARNING:
+            findings.append(f"Error rate {results['error_rate']:.2%} exceeds {ERROR_RATE_WARNING:.0%}")
+        if self.rate and results['throughput_rps'] < self.rate * SATURATION_WARNING:
+            findings.append(
+                f"Achieved {results['throughput_rps']:g} req/s of the {self.rate:g} req/s target: "
+                "the service (or --concurrency) is saturated"
+            )
+        return findings
+
     def generate_report(self):
         """Generate and display the report"""
+        results = self.results
+        latency = results['latency_ms']
         print("\n" + "="*50)
         print("REPORT")
         print("="*50)
-        print(f"Target: {self.results.get('target')}")
-        print(f"Status: {self.results.get('status')}")
-        print(f"Findings: {len(self.results.get('findings', []))}")
+        print(f"Target: {results.get('target')}")
+        print(f"Status: {results.get('status')}")
+        print(f"Mode: {results['mode']} loop, {self.concurrency} connections, {self.workers} worker(s)")
+        print(f"Requests: {results['requests']} in {results['elapsed']}s ({results['throughput_rps']} req/s)")
+        print(f"Errors: {results['failures']} ({results['error_rate']:.2%})")
+        for kind, count in results['errors'].items():
+            print(f"  {kind}: {count}")
+        print(f"Status codes: {', '.join(f'{k}={v}' for k, v in results['status_codes'].items()) or 'none'}")
+        print(f"Latency (ms): {format_summary(latency)}")
+        if results['mode'] == 'open':
+            print(f"Service time (ms): {format_summary(results['service_time_ms'])}")
+        print(f"Findings: {len(results.get('findings', []))}")
+        for finding in results.get('findings', []):
+            print(f"  ⚠️  {finding}")
         print("="*50 + "\n")
 
+
+def format_summary(summary: Dict[str, float]) -> str:
+    return " ".join(f"{key}={value:g}" for key, value in summary.items() if key not in ('min', 'mean'))
+
+
+def parse_header(value: str) -> Tuple[str, str]:
+    name, sep, content = value.partition(":")
+    if not sep or not name.strip():
+        raise argparse.ArgumentTypeError(f"Header must look like 'Name: value': {value!r}")
+    return name.strip(), content.strip()
+
+
+def read_body(value: Optional[str]) -> Optional[bytes]:
+    """--data argument: literal text, or @path to send a file's bytes."""
+    if value is None:
+        return None
+    if value.startswith("@"):
+        return Path(value[1:]).read_bytes()
+    return value.encode("utf-8")
+
+
 def main():
     """Main entry point"""
+    if sys.argv[1:2] == ['compare']:
+        sys.exit(compare_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
-        description="Api Load Tester"
+        description="Api Load Tester",
+        epilog="Compare runs: api_load_tester.py compare [--run ID] [--baseline ID] [--threshold F]"
     )
     parser.add_argument(
         'target',
-        help='Target path to analyze or process'
+        nargs='?',
+        help='URL of the endpoint to load, e.g. http://localhost:8000/health '
+             '(optional with a scenario that sets base_url)'
+    )
+    parser.add_argument(
+        '--scenario', '-s',
+        help='YAML/JSON scenario of weighted endpoints; --method and --data are then ignored'
+    )
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        default=10,
+        help='Connections to use (default: 10)'
+    )
+    parser.add_argument(
+        '--rate', '-r',
+        type=float,
+        help='Open loop: start this many requests per second (default: closed loop)'
+    )
+    parser.add_argument(
+        '--duration', '-d',
+        type=float,
+        default=10.0,
+        help='Measured seconds (default: 10)'
+    )
+    parser.add_argument(
+        '--warmup',
+        type=float,
+        default=0.0,
+        help='Unmeasured seconds at full load before measuring (default: 0)'
+    )
+    parser.add_argument(
+        '--ramp',
+        type=float,
+        default=0.0,
+        help='Unmeasured seconds to ramp load up from zero (default: 0)'
+    )
+    parser.add_argument(
+        '--method', '-X',
+        default='GET',
+        help='HTTP method (default: GET)'
+    )
+    parser.add_argument(
+        '--header', '-H',
+        action='append',
+        type=parse_header,
+        default=[],
+        help="Request header 'Name: value' (repeatable)"
+    )
+    parser.add_argument(
+        '--data',
+        help='Request body, or @file to send a file'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=10.0,
+        help='Per-request timeout in seconds (default: 10)'
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help='Load-generating processes, each with its own event loop; '
+             '0 = one per CPU, up to --concurrency (default: 1)'
+    )
+    parser.add_argument(
+        '--insecure', '-k',
+        action='store_true',
+        help='Do not verify TLS certificates'
+    )
+    parser.add_argument(
+        '--db',
+        help=f'Results database to record the run in (default: {DEFAULT_DB} under the project root)'
+    )
+    parser.add_argument(
+        '--no-store',
+        action='store_true',
+        help='Do not record the run'
+    )
+    parser.add_argument(
+        '--label',
+        help='Free-form label stored with the run, e.g. a commit SHA'
+    )
+    parser.add_argument(
+        '--mark-baseline',
+        action='store_true',
+        help='Record the run as the baseline for its scenario'
     )
     parser.add_argument(
         '--verbose', '-v',
@@ -91,16 +1589,32 @@ def main():
         '--output', '-o',
         help='Output file path'
     )
-    
+
     args = parser.parse_args()
-    
+
     tool = ApiLoadTester(
         args.target,
-        verbose=args.verbose
+        verbose=args.verbose,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration=args.duration,
+        warmup=args.warmup,
+        ramp=args.ramp,
+        method=args.method,
+        headers=dict(args.header),
+        body=read_body(args.data),
+        timeout=args.timeout,
+        insecure=args.insecure,
+        workers=args.workers,
+        scenario=args.scenario,
+        db=args.db,
+        store=not args.no_store,
+        label=args.label,
+        mark_baseline=args.mark_baseline,
     )
-    
+
     results = tool.run()
-    
+
     if args.json:
         output = json.dumps(results, indent=2)
         if args.output:
@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""Tests for api_load_tester.py, run against an in-process HTTP stub server."""
+
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).parent.parent / "scripts" / "api_load_tester.py"
+sys.path.insert(0, str(SCRIPT.parent))
+import api_load_tester
+from api_load_tester import (
+    HISTOGRAM_BUCKETS, SUB_BUCKETS, HttpConnection, LatencyHistogram, Target, _bucket_high, _bucket_index,
+)
+
+BODY = b"hello world"
+
+
+class StubServer:
+    """Minimal HTTP/1.1 server on a background event loop; the path picks the response framing.
+
+    /length   Content-Length, keep-alive
+    /chunked  Transfer-Encoding: chunked with a trailer, keep-alive
+    /close    no length, body delimited by closing the connection
+    /stale    Content-Length, then the connection is dropped without "Connection: close"
+    /missing  404 with Content-Length
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = 0
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(started,), daemon=True)
+        self.thread.start()
+        started.wait(5)
+
+    def _run(self, started):
+        asyncio.set_event_loop(self.loop)
+        self.server = self.loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+        self.port = self.server.sockets[0].getsockname()[1]
+        started.set()
+        self.loop.run_forever()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                self.requests += 1
+                path = head.split(b" ", 2)[1]
+                for line in head.split(b"\r\n")[1:]:
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        await reader.readexactly(int(value))
+                if path == b"/chunked":
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                        b"5;ext=1\r\nhello\r\n6\r\n world\r\n0\r\nX-Trailer: 1\r\n\r\n"
+                    )
+                elif path == b"/close":
+                    writer.write(b"HTTP/1.1 200 OK\r\nConnection: close\r\n\r\n" + BODY)
+                    await writer.drain()
+                    return
+                elif path == b"/missing":
+                    writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 9\r\n\r\nnot found")
+                else:
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(BODY), BODY))
+                await writer.drain()
+                if path == b"/stale":
+                    return  # Idle timeout: closes without announcing it
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def stop(self):
+        async def shutdown():
+            self.server.close()
+            await self.server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+
+@pytest.fixture(scope="module")
+def server():
+    stub = StubServer()
+    yield stub
+    stub.stop()
+
+
+def fetch(url, paths, pause=0.0):
+    """[(status, body_bytes)] for paths requested in order over one HttpConnection."""
+    async def go():
+        target = Target(url)
+        conn = HttpConnection(target)
+        results = []
+        try:
+            for path in paths:
+                raw = api_load_tester.build_request(target, "GET", {}, None, path=path)
+                results.append(await conn.request(raw))
+                await asyncio.sleep(pause)
+        finally:
+            conn.close()
+        return results
+
+    return asyncio.run(go())
+
+
+def test_content_length_responses_reuse_the_connection(server):
+    before = server.connections
+    assert fetch(server.url("/length"), ["/length"] * 3) == [(200, len(BODY))] * 3
+    assert server.connections - before == 1
+
+
+def test_chunked_response_with_extension_and_trailer(server):
+    before = server.connections
+    assert fetch(server.url("/chunked"), ["/chunked", "/chunked"]) == [(200, len(BODY))] * 2
+    assert server.connections - before == 1
+
+
+def test_close_delimited_response_reopens_connection(server):
+    before = server.connections
+    assert fetch(server.url("/close"), ["/close", "/close"]) == [(200, len(BODY))] * 2
+    assert server.connections - before == 2
+
+
+def test_stale_keep_alive_connection_is_retried_once(server):
+    before_connections, before_requests = server.connections, server.requests
+    # The pause lets the server's FIN arrive before the next request is written
+    assert fetch(server.url("/stale"), ["/stale", "/stale"], pause=0.05) == [(200, len(BODY))] * 2
+    assert server.connections - before_connections == 2
+    assert server.requests - before_requests == 2
+
+
+def run_cli(tmp_path, *args):
+    out = tmp_path / "results.json"
+    proc = subprocess.run(
+        [sys.executable, str(SCRIPT), *args, "--no-store", "--json", "--output", str(out)],
+        capture_output=True, text=True, timeout=60,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    return json.loads(out.read_text())
+
+
+def check_common_fields(results, url):
+    assert results["status"] == "success"
+    assert results["target"] == url
+    assert results["requests"] > 0
+    assert results["responses"] == results["requests"]
+    assert results["failures"] == 0
+    assert results["error_rate"] == 0.0
+    assert results["errors"] == {}
+    assert results["status_codes"] == {"200": results["requests"]}
+    assert results["bytes_received"] == results["requests"] * len(BODY)
+    assert set(results["latency_ms"]) == {"min", "mean", "p50", "p90", "p99", "p99.9", "max"}
+    assert results["latency_ms"]["min"] <= results["latency_ms"]["p50"] <= results["latency_ms"]["max"]
+    assert len(results["throughput_samples"]) == 1
+    assert len(results["scenario_hash"]) > 0
+    assert "run_id" not in results
+
+
+@pytest.mark.parametrize("path", ["/length", "/chunked", "/close"])
+def test_closed_loop_run(server, tmp_path, path):
+    url = server.url(path)
+    results = run_cli(tmp_path, url, "--duration", "1", "--concurrency", "2")
+    check_common_fields(results, url)
+    assert results["mode"] == "closed"
+    assert results["config"]["concurrency"] == 2
+    assert results["config"]["rate"] is None
+    assert results["findings"] == []
+
+
+def test_open_loop_run(server, tmp_path):
+    url = server.url("/length")
+    results = run_cli(tmp_path, url, "--duration", "1", "--rate", "50", "--concurrency", "4")
+    check_common_fields(results, url)
+    assert results["mode"] == "open"
+    assert results["config"]["rate"] == 50
+    # The timetable is fixed, so an unsaturated target gets (almost exactly) rate x duration
+    assert 45 <= results["requests"] <= 55
+    assert set(results["service_time_ms"]) == set(results["latency_ms"])
+    assert results["findings"] == []
+
+
+def test_http_errors_are_counted_as_failures(server, tmp_path):
+    results = run_cli(tmp_path, server.url("/missing"), "--duration", "1", "--concurrency", "1")
+    assert results["status_codes"] == {"404": results["requests"]}
+    assert results["failures"] == results["requests"]
+    assert results["error_rate"] == 1.0
+    assert any("Error rate" in finding for finding in results["findings"])
+
+
+def test_refused_connections_are_reported(tmp_path):
+    import socket
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]  # Bound but not listening: connections are refused
+        results = run_cli(tmp_path, f"http://127.0.0.1:{port}/", "--duration", "0.5", "--concurrency", "1")
+    assert results["responses"] == 0
+    assert set(results["errors"]) == {"connect"}
+    assert results["failures"] == results["requests"] > 0
+
+
+def compile_endpoints(*endpoints, **scenario):
+    return api_load_tester.compile_scenario(
+        {**scenario, "endpoints": list(endpoints)}, Target("http://api.test/v1"))
+
+
+def request_parts(request):
+    head, _, body = request.raw.partition(b"\r\n\r\n")
+    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+    return request_line, dict(line.split(": ", 1) for line in header_lines), body
+
+
+def test_load_scenario_json_and_yaml(tmp_path):
+    scenario = {"variables": {"id": [1, 2]}, "endpoints": [{"path": "/u/${id}"}]}
+    (tmp_path / "s.json").write_text(json.dumps(scenario))
+    assert api_load_tester.load_scenario(tmp_path / "s.json") == scenario
+
+    pytest.importorskip("yaml")
+    (tmp_path / "s.yaml").write_text("variables:\n  id: [1, 2]\nendpoints:\n  - path: /u/${id}\n")
+    assert api_load_tester.load_scenario(tmp_path / "s.yaml") == scenario
+
+
+@pytest.mark.parametrize("text", ['[]', '{"endpoints": []}', '{"endpoints": {"path": "/"}}'])
+def test_load_scenario_needs_endpoints(tmp_path, text):
+    (tmp_path / "s.json").write_text(text)
+    with pytest.raises(ValueError, match="non-empty 'endpoints' list"):
+        api_load_tester.load_scenario(tmp_path / "s.json")
+
+
+def test_template_names_and_render():
+    value = {"${key}": ["${a}", {"n": "${b}-${a}"}], "plain": 3}
+    assert api_load_tester._template_names(value) == {"key", "a", "b"}
+    bindings = {"key": "k", "a": 7, "b": True}
+    # A string that is a single placeholder keeps the value's type; anything else is text
+    assert api_load_tester._render(value, bindings) == {"k": [7, {"n": "True-7"}], "plain": 3}
+
+
+def test_compile_renders_path_headers_and_json_body():
+    plan = compile_endpoints(
+        {"name": "create", "method": "post", "path": "/items/${id}?q=${q}",
+         "headers": {"X-Id": "${id}"}, "body": {"id": "${id}", "tags": ["${q}"], "label": "id ${id}"}},
+        variables={"id": 42, "q": "a b/c&d"},
+    )
+    assert plan.endpoints == 1 and len(plan.requests) == 1
+    request_line, headers, body = request_parts(plan.requests[0])
+    # Path values are percent-encoded, including "/" and "&"; base path is kept
+    assert request_line == "POST /v1/items/42?q=a%20b%2Fc%26d HTTP/1.1"
+    assert headers["Host"] == "api.test"
+    assert headers["X-Id"] == "42"
+    assert headers["Content-Type"] == "application/json"
+    assert int(headers["Content-Length"]) == len(body)
+    assert json.loads(body) == {"id": 42, "tags": ["a b/c&d"], "label": "id 42"}
+
+
+def test_compile_keeps_explicit_content_type_and_text_body():
+    plan = compile_endpoints(
+        {"method": "PUT", "path": "/raw", "headers": {"content-type": "text/csv"}, "body": "${n},x"},
+        variables={"n": 5},
+    )
+    request_line, headers, body = request_parts(plan.requests[0])
+    assert request_line == "PUT /v1/raw HTTP/1.1"
+    assert headers["content-type"] == "text/csv" and "Content-Type" not in headers
+    assert body == b"5,x"
+
+
+def test_compile_one_variant_per_combination():
+    plan = compile_endpoints({"path": "/u/${id}/${fmt}"}, {"path": "/static"},
+                             variables={"id": [1, 2, 3], "fmt": ["json", "xml"], "unused": [1, 2]})
+    assert plan.endpoints == 2
+    assert [len(group) for group in plan.groups] == [6, 1]
+    paths = {request_parts(plan.requests[i])[0].split()[1] for i in plan.groups[0]}
+    assert paths == {f"/v1/u/{i}/{f}" for i in (1, 2, 3) for f in ("json", "xml")}
+
+
+@pytest.mark.parametrize("endpoint, variables, message", [
+    ({"path": "/u/${id}"}, {}, "undefined variable.*id"),
+    ({"path": "/u", "body": {"x": "${missing}"}}, {"id": 1}, "undefined variable.*missing"),
+    ({"path": "/u/${id}"}, {"id": []}, "has no values"),
+    ({"path": "/u/${a}/${b}"}, {"a": list(range(101)), "b": list(range(100))}, "10100 variants exceed"),
+    ({"path": "/u", "weight": 0}, {}, "weight must be positive"),
+])
+def test_compile_errors(endpoint, variables, message):
+    with pytest.raises(ValueError, match=message):
+        compile_endpoints(endpoint, variables=variables)
+
+
+def test_deck_follows_weights():
+    plan = compile_endpoints({"path": "/a", "weight": 1}, {"path": "/b", "weight": 3}, {"path": "/c", "weight": 0.5})
+    assert len(plan.deck) == api_load_tester.DECK_SIZE
+    counts = [plan.deck.count(index) for index in range(3)]
+    assert sum(counts) == len(plan.deck)
+    for count, weight in zip(counts, (1, 3, 0.5)):
+        assert abs(count - weight / 4.5 * len(plan.deck)) < 1
+    assert plan.deck != sorted(plan.deck)  # Shuffled
+    assert compile_endpoints({"path": "/a"}, {"path": "/b"}, seed=1).deck != compile_endpoints(
+        {"path": "/a"}, {"path": "/b"}, seed=2).deck
+
+
+def test_every_variant_is_sent_in_turn():
+    # A per-variant share of 1/20000 would get no deck slots if variants were apportioned
+    plan = compile_endpoints({"name": "u", "path": "/u/${id}", "weight": 1}, {"name": "b", "path": "/b", "weight": 9},
+                             variables={"id": list(range(2000))})
+    cursor = plan.cursor()
+    sent = [next(cursor) for _ in range(10 * 2000 + len(plan.deck))]
+    users = [request.raw for request in sent if request.name == "u"]
+    assert len(set(users)) == 2000
+    assert users[:2000] == [plan.requests[index].raw for index in plan.groups[0]]
+    assert abs(len(users) / len(sent) - 0.1) < 0.01
+
+
+def test_cursor_offsets_spread_variants():
+    plan = compile_endpoints({"name": "u", "path": "/u/${id}"}, variables={"id": list(range(4))})
+    assert len(plan.deck) == api_load_tester.DECK_SIZE
+    first = [next(plan.cursor(index * len(plan.deck) // 4)).raw for index in range(4)]
+    assert first == [request.raw for request in plan.requests]
+
+
+def test_endpoint_with_negligible_weight_is_rejected():
+    with pytest.raises(ValueError, match="'rare'.*weight too small"):
+        compile_endpoints({"name": "rare", "path": "/r", "weight": 1}, {"path": "/b", "weight": 100000})
+
+
+def test_bucket_layout_is_contiguous():
+    """Every bucket starts right after the previous one ends."""
+    assert [_bucket_index(v) for v in range(SUB_BUCKETS)] == list(range(SUB_BUCKETS))
+    for index in range(HISTOGRAM_BUCKETS - 1):
+        high = _bucket_high(index)
+        assert _bucket_index(high) == index
+        assert _bucket_index(high + 1) == index + 1
+    # Values past the last power of two share the top bucket
+    top = _bucket_high(HISTOGRAM_BUCKETS - 2) + 1
+    assert _bucket_index(top) == _bucket_index(top * 1000) == HISTOGRAM_BUCKETS - 1
+
+
+def test_bucket_width_is_within_relative_error():
+    for index in range(SUB_BUCKETS, HISTOGRAM_BUCKETS - 1):
+        low, high = _bucket_high(index - 1) + 1, _bucket_high(index)
+        assert high - low + 1 <= low / 128
+
+
+def exact_percentile(values, q):
+    import math
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+
+def test_percentiles_within_error_bound():
+    import random
+    rng = random.Random(3)
+    values = [int(rng.lognormvariate(8, 2)) for _ in range(20000)] + [0, 1, 255, 256, 10**9]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value / 1_000_000)
+    assert histogram.total == len(values)
+    assert (histogram.min, histogram.max) == (min(values), max(values))
+    for q in (0.1, 1, 25, 50, 90, 99, 99.9, 100):
+        exact = exact_percentile(values, q)
+        reported = histogram.percentile(q)
+        assert exact <= reported <= exact + exact / 128, q
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for value in range(1, 101):
+        histogram.record(value / 1_000_000)
+    assert [histogram.percentile(q) for q in (1, 50, 99, 100)] == [1, 50, 99, 100]
+    assert histogram.summary()["p50"] == 0.05
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0
+    assert histogram.summary() == {"min": 0.0, "mean": 0.0, "p50": 0.0, "p90": 0.0, "p99": 0.0, "p99.9": 0.0, "max": 0.0}
+
+
+def state(histogram):
+    return list(histogram.counts), histogram.total, histogram.sum, histogram.min, histogram.max
+
+
+def test_merge_equals_recording_everything():
+    import random
+    rng = random.Random(5)
+    parts = [[rng.expovariate(1 / 0.02) for _ in range(n)] for n in (0, 1, 500, 2000)]
+    combined = LatencyHistogram()
+    merged = LatencyHistogram()
+    for part in parts:
+        histogram = LatencyHistogram()
+        for seconds in part:
+            histogram.record(seconds)
+            combined.record(seconds)
+        merged.merge(histogram)
+    assert state(merged) == state(combined)
+
+
+def test_sparse_pickle_round_trip():
+    import pickle
+    histogram = LatencyHistogram()
+    for seconds in (0.0001, 0.002, 0.002, 0.5, 3.0):
+        histogram.record(seconds)
+    data = pickle.dumps(histogram)
+    assert len(data) < 1000  # Sparse: not the ~30 KB counts array
+    assert state(pickle.loads(data)) == state(histogram)
+    assert state(LatencyHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))) == state(histogram)
+
+
+@pytest.mark.parametrize("cpus, concurrency, expected", [(16, 10, 10), (16, 2, 2), (4, 10, 4), (None, 10, 1)])
+def test_auto_workers_capped_at_concurrency(monkeypatch, cpus, concurrency, expected):
+    monkeypatch.setattr(api_load_tester.os, "cpu_count", lambda: cpus)
+    tool = api_load_tester.ApiLoadTester("http://127.0.0.1:1/", workers=0, concurrency=concurrency)
+    assert tool.workers == expected
+    tool.validate_target()
+
+
+def test_explicit_workers_above_concurrency_rejected():
+    tool = api_load_tester.ApiLoadTester("http://127.0.0.1:1/", workers=4, concurrency=2)
+    with pytest.raises(ValueError, match="--concurrency must be at least --workers"):
+        tool.validate_target()
+
+
+# ── Significance tests and results store ─────────────────────────────────────
+
+def binomial_tail(n, p, k):
+    """P(Binomial(n, p) >= k); equals I_p(k, n - k + 1) for integer parameters."""
+    import math
+    return sum(math.comb(n, j) * p ** j * (1 - p) ** (n - j) for j in range(k, n + 1))
+
+
+@pytest.mark.parametrize("a, b, x", [
+    (1, 1, 0.3), (2, 3, 0.3), (5, 1, 0.8), (1, 7, 0.1), (10, 10, 0.5), (50, 60, 0.45), (3, 40, 0.02), (30, 2, 0.99),
+])
+def test_betainc_matches_binomial_identity(a, b, x):
+    expected = binomial_tail(a + b - 1, x, a)
+    assert api_load_tester._betainc(a, b, x) == pytest.approx(expected, rel=1e-10, abs=1e-14)
+
+
+def test_betainc_bounds_and_symmetry():
+    assert api_load_tester._betainc(2.5, 3.5, 0.0) == 0.0
+    assert api_load_tester._betainc(2.5, 3.5, 1.0) == 1.0
+    assert api_load_tester._betainc(7.3, 7.3, 0.5) == pytest.approx(0.5, abs=1e-12)
+    assert api_load_tester._betainc(2.5, 0.5, 0.7) + api_load_tester._betainc(0.5, 2.5, 0.3) == pytest.approx(1.0)
+
+
+def t_sf_reference(t, df, steps=20000):
+    """P(T > t) by Simpson integration of the Student t density."""
+    import math
+    norm = math.exp(math.lgamma((df + 1) / 2) - math.lgamma(df / 2)) / math.sqrt(df * math.pi)
+
+    def pdf(x):
+        return norm * (1 + x * x / df) ** (-(df + 1) / 2)
+
+    h = abs(t) / steps
+    area = pdf(0) + pdf(abs(t)) + sum((4 if i % 2 else 2) * pdf(i * h) for i in range(1, steps))
+    tail = 0.5 - area * h / 3
+    return tail if t >= 0 else 1 - tail
+
+
+@pytest.mark.parametrize("t, df", [(0.0, 5), (1.0, 1), (2.0, 2), (-1.5, 7.5), (3.2, 19.3), (0.4, 120), (-4.0, 3)])
+def test_t_sf_reference_values(t, df):
+    assert api_load_tester._t_sf(t, df) == pytest.approx(t_sf_reference(t, df), abs=1e-9)
+
+
+def test_t_sf_known_quantiles():
+    # Two-sided 95% critical values from standard t tables
+    assert api_load_tester._t_sf(12.706204736, 1) == pytest.approx(0.025, abs=1e-9)
+    assert api_load_tester._t_sf(2.228138852, 10) == pytest.approx(0.025, abs=1e-9)
+    assert api_load_tester._t_sf(1.983971519, 100) == pytest.approx(0.025, abs=1e-9)
+
+
+def test_welch_greater_p():
+    import math
+    a = [10.1, 9.8, 10.4, 10.0, 9.7, 10.2]
+    b = [10.9, 11.4, 10.6, 11.8, 10.2, 11.1, 11.5]
+    va = sum((x - sum(a) / 6) ** 2 for x in a) / 5 / 6
+    vb = sum((x - sum(b) / 7) ** 2 for x in b) / 6 / 7
+    t = (sum(b) / 7 - sum(a) / 6) / math.sqrt(va + vb)
+    df = (va + vb) ** 2 / (va ** 2 / 5 + vb ** 2 / 6)
+    p = api_load_tester.welch_greater_p(a, b)
+    assert p == pytest.approx(t_sf_reference(t, df), abs=1e-9)
+    assert p < 0.01
+    assert api_load_tester.welch_greater_p(b, a) == pytest.approx(1 - p)
+    assert api_load_tester.welch_greater_p([1.0], b) is None
+    assert api_load_tester.welch_greater_p([2.0, 2.0], [3.0, 3.0]) == 0.0
+    assert api_load_tester.welch_greater_p([3.0, 3.0], [2.0, 2.0]) == 1.0
+
+
+def test_proportion_increase_p():
+    import math
+    from statistics import NormalDist
+    pooled = 35 / 2000
+    z = (25 / 1000 - 10 / 1000) / math.sqrt(pooled * (1 - pooled) * (2 / 1000))
+    p = api_load_tester.proportion_increase_p(10, 1000, 25, 1000)
+    assert p == pytest.approx(1 - NormalDist().cdf(z), rel=1e-9)
+    assert p == pytest.approx(0.00526, abs=1e-4)
+    assert api_load_tester.proportion_increase_p(25, 1000, 10, 1000) == pytest.approx(1 - p)
+    assert api_load_tester.proportion_increase_p(0, 1000, 0, 1000) == 1.0
+    assert api_load_tester.proportion_increase_p(0, 0, 5, 10) is None
+
+
+def run_results(throughput=(100.0, 102.0, 98.0, 101.0, 99.0), p99=(20.0, 21.0, 19.5, 20.5, 20.0),
+                requests=1000, failures=0, scenario="abc123"):
+    """A stored run's results dict; latency_ms p99 is the mean of the per-second p99s."""
+    p99_ms = round(sum(p99) / len(p99), 3)
+    return {
+        'status': 'success', 'target': 'http://127.0.0.1/', 'mode': 'closed', 'scenario_hash': scenario,
+        'requests': requests, 'responses': requests - failures, 'failures': failures,
+        'error_rate': round(failures / requests, 6) if requests else 0.0,
+        'throughput_rps': round(sum(throughput) / len(throughput), 2),
+        'throughput_samples': list(throughput), 'latency_p99_samples': list(p99),
+        'latency_ms': {'min': 1.0, 'mean': 5.0, 'p50': 4.0, 'p90': 9.0, 'p99': p99_ms,
+                       'p99.9': p99_ms * 1.5, 'max': p99_ms * 2},
+    }
+
+
+def store(db, results, baseline=False, label=None):
+    histogram = LatencyHistogram()
+    histogram.record(results['latency_ms']['p50'] / 1000)
+    return api_load_tester.record_run(db, results, histogram, label=label, baseline=baseline)
+
+
+def compare(tmp_path, baseline, candidate, **kwargs):
+    db = tmp_path / "runs.db"
+    base_id, cand_id = store(db, baseline, baseline=True), store(db, candidate)
+    conn = api_load_tester.open_store(db)
+    try:
+        result = api_load_tester.compare_runs(
+            api_load_tester.fetch_run(conn, base_id), api_load_tester.fetch_run(conn, cand_id), **kwargs
+        )
+    finally:
+        conn.close()
+    return {check['metric']: check['regression'] for check in result['checks']}, result
+
+
+def test_compare_identical_runs_pass(tmp_path):
+    checks, result = compare(tmp_path, run_results(), run_results())
+    assert checks == {'throughput_rps': False, 'p99_ms': False, 'error_rate': False}
+    assert result['regression'] is False
+    assert result['same_scenario'] is True
+
+
+def test_compare_flags_significant_throughput_drop(tmp_path):
+    checks, result = compare(tmp_path, run_results(), run_results(throughput=(80.0, 81.0, 79.0, 80.5, 79.5)))
+    assert checks['throughput_rps'] is True
+    assert result['checks'][0]['change'] == pytest.approx(-0.2, abs=0.01)
+    assert result['regression'] is True
+
+
+def test_compare_ignores_drop_below_threshold(tmp_path):
+    # Significant (tight samples) but only -3%, under the 5% threshold
+    checks, _ = compare(tmp_path, run_results(), run_results(throughput=(97.0, 97.2, 96.8, 97.1, 96.9)))
+    assert checks['throughput_rps'] is False
+
+
+def test_compare_ignores_large_but_noisy_drop(tmp_path):
+    # -20% on average, but the samples overlap too much to be significant
+    checks, _ = compare(
+        tmp_path, run_results(throughput=(60.0, 140.0, 70.0, 130.0, 100.0)),
+        run_results(throughput=(40.0, 120.0, 50.0, 110.0, 80.0)),
+    )
+    assert checks['throughput_rps'] is False
+
+
+def test_compare_needs_two_samples(tmp_path):
+    checks, result = compare(tmp_path, run_results(throughput=(100.0,)), run_results(throughput=(50.0,)))
+    assert checks['throughput_rps'] is False
+    assert result['checks'][0]['p_value'] is None
+
+
+def test_compare_flags_p99_increase(tmp_path):
+    checks, _ = compare(tmp_path, run_results(), run_results(p99=(30.0, 31.0, 29.5, 30.5, 30.0)))
+    assert checks['p99_ms'] is True
+    assert checks['throughput_rps'] is False
+
+
+def test_compare_error_rate_rules(tmp_path):
+    checks, _ = compare(tmp_path, run_results(failures=5), run_results(failures=60))
+    assert checks['error_rate'] is True
+    # Significant, but an absolute increase of 0.5% is under max_error_increase
+    checks, _ = compare(tmp_path, run_results(requests=100000, failures=100),
+                        run_results(requests=100000, failures=600))
+    assert checks['error_rate'] is False
+    checks, _ = compare(tmp_path, run_results(requests=100000, failures=100),
+                        run_results(requests=100000, failures=600), max_error_increase=0.001)
+    assert checks['error_rate'] is True
+
+
+def test_store_round_trip(tmp_path):
+    db = tmp_path / "nested" / "runs.db"
+    histogram = LatencyHistogram()
+    for seconds in (0.001, 0.002, 0.25):
+        histogram.record(seconds)
+    results = run_results()
+    first = api_load_tester.record_run(db, results, histogram, label="abc", baseline=True)
+    second = store(db, run_results(scenario="other"))
+    third = store(db, run_results())
+
+    conn = api_load_tester.open_store(db)
+    try:
+        row = api_load_tester.fetch_run(conn, first)
+        assert json.loads(row['results']) == results
+        assert state(LatencyHistogram.from_dict(json.loads(row['latency_histogram']))) == state(histogram)
+        assert (row['label'], row['baseline'], row['p99_ms']) == ("abc", 1, results['latency_ms']['p99'])
+        assert api_load_tester.fetch_run(conn)['id'] == third
+        assert api_load_tester.fetch_run(conn, scenario_hash="other")['id'] == second
+        assert api_load_tester.fetch_run(conn, scenario_hash="abc123", baseline=True, before=third)['id'] == first
+        assert api_load_tester.fetch_run(conn, scenario_hash="abc123", baseline=True, before=first) is None
+    finally:
+        conn.close()
+
+
+def test_compare_exit_codes(tmp_path, capsys):
+    db = str(tmp_path / "runs.db")
+    assert api_load_tester.compare_main(["--db", db]) == 1  # No database yet
+
+    store(db, run_results())
+    assert api_load_tester.compare_main(["--db", db]) == 1  # No baseline for the scenario
+
+    store(db, run_results(), baseline=True)
+    store(db, run_results())
+    assert api_load_tester.compare_main(["--db", db]) == 0
+
+    store(db, run_results(throughput=(70.0, 71.0, 69.0, 70.5, 69.5)))
+    assert api_load_tester.compare_main(["--db", db]) == api_load_tester.REGRESSION_EXIT_CODE == 3
+    assert api_load_tester.compare_main(["--db", db, "--threshold", "0.5"]) == 0
+    assert api_load_tester.compare_main(["--db", db, "--run", "99"]) == 1
+
+    capsys.readouterr()
+    assert api_load_tester.compare_main(["--db", db, "--run", "3", "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)['candidate']['id'] == 3
+
+
+def test_default_db_is_under_project_root_cache(tmp_path, monkeypatch):
+    monkeypatch.delenv("GEMINI_PROJECT_DIR", raising=False)
+    monkeypatch.setenv("CLAUDE_PROJECT_DIR", str(tmp_path))
+    assert api_load_tester.default_db_path() == tmp_path / ".jaggers" / "cache" / "load-tests.db"
+
+    monkeypatch.delenv("CLAUDE_PROJECT_DIR")
+    (tmp_path / "repo" / ".git").mkdir(parents=True)
+    (tmp_path / "repo" / "src" / "api").mkdir(parents=True)
+    monkeypatch.chdir(tmp_path / "repo" / "src" / "api")
+    assert api_load_tester.default_db_path() == tmp_path / "repo" / ".jaggers" / "cache" / "load-tests.db"
+    assert api_load_tester.ApiLoadTester("http://127.0.0.1:1/").db_path == api_load_tester.default_db_path()
+    assert api_load_tester.ApiLoadTester("http://127.0.0.1:1/", store=False).db_path is None